@@ -0,0 +1,66 @@
+"""
+Per-instance memory and construction time of Point and ContinuousInterval.
+
+The slotted, immutable classes are compared with plain classes that keep
+their attributes in an instance __dict__, as the package did before.
+
+Run from the project root:
+
+    python -m benchmarks.bench_memory
+"""
+
+import timeit
+import tracemalloc
+
+from src.intervals import Point, ContinuousInterval
+
+class DictPoint:
+    def __init__(self, value):
+        self.value = value
+
+class DictContinuousInterval:
+    def __init__(self, start, end, is_start_open=False, is_end_open=False):
+        self.start = start
+        self.end = end
+        self.is_start_open = is_start_open
+        self.is_end_open = is_end_open
+
+def bytes_per_instance(factory, size: int) -> float:
+    starts = [float(i) for i in range(size)]
+    ends = [start + 1 for start in starts]
+
+    tracemalloc.start()
+    before = tracemalloc.take_snapshot()
+    instances = list(map(factory, starts, ends))
+    after = tracemalloc.take_snapshot()
+    tracemalloc.stop()
+
+    allocated = sum(stat.size_diff for stat in after.compare_to(before, 'filename'))
+    del instances
+
+    # Discount the list holding the instances
+    return allocated / size - 8
+
+def construction_time(factory, size: int) -> float:
+    starts = [float(i) for i in range(size)]
+    ends = [start + 1 for start in starts]
+    timings = timeit.repeat(lambda: list(map(factory, starts, ends)), number=1, repeat=5)
+
+    return min(timings) / size
+
+def main(size: int = 100_000):
+    cases = {
+        'Point': lambda start, end: Point(start),
+        'Point (__dict__)': lambda start, end: DictPoint(start),
+        'ContinuousInterval': ContinuousInterval,
+        'ContinuousInterval (__dict__)': DictContinuousInterval,
+    }
+
+    print(f"{'case':<32}{'bytes/instance':>16}{'ns/instance':>14}")
+    for name, factory in cases.items():
+        memory = bytes_per_instance(factory, size)
+        elapsed = construction_time(factory, size) * 1e9
+        print(f"{name:<32}{memory:>16.1f}{elapsed:>14.1f}")
+
+if __name__ == '__main__':
+    main()
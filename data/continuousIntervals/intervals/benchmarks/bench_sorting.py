@@ -0,0 +1,56 @@
+"""
+Sorting and equality cost of ContinuousInterval collections.
+
+sort_intervals reads the start of each interval in C through
+operator.attrgetter, while the usual idiom calls a Python lambda per
+interval. The equality rows compare the previous tuple-building __eq__
+with the current attribute-wise one, and the Point rows the previous
+isinstance operand check with the current exact class check.
+
+Run from the project root:
+
+    python -m benchmarks.bench_sorting
+"""
+
+import random
+import timeit
+
+from src.intervals import ContinuousInterval, Point
+from src.utils import PointError, continuous_interval_values, sort_intervals
+
+def tuple_equality(a, b) -> bool:
+    return continuous_interval_values(a) == continuous_interval_values(b)
+
+def isinstance_less_than(a, b) -> bool:
+    if isinstance(b, Point):
+        return a.value < b.value
+    else:
+        raise PointError('<', b)
+
+def main(size: int = 100_000, repeat: int = 5):
+    rng = random.Random(0)
+    intervals = []
+    for _ in range(size):
+        start = rng.uniform(0, size)
+        intervals.append(ContinuousInterval(start, start + rng.uniform(0.1, 10), rng.random() < 0.5))
+    copies = [ContinuousInterval(*continuous_interval_values(interval)) for interval in intervals]
+    points = [Point(rng.uniform(0, size)) for _ in range(size)]
+    others = points[1:] + points[:1]
+
+    cases = {
+        "sorted(key=lambda i: i.start)": lambda: sorted(intervals, key=lambda interval: interval.start),
+        "sort_intervals": lambda: sort_intervals(intervals),
+        "__eq__ via value tuples": lambda: all(map(tuple_equality, intervals, copies)),
+        "__eq__": lambda: all(map(ContinuousInterval.__eq__, intervals, copies)),
+        "Point < via isinstance": lambda: list(map(isinstance_less_than, points, others)),
+        "Point.__lt__": lambda: list(map(Point.__lt__, points, others)),
+        "sorted(points)": lambda: sorted(points),
+    }
+
+    print(f"{'case':<34}{'ms':>10}")
+    for name, case in cases.items():
+        elapsed = min(timeit.repeat(case, number=1, repeat=repeat))
+        print(f"{name:<34}{elapsed * 1e3:>10.1f}")
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,51 @@
+"""
+Compare two benchmark reports written by benchmarks.run.
+
+Cases whose minimum time grew by more than the threshold are reported as
+regressions and make the command exit with status 1.
+
+Run from the project root:
+
+    python -m benchmarks.compare baseline.json report.json --threshold 0.1
+"""
+
+import argparse
+import json
+import sys
+
+def load_results(path: str) -> dict:
+    with open(path) as report_file:
+        report = json.load(report_file)
+
+    return {
+        (result['case'], result['size'], result['distribution']): result
+        for result in report['results']
+        if 'skipped' not in result
+    }
+
+def compare(baseline: dict, current: dict, threshold: float) -> list:
+    rows = []
+    for key in sorted(baseline.keys() & current.keys()):
+        ratio = current[key]['min'] / baseline[key]['min']
+        rows.append((key, baseline[key]['min'], current[key]['min'], ratio, ratio > 1 + threshold))
+
+    return rows
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description='Compare two benchmark reports')
+    parser.add_argument('baseline')
+    parser.add_argument('current')
+    parser.add_argument('--threshold', type=float, default=0.1, help='relative slowdown tolerated')
+    arguments = parser.parse_args(argv)
+
+    rows = compare(load_results(arguments.baseline), load_results(arguments.current), arguments.threshold)
+
+    for (case, size, distribution), before, after, ratio, is_regression in rows:
+        flag = 'REGRESSION' if is_regression else ''
+        print(f"{case:<40}{size:>12,}  {distribution:<10}{before * 1e3:>12.3f}{after * 1e3:>12.3f}{ratio:>8.2f}x  {flag}")
+
+    if any(row[-1] for row in rows):
+        sys.exit(1)
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,238 @@
+"""
+Benchmark suite for the intervals package.
+
+Every case is timed for each size and endpoint distribution, and the
+results are written as a JSON report that benchmarks.compare can diff
+between releases. Cases built from one Python object per interval are
+skipped above --object-limit, since ten million of them need several
+gigabytes of memory.
+
+Run from the project root:
+
+    python -m benchmarks.run --output report.json
+    python -m benchmarks.run --sizes 1000 100000 --distributions random touching
+"""
+
+import argparse
+import json
+import platform
+import statistics
+import sys
+import time
+from datetime import datetime, timezone
+
+import numpy as np
+
+from src.intervals import Point, DisjointInterval
+from src.arrays import IntervalArray
+from src.utils import sort_intervals
+
+SIZES = (1_000, 100_000, 10_000_000)
+OBJECT_LIMIT = 1_000_000
+QUERY_COUNT = 1_000
+SEED = 0
+
+# Endpoint distributions, as (starts, ends, is_start_open, is_end_open) columns
+def random_distribution(rng, size):
+    starts = rng.uniform(0, 10 * size, size)
+    ends = starts + rng.uniform(1, 20, size)
+    return starts, ends, rng.random(size) < 0.5, rng.random(size) < 0.5
+
+def nested_distribution(rng, size):
+    # Every interval contains all the narrower ones
+    widths = np.arange(1, size + 1, dtype=np.float64)
+    return -widths, widths, np.zeros(size, bool), np.zeros(size, bool)
+
+def touching_distribution(rng, size):
+    # Consecutive intervals share an endpoint, alternately open and closed
+    starts = np.arange(size, dtype=np.float64)
+    is_open = np.arange(size) % 2 == 0
+    return starts, starts + 1, is_open, is_open
+
+def open_distribution(rng, size):
+    starts, ends, _, _ = random_distribution(rng, size)
+    return starts, ends, np.ones(size, bool), np.ones(size, bool)
+
+DISTRIBUTIONS = {
+    'random': random_distribution,
+    'nested': nested_distribution,
+    'touching': touching_distribution,
+    'open': open_distribution,
+}
+
+def to_intervals(columns) -> list:
+    return IntervalArray(*columns).to_intervals()
+
+def query_values(rng, columns) -> np.ndarray:
+    starts, ends = columns[0], columns[1]
+    return rng.uniform(starts.min() - 1, ends.max() + 1, QUERY_COUNT)
+
+# Each case maps to (uses Python objects, setup, run); setup output is not timed
+def setup_columns(rng, columns):
+    return columns
+
+def setup_objects(rng, columns):
+    return to_intervals(columns)
+
+def setup_array(rng, columns):
+    return IntervalArray(*columns)
+
+def datetime_columns(columns):
+    # Endpoints read as seconds after an arbitrary epoch
+    starts, ends, is_start_open, is_end_open = columns
+    epoch = np.datetime64('2024-01-01', 'ns')
+    return epoch + (starts * 1e9).astype('timedelta64[ns]'), epoch + (ends * 1e9).astype('timedelta64[ns]'), is_start_open, is_end_open
+
+def setup_datetime_objects(rng, columns):
+    return IntervalArray(*datetime_columns(columns)).to_intervals()
+
+def setup_datetime_array(rng, columns):
+    return IntervalArray(*datetime_columns(columns))
+
+def setup_array_pair(rng, columns):
+    array = IntervalArray(*columns)
+    return array, array[rng.permutation(len(array))]
+
+def setup_disjoint_pair(rng, columns):
+    intervals = to_intervals(columns)
+    half = len(intervals) // 2
+    return DisjointInterval(intervals[:half]), DisjointInterval(intervals[half:])
+
+def setup_disjoint_triple(rng, columns):
+    intervals = to_intervals(columns)
+    return tuple(DisjointInterval(intervals[offset::3]) for offset in range(3))
+
+def run_eager_expression(triple):
+    a, b, c = triple
+    return a.union(b.intersection(c.complement()))
+
+def run_fused_expression(triple):
+    a, b, c = triple
+    return (a | b & ~c).evaluate()
+
+def setup_indexed_lookup(rng, columns):
+    disjoint_interval = DisjointInterval(to_intervals(columns), indexed=True)
+    disjoint_interval.get_index()
+    return disjoint_interval, [Point(value) for value in query_values(rng, columns).tolist()]
+
+def setup_array_lookup(rng, columns):
+    return IntervalArray(*columns), query_values(rng, columns)
+
+def run_contains_value(intervals):
+    value = intervals[len(intervals) // 2].start
+    return [interval.contains_value(value) for interval in intervals]
+
+def run_indexed_lookup(state):
+    disjoint_interval, points = state
+    return [disjoint_interval.get_interval_containing_point(point) for point in points]
+
+CASES = {
+    'construction/objects': (True, setup_columns, to_intervals),
+    'construction/array': (False, setup_columns, lambda columns: IntervalArray(*columns)),
+    'contains_value/objects': (True, setup_objects, run_contains_value),
+    'contains_value/array': (False, setup_array, lambda array: array.contains_value(array.starts[len(array) // 2])),
+    'contains_value/datetime_objects': (True, setup_datetime_objects, run_contains_value),
+    'contains_value/datetime_array': (False, setup_datetime_array, lambda array: array.contains_value(array[len(array) // 2].start)),
+    'intersection/disjoint': (True, setup_disjoint_pair, lambda pair: pair[0].intersection(pair[1])),
+    'intersection/array': (False, setup_array_pair, lambda pair: pair[0].intersection(pair[1])),
+    'union/disjoint': (True, setup_disjoint_pair, lambda pair: pair[0].union(pair[1])),
+    'union/array': (False, setup_array, lambda array: array.union()),
+    'union/datetime_objects': (True, setup_datetime_objects, DisjointInterval),
+    'union/datetime_array': (False, setup_datetime_array, lambda array: array.union()),
+    'expression/eager': (True, setup_disjoint_triple, run_eager_expression),
+    'expression/fused': (True, setup_disjoint_triple, run_fused_expression),
+    'sort/objects': (True, setup_objects, sort_intervals),
+    'merge_overlapping_intervals/objects': (True, setup_objects, DisjointInterval),
+    'point_lookup/indexed': (True, setup_indexed_lookup, run_indexed_lookup),
+    'point_lookup/find_containing': (True, setup_indexed_lookup, lambda state: state[0].find_containing(state[1])),
+    'point_lookup/array': (False, setup_array_lookup, lambda state: state[0].containing_pairs(state[1])),
+    'covered_length/array': (False, setup_array, lambda array: array.covered_length()),
+    'max_depth/array': (False, setup_array, lambda array: array.max_depth()),
+    'coverage_profile/array': (False, setup_array, lambda array: array.coverage_profile(1_000)),
+}
+
+def measure(run, state, repeat: int) -> list:
+    timings = []
+    for _ in range(repeat):
+        start = time.perf_counter()
+        run(state)
+        timings.append(time.perf_counter() - start)
+
+    return timings
+
+def run_suite(sizes, distributions, cases, repeat: int, object_limit: int) -> list:
+    results = []
+
+    for size in sizes:
+        for distribution in distributions:
+            columns = DISTRIBUTIONS[distribution](np.random.default_rng(SEED), size)
+
+            for case in cases:
+                uses_objects, setup, run = CASES[case]
+                result = {'case': case, 'size': size, 'distribution': distribution}
+
+                if uses_objects and size > object_limit:
+                    result['skipped'] = f"size above object limit {object_limit}"
+                else:
+                    state = setup(np.random.default_rng(SEED), columns)
+                    timings = measure(run, state, repeat)
+                    result.update({
+                        'repeat': repeat,
+                        'min': min(timings),
+                        'mean': statistics.mean(timings),
+                        'stdev': statistics.stdev(timings) if repeat > 1 else 0.0,
+                    })
+                    del state
+
+                results.append(result)
+                print(format_result(result), file=sys.stderr)
+
+    return results
+
+def format_result(result: dict) -> str:
+    label = f"{result['case']:<40}{result['size']:>12,}  {result['distribution']:<10}"
+    if 'skipped' in result:
+        return f"{label}skipped"
+
+    return f"{label}{result['min'] * 1e3:>12.3f} ms"
+
+def environment() -> dict:
+    return {
+        'python': platform.python_version(),
+        'implementation': platform.python_implementation(),
+        'numpy': np.__version__,
+        'machine': platform.machine(),
+        'platform': platform.platform(),
+        'timestamp': datetime.now(timezone.utc).isoformat(),
+    }
+
+def parse_arguments(argv=None):
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument('--sizes', type=int, nargs='+', default=list(SIZES))
+    parser.add_argument('--distributions', nargs='+', choices=sorted(DISTRIBUTIONS), default=list(DISTRIBUTIONS))
+    parser.add_argument('--cases', nargs='+', choices=sorted(CASES), default=list(CASES))
+    parser.add_argument('--repeat', type=int, default=5)
+    parser.add_argument('--object-limit', type=int, default=OBJECT_LIMIT)
+    parser.add_argument('--output', help='path of the JSON report, printed to stdout when omitted')
+
+    return parser.parse_args(argv)
+
+def main(argv=None):
+    arguments = parse_arguments(argv)
+    results = run_suite(
+        arguments.sizes,
+        arguments.distributions,
+        arguments.cases,
+        arguments.repeat,
+        arguments.object_limit
+    )
+    report = json.dumps({'environment': environment(), 'results': results}, indent=2)
+
+    if arguments.output:
+        with open(arguments.output, 'w') as report_file:
+            report_file.write(report)
+    else:
+        print(report)
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,512 @@
+from datetime import datetime, timedelta
+
+import numpy as np
+
+from .intervals import ContinuousInterval, EmptySet, Point
+
+# Endpoint backends. Datetimes are stored as int64 nanoseconds since the epoch.
+FLOAT64 = np.dtype(np.float64)
+INT64 = np.dtype(np.int64)
+DATETIME64 = np.dtype('datetime64[ns]')
+DTYPES = (FLOAT64, INT64, DATETIME64)
+
+def _infer_dtype(*columns) -> np.dtype:
+    kinds = set()
+    for column in columns:
+        if column.dtype.kind == 'O' and column.size:
+            kinds.add('M' if isinstance(column.flat[0], (datetime, np.datetime64)) else 'O')
+        else:
+            kinds.add(column.dtype.kind)
+
+    if 'M' in kinds:
+        return DATETIME64
+    if kinds <= {'i', 'u'}:
+        return INT64
+
+    return FLOAT64
+
+def _check_dtype(dtype) -> np.dtype:
+    dtype = np.dtype(dtype)
+    if dtype not in DTYPES:
+        category='Unsupported interval dtype'
+        reason=f"{dtype}, expected one of {', '.join(map(str, DTYPES))}"
+        raise ValueError(f"{category}: {reason}")
+
+    return dtype
+
+def _storage_column(values, dtype: np.dtype) -> np.ndarray:
+    column = np.asarray(values)
+    if dtype == DATETIME64:
+        # int64 columns are taken as nanoseconds since the epoch
+        if column.dtype != INT64:
+            column = column.astype(DATETIME64).view(INT64)
+        return np.ascontiguousarray(column)
+
+    return np.ascontiguousarray(column, dtype=dtype)
+
+def _query_column(values, dtype: np.dtype) -> np.ndarray:
+    # Query values comparable with the stored endpoints of the given backend
+    if dtype == DATETIME64:
+        return _storage_column(values, DATETIME64)
+
+    values = np.asarray(values)
+    if values.dtype.kind not in 'iuf':
+        values = values.astype(FLOAT64)
+
+    return values
+
+def _common_dtype(arrays) -> np.dtype:
+    dtypes = {array.dtype for array in arrays}
+    if len(dtypes) == 1:
+        return dtypes.pop()
+
+    if DATETIME64 in dtypes:
+        category='Incompatible interval arrays'
+        reason='datetime endpoints cannot be combined with numbers'
+        raise ValueError(f"{category}: {reason}")
+
+    return FLOAT64
+
+def _row_interval(start, end, is_start_open: bool, is_end_open: bool):
+    # Rows with start equal to end are single points when closed, empty otherwise,
+    # as returned by ContinuousInterval.intersection
+    if start == end:
+        return EmptySet() if is_start_open or is_end_open else Point(start)
+
+    return ContinuousInterval(start, end, is_start_open, is_end_open)
+
+def _pack_flags(flags, size: int) -> np.ndarray:
+    flags = np.broadcast_to(np.asarray(flags, dtype=bool), (size,))
+    return np.packbits(flags)
+
+def _unpack_flags(bits: np.ndarray, size: int) -> np.ndarray:
+    return np.unpackbits(bits, count=size).view(bool)
+
+class IntervalArray:
+    """
+    Columnar collection of continuous intervals.
+
+    Endpoints are stored as two native arrays and the open/closed flags as
+    two packed bitmasks, so whole collections are handled by NumPy kernels
+    instead of one Python object per interval. Rows with start equal to end
+    are allowed: closed ones are single points, open ones are empty, and they
+    leave the array as a Point or an EmptySet.
+
+    The dtype selects the endpoint backend: float64, int64, or datetime64[ns]
+    for datetimes, which are converted once to int64 nanoseconds since the
+    epoch and back to datetimes only when intervals leave the array. When
+    omitted it is inferred from the endpoints.
+    """
+
+    def __init__(self, starts, ends, is_start_open=False, is_end_open=False, dtype=None):
+        if dtype is None:
+            dtype = _infer_dtype(np.asarray(starts), np.asarray(ends))
+        self.dtype = _check_dtype(dtype)
+
+        starts = _storage_column(starts, self.dtype)
+        ends = _storage_column(ends, self.dtype)
+
+        if starts.ndim != 1 or starts.shape != ends.shape:
+            category='Invalid interval array'
+            reason='starts and ends must be 1-D arrays of the same length'
+            raise ValueError(f"{category}: {reason}")
+
+        if np.any(starts > ends):
+            category='Invalid interval'
+            reason='start must be less or equal than end'
+            raise ValueError(f"{category}: {reason}")
+
+        self.starts = starts
+        self.ends = ends
+        self._start_open_bits = _pack_flags(is_start_open, len(starts))
+        self._end_open_bits = _pack_flags(is_end_open, len(starts))
+
+    @classmethod
+    def from_intervals(cls, intervals, dtype=None):
+        intervals = list(intervals)
+        size = len(intervals)
+
+        starts = np.array([interval.start for interval in intervals])
+        ends = np.array([interval.end for interval in intervals])
+        is_start_open = np.fromiter((interval.is_start_open for interval in intervals), bool, size)
+        is_end_open = np.fromiter((interval.is_end_open for interval in intervals), bool, size)
+
+        return cls(starts, ends, is_start_open, is_end_open, dtype)
+
+    @classmethod
+    def from_packed(cls, starts, ends, start_open_bits, end_open_bits, dtype=FLOAT64):
+        # Wrap stored endpoint columns and packed flag bits as they are,
+        # without copying or validating them, e.g. arrays mapped from a file
+        if len(start_open_bits) != (len(starts) + 7) // 8 or len(end_open_bits) != len(start_open_bits):
+            category='Invalid interval array'
+            reason='flag bits do not match the number of intervals'
+            raise ValueError(f"{category}: {reason}")
+
+        array = cls.__new__(cls)
+        array.dtype = _check_dtype(dtype)
+        array.starts = starts
+        array.ends = ends
+        array._start_open_bits = start_open_bits
+        array._end_open_bits = end_open_bits
+
+        return array
+
+    @classmethod
+    def empty(cls, dtype=FLOAT64):
+        dtype = _check_dtype(dtype)
+        return cls(np.empty(0, dtype), np.empty(0, dtype), dtype=dtype)
+
+    @classmethod
+    def load(cls, path, mmap: bool = True):
+        # With mmap the columns are read-only views on the file's pages
+        from .storage import INTERVALS, read_blocks
+
+        kind, _, array = read_blocks(path, mmap)[0]
+        if kind != INTERVALS:
+            category='Invalid interval file'
+            reason='first block does not hold intervals'
+            raise ValueError(f"{category}: {reason}")
+
+        return array
+
+    def save(self, path):
+        from .storage import INTERVALS, write_blocks
+
+        write_blocks(path, [(INTERVALS, 0, self)])
+
+    def to_intervals(self) -> list:
+        return list(self)
+
+    def _to_python(self, column: np.ndarray) -> list:
+        # Stored endpoints as Python values, datetimes for the datetime backend
+        if self.dtype == DATETIME64:
+            return column.view(DATETIME64).astype('datetime64[us]').tolist()
+
+        return column.tolist()
+
+    def _measure(self, value):
+        # A length in API units, a timedelta for the datetime backend
+        if self.dtype == DATETIME64:
+            return timedelta(microseconds=int(value) / 1000)
+
+        return value.item()
+
+    @property
+    def is_start_open(self) -> np.ndarray:
+        return _unpack_flags(self._start_open_bits, len(self))
+
+    @property
+    def is_end_open(self) -> np.ndarray:
+        return _unpack_flags(self._end_open_bits, len(self))
+
+    def __len__(self) -> int:
+        return len(self.starts)
+
+    def __iter__(self):
+        rows = zip(
+            self._to_python(self.starts),
+            self._to_python(self.ends),
+            self.is_start_open.tolist(),
+            self.is_end_open.tolist()
+        )
+
+        for start, end, is_start_open, is_end_open in rows:
+            yield _row_interval(start, end, is_start_open, is_end_open)
+
+    def __getitem__(self, key):
+        if isinstance(key, (int, np.integer)):
+            return _row_interval(
+                self._to_python(self.starts[[key]])[0],
+                self._to_python(self.ends[[key]])[0],
+                bool(self.is_start_open[key]),
+                bool(self.is_end_open[key])
+            )
+
+        return IntervalArray(
+            self.starts[key],
+            self.ends[key],
+            self.is_start_open[key],
+            self.is_end_open[key],
+            self.dtype
+        )
+
+    def __repr__(self) -> str:
+        return f"IntervalArray({len(self)} intervals, dtype={self.dtype})"
+
+    def is_empty(self) -> np.ndarray:
+        return (self.starts == self.ends) & (self.is_start_open | self.is_end_open)
+
+    def length(self) -> np.ndarray:
+        lengths = self.ends - self.starts
+        if self.dtype == DATETIME64:
+            return lengths.view('timedelta64[ns]')
+
+        return lengths
+
+    def contains_value(self, value) -> np.ndarray:
+        value = _query_column(value, self.dtype)
+
+        after_start = np.where(self.is_start_open, self.starts < value, self.starts <= value)
+        before_end = np.where(self.is_end_open, value < self.ends, value <= self.ends)
+
+        return after_start & before_end
+
+    def _boundary_groups(self) -> tuple:
+        # Sorted endpoint values split by boundary side: 0 for a closed start
+        # or open end, 1 for an open start or closed end (see _boundary_sweep)
+        is_start_open, is_end_open = self.is_start_open, self.is_end_open
+
+        starts = (np.sort(self.starts[~is_start_open]), np.sort(self.starts[is_start_open]))
+        ends = (np.sort(self.ends[is_end_open]), np.sort(self.ends[~is_end_open]))
+
+        return starts, ends
+
+    def covered_length(self) -> float:
+        # Measure of the union, from the sorted endpoints: the covered span
+        # minus the gaps left wherever every interval started so far has ended
+        if len(self) == 0:
+            return self._measure(self.starts.dtype.type(0))
+
+        starts, ends = np.sort(self.starts), np.sort(self.ends)
+        started = np.searchsorted(starts, ends[:-1], side='right')
+
+        # Only the last of tied ends can match, when no interval is left open
+        is_gap = started == np.arange(1, len(ends))
+        gaps = starts[started[is_gap]] - ends[:-1][is_gap]
+
+        return self._measure(ends[-1] - starts[0] - gaps.sum())
+
+    def max_depth(self) -> int:
+        # Largest number of intervals sharing a value. Depth peaks right after
+        # a start, so it is counted there from the sorted boundary groups.
+        starts, ends = self._boundary_groups()
+
+        max_depth = 0
+        for side, keys in enumerate(starts):
+            if len(keys) == 0:
+                continue
+
+            # Within its own group, position + 1 counts keys up to the last tie
+            depth = np.arange(1, len(keys) + 1) + _count_keys(starts[1 - side], 1 - side, keys, side)
+            for end_side, end_keys in enumerate(ends):
+                depth -= _count_keys(end_keys, end_side, keys, side)
+
+            max_depth = max(max_depth, int(depth.max()))
+
+        return max_depth
+
+    def coverage_profile(self, bins=10) -> tuple:
+        # Mean coverage depth per bin and the bin edges, as np.histogram. An
+        # integer splits the covered range into equal-width bins.
+        if np.ndim(bins) == 0:
+            lo, hi = (self.starts.min(), self.ends.max()) if len(self) else (0.0, 1.0)
+            if lo == hi:
+                lo, hi = lo - 0.5, hi + 0.5
+            edges = np.linspace(lo, hi, int(bins) + 1)
+        else:
+            edges = _query_column(bins, self.dtype).astype(FLOAT64)
+
+        if edges.ndim != 1 or len(edges) < 2 or np.any(np.diff(edges) <= 0):
+            category='Invalid bins'
+            reason='bin edges must be a 1-D increasing array of at least two values'
+            raise ValueError(f"{category}: {reason}")
+
+        # Integral of the depth up to each edge: every interval adds the part
+        # of its length lying before the edge
+        area = _sum_below(np.sort(self.starts), edges) - _sum_below(np.sort(self.ends), edges)
+        profile = np.diff(area) / np.diff(edges)
+
+        if self.dtype == DATETIME64:
+            edges = edges.astype(INT64).view(DATETIME64)
+
+        return profile, edges
+
+    def containing_pairs(self, values) -> tuple:
+        # Sparse (value index, interval index) pairs for every containment,
+        # grouped by interval. Both endpoints of each interval are located
+        # among the sorted values, so the cost is O((m + n) log m + k).
+        values = _query_column(values, self.dtype)
+        order = np.argsort(values)
+        sorted_values = values[order]
+
+        lo = np.where(
+            self.is_start_open,
+            np.searchsorted(sorted_values, self.starts, side='right'),
+            np.searchsorted(sorted_values, self.starts, side='left')
+        )
+        hi = np.where(
+            self.is_end_open,
+            np.searchsorted(sorted_values, self.ends, side='left'),
+            np.searchsorted(sorted_values, self.ends, side='right')
+        )
+
+        counts = np.maximum(hi - lo, 0)
+        interval_indices = np.repeat(np.arange(len(self)), counts)
+
+        # Expand each interval's run of sorted positions lo, lo + 1, ..., hi - 1
+        run_offsets = np.repeat(lo - (np.cumsum(counts) - counts), counts)
+        value_indices = order[np.arange(len(interval_indices)) + run_offsets]
+
+        return value_indices, interval_indices
+
+    def _as_array(self, other):
+        if isinstance(other, ContinuousInterval):
+            return IntervalArray.from_intervals([other])
+
+        return other
+
+    def _intersection_bounds(self, other):
+        other = self._as_array(other)
+
+        lo = np.maximum(self.starts, other.starts)
+        hi = np.minimum(self.ends, other.ends)
+
+        # On ties the open boundary is the restrictive one
+        self_start_open, other_start_open = self.is_start_open, other.is_start_open
+        lo_open = np.where(
+            self.starts == other.starts,
+            self_start_open | other_start_open,
+            np.where(self.starts > other.starts, self_start_open, other_start_open)
+        )
+
+        self_end_open, other_end_open = self.is_end_open, other.is_end_open
+        hi_open = np.where(
+            self.ends == other.ends,
+            self_end_open | other_end_open,
+            np.where(self.ends < other.ends, self_end_open, other_end_open)
+        )
+
+        return lo, hi, lo_open, hi_open
+
+    def overlaps(self, other) -> np.ndarray:
+        lo, hi, lo_open, hi_open = self._intersection_bounds(other)
+
+        return (lo < hi) | ((lo == hi) & ~lo_open & ~hi_open)
+
+    def intersection(self, other):
+        other = self._as_array(other)
+        dtype = _common_dtype([self, other])
+
+        lo, hi, lo_open, hi_open = self._intersection_bounds(other)
+        is_empty = (lo > hi) | ((lo == hi) & (lo_open | hi_open))
+
+        # Empty rows follow the ContinuousInterval.empty() convention
+        lo = np.where(is_empty, 0, lo)
+        hi = np.where(is_empty, 0, hi)
+        lo_open = lo_open | is_empty
+        hi_open = hi_open | is_empty
+
+        return IntervalArray(lo, hi, lo_open, hi_open, dtype)
+
+    def union(self, other=None):
+        if other is None:
+            array = self
+        else:
+            array = concatenate([self, self._as_array(other)])
+
+        # Sort by start with closed starts first on ties
+        return array[np.lexsort((array.is_start_open, array.starts))]._merge_sorted()
+
+    def _merge_sorted(self):
+        # Union of rows already sorted by start, closed starts first on ties
+        array = self[~self.is_empty()]
+        if len(array) == 0:
+            return IntervalArray.empty(array.dtype)
+
+        starts = array.starts
+        ends = array.ends
+        is_start_open = array.is_start_open
+        is_end_open = array.is_end_open
+
+        # Running maximum of the ends, ranking closed above open on ties
+        end_order = np.lexsort((~is_end_open, ends))
+        end_rank = np.empty_like(end_order)
+        end_rank[end_order] = np.arange(len(end_order))
+        reach = end_order[np.maximum.accumulate(end_rank)]
+        reach_ends = ends[reach]
+        reach_end_open = is_end_open[reach]
+
+        # A new group starts where the next interval neither overlaps nor touches
+        breaks = (reach_ends[:-1] < starts[1:]) | \
+            ((reach_ends[:-1] == starts[1:]) & reach_end_open[:-1] & is_start_open[1:])
+
+        first = np.concatenate(([0], np.flatnonzero(breaks) + 1))
+        last = np.concatenate((first[1:] - 1, [len(starts) - 1]))
+
+        return IntervalArray(
+            starts[first],
+            reach_ends[last],
+            is_start_open[first],
+            reach_end_open[last],
+            array.dtype
+        )
+
+def concatenate(arrays) -> IntervalArray:
+    arrays = list(arrays)
+    if not arrays:
+        return IntervalArray.empty()
+
+    return IntervalArray(
+        np.concatenate([array.starts for array in arrays]),
+        np.concatenate([array.ends for array in arrays]),
+        np.concatenate([array.is_start_open for array in arrays]),
+        np.concatenate([array.is_end_open for array in arrays]),
+        _common_dtype(arrays)
+    )
+
+def _count_keys(group: np.ndarray, group_side: int, values: np.ndarray, side: int) -> np.ndarray:
+    # Number of (value, side) keys of a sorted boundary group up to each query key
+    return np.searchsorted(group, values, side='right' if group_side <= side else 'left')
+
+def _sum_below(sorted_values: np.ndarray, edges: np.ndarray) -> np.ndarray:
+    # Sum of (edge - value) over the values below each edge, with prefix sums
+    # taken relative to the smallest value to limit rounding
+    origin = sorted_values[0] if len(sorted_values) else 0
+    prefix = np.concatenate(([0.0], np.cumsum(sorted_values - origin, dtype=FLOAT64)))
+    count = np.searchsorted(sorted_values, edges)
+
+    return count * (edges - origin) - prefix[count]
+
+def _boundary_sweep(arrays) -> tuple:
+    # Sorted boundary keys of all intervals with the coverage depth after
+    # each key. A key is a value plus a side, 0 just before the value and
+    # 1 just after it, so every interval is the open range between its keys.
+    values, sides, deltas = [], [], []
+    for array in arrays:
+        size = len(array)
+        values += [array.starts, array.ends]
+        sides += [array.is_start_open.astype(np.int8), (~array.is_end_open).astype(np.int8)]
+        deltas += [np.ones(size, np.int64), -np.ones(size, np.int64)]
+
+    values = np.concatenate(values)
+    sides = np.concatenate(sides)
+    deltas = np.concatenate(deltas)
+
+    # On equal keys an interval ends before the next one starts
+    order = np.lexsort((deltas, sides, values))
+    values, sides = values[order], sides[order]
+    depth = np.cumsum(deltas[order])
+
+    # Keep the depth reached after the last event of each distinct key
+    is_last = np.ones(len(values), bool)
+    is_last[:-1] = (values[1:] != values[:-1]) | (sides[1:] != sides[:-1])
+
+    return values[is_last], sides[is_last], depth[is_last]
+
+def _ranges_where(values, sides, inside, dtype) -> IntervalArray:
+    was_inside = np.concatenate(([False], inside[:-1]))
+    begins = np.flatnonzero(inside & ~was_inside)
+    ends = np.flatnonzero(~inside & was_inside)
+
+    # Ranges collapsing to a single point are left out, as in DisjointInterval
+    keep = values[begins] < values[ends]
+    begins, ends = begins[keep], ends[keep]
+
+    return IntervalArray(values[begins], values[ends], sides[begins] == 1, sides[ends] == 0, dtype)
+
+def set_intersection(first, second) -> IntervalArray:
+    # Values covered by both collections, as sorted non-overlapping intervals
+    dtype = _common_dtype([first, second])
+    values, sides, depth = _boundary_sweep([first.union(), second.union()])
+
+    return _ranges_where(values, sides, depth == 2, dtype)
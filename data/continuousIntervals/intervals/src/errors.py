@@ -9,3 +9,10 @@ def PointError(operator: str, other: object) -> TypeError:
 def ContinuousIntervalError(operator: str, other: object) -> TypeError:
     error_msg=operandErrorMessage('ContinuousInterval', operator, type(other).__name__)
     return TypeError(error_msg)
+
+def ImmutableAttributeError(this_type: str, attribute: str) -> AttributeError:
+    return AttributeError(f"'{this_type}' object is immutable: cannot set '{attribute}'")
+
+def IntervalExpressionError(operator: str, other: object) -> TypeError:
+    error_msg=operandErrorMessage('IntervalExpression', operator, type(other).__name__)
+    return TypeError(error_msg)
@@ -0,0 +1,353 @@
+"""
+Lazy set expressions over DisjointInterval.
+
+The |, &, -, ^ and ~ operators of DisjointInterval build an expression tree
+instead of computing each intermediate set:
+
+    expression = a | b & ~c
+    print(expression.explain())
+    result = expression.evaluate()
+
+Evaluation first simplifies the tree, then runs a single sweep over the
+merged boundaries of all distinct operands, testing the whole expression
+as a predicate on which operands cover the current range.
+"""
+
+from abc import ABC, abstractmethod
+from math import inf
+
+from .errors import IntervalExpressionError
+from .intervals import DisjointInterval, _interval_between
+
+class IntervalExpression(ABC):
+    """
+    Deferred set operation over DisjointInterval operands.
+
+    Nodes implement simplify, _operands, _predicate, _key and _format, so
+    that incomplete ones fail when built rather than when evaluated.
+    """
+
+    def _combine(self, operator: str, node_type, other, reverse: bool = False):
+        if isinstance(other, DisjointInterval):
+            other = Operand(other)
+        elif not isinstance(other, IntervalExpression):
+            raise IntervalExpressionError(operator, other)
+
+        return node_type(other, self) if reverse else node_type(self, other)
+
+    def __or__(self, other):
+        return self._combine('|', Union, other)
+
+    def __and__(self, other):
+        return self._combine('&', Intersection, other)
+
+    def __sub__(self, other):
+        return self._combine('-', Difference, other)
+
+    def __xor__(self, other):
+        return self._combine('^', SymmetricDifference, other)
+
+    def __ror__(self, other):
+        return self._combine('|', Union, other, reverse=True)
+
+    def __rand__(self, other):
+        return self._combine('&', Intersection, other, reverse=True)
+
+    def __rsub__(self, other):
+        return self._combine('-', Difference, other, reverse=True)
+
+    def __rxor__(self, other):
+        return self._combine('^', SymmetricDifference, other, reverse=True)
+
+    def __invert__(self):
+        return Complement(self)
+
+    def __repr__(self) -> str:
+        return self._format(_operand_labels(self))
+
+    @abstractmethod
+    def simplify(self):
+        # Equivalent tree with differences rewritten as intersections with a
+        # complement, double complements removed, nested unions, intersections
+        # and symmetric differences flattened, and empty operands folded away
+        pass
+
+    @abstractmethod
+    def _operands(self):
+        # DisjointInterval operands of the tree, in order of appearance
+        pass
+
+    @abstractmethod
+    def _predicate(self, positions: dict):
+        # Function telling from a mask of the operands covering a range,
+        # bit positions[id(operand)] for each, whether the range is kept
+        pass
+
+    @abstractmethod
+    def _key(self) -> tuple:
+        # Structural key of the tree, equal for equivalent subtrees
+        pass
+
+    @abstractmethod
+    def _format(self, labels: dict) -> str:
+        # Infix form of the tree, with operands named by labels
+        pass
+
+    def evaluate(self) -> DisjointInterval:
+        plan = _Plan(self.simplify())
+
+        if isinstance(plan.expression, Operand):
+            return DisjointInterval._from_normalized(list(plan.expression.disjoint_interval.intervals))
+
+        return DisjointInterval._from_normalized(_fused_sweep(plan.operands, plan.keep))
+
+    def explain(self) -> str:
+        plan = _Plan(self.simplify())
+        labels = _operand_labels(self)
+        boundary_count = 2 * sum(len(operand.intervals) for operand in plan.operands)
+
+        lines = [
+            f"expression: {self._format(labels)}",
+            f"simplified: {plan.expression._format(labels)}",
+        ]
+
+        if isinstance(plan.expression, Operand):
+            lines.append("plan: copy of a single operand, no sweep")
+        else:
+            lines.append(f"plan: one fused sweep over {len(plan.operands)} operands, {boundary_count} boundaries")
+
+        for operand in plan.operands:
+            lines.append(f"  {labels.get(id(operand), 'empty')}: {len(operand.intervals)} intervals")
+
+        return '\n'.join(lines)
+
+class Operand(IntervalExpression):
+    def __init__(self, disjoint_interval: DisjointInterval):
+        self.disjoint_interval = disjoint_interval
+
+    def simplify(self):
+        return self
+
+    def _operands(self):
+        yield self.disjoint_interval
+
+    def _predicate(self, positions: dict):
+        position = positions[id(self.disjoint_interval)]
+        return lambda mask: bool(mask >> position & 1)
+
+    def _key(self) -> tuple:
+        return ('operand', id(self.disjoint_interval))
+
+    def _format(self, labels: dict) -> str:
+        return labels.get(id(self.disjoint_interval), 'empty')
+
+class Complement(IntervalExpression):
+    def __init__(self, operand: IntervalExpression):
+        self.operand = operand
+
+    def simplify(self):
+        operand = self.operand.simplify()
+        if isinstance(operand, Complement):
+            return operand.operand
+
+        return Complement(operand)
+
+    def _operands(self):
+        return self.operand._operands()
+
+    def _predicate(self, positions: dict):
+        predicate = self.operand._predicate(positions)
+        return lambda mask: not predicate(mask)
+
+    def _key(self) -> tuple:
+        return ('~', self.operand._key())
+
+    def _format(self, labels: dict) -> str:
+        return f"~{self.operand._format(labels)}"
+
+class Difference(IntervalExpression):
+    def __init__(self, left: IntervalExpression, right: IntervalExpression):
+        self.left = left
+        self.right = right
+
+    def simplify(self):
+        return Intersection(self.left, Complement(self.right)).simplify()
+
+    def _operands(self):
+        yield from self.left._operands()
+        yield from self.right._operands()
+
+    def _predicate(self, positions: dict):
+        left, right = self.left._predicate(positions), self.right._predicate(positions)
+        return lambda mask: left(mask) and not right(mask)
+
+    def _key(self) -> tuple:
+        return ('-', self.left._key(), self.right._key())
+
+    def _format(self, labels: dict) -> str:
+        return f"({self.left._format(labels)} - {self.right._format(labels)})"
+
+class _Associative(IntervalExpression):
+    # n-ary node of an associative and commutative operation
+    symbol = None
+
+    def __init__(self, *operands):
+        self.operands = operands
+
+    def _flatten(self) -> list:
+        operands = []
+        for operand in self.operands:
+            operand = operand.simplify()
+            if type(operand) is type(self):
+                operands.extend(operand.operands)
+            else:
+                operands.append(operand)
+
+        return operands
+
+    def _rebuild(self, operands: list):
+        if not operands:
+            return Operand(DisjointInterval([]))
+        if len(operands) == 1:
+            return operands[0]
+
+        return type(self)(*operands)
+
+    def _operands(self):
+        for operand in self.operands:
+            yield from operand._operands()
+
+    def _key(self) -> tuple:
+        return (self.symbol,) + tuple(operand._key() for operand in self.operands)
+
+    def _distinct(self) -> list:
+        # Union and intersection are idempotent, so repeats can be dropped
+        operands = {}
+        for operand in self._flatten():
+            operands.setdefault(operand._key(), operand)
+
+        return list(operands.values())
+
+    def _format(self, labels: dict) -> str:
+        return '(' + f" {self.symbol} ".join(operand._format(labels) for operand in self.operands) + ')'
+
+class Union(_Associative):
+    symbol = '|'
+
+    def simplify(self):
+        # Empty and repeated operands add nothing to a union
+        return self._rebuild([operand for operand in self._distinct() if not _is_empty(operand)])
+
+    def _predicate(self, positions: dict):
+        predicates = [operand._predicate(positions) for operand in self.operands]
+        return lambda mask: any(predicate(mask) for predicate in predicates)
+
+class Intersection(_Associative):
+    symbol = '&'
+
+    def simplify(self):
+        # An empty operand empties the whole intersection
+        operands = self._distinct()
+        for operand in operands:
+            if _is_empty(operand):
+                return operand
+
+        return self._rebuild(operands)
+
+    def _predicate(self, positions: dict):
+        predicates = [operand._predicate(positions) for operand in self.operands]
+        return lambda mask: all(predicate(mask) for predicate in predicates)
+
+class SymmetricDifference(_Associative):
+    symbol = '^'
+
+    def simplify(self):
+        # Operands repeated an even number of times cancel out
+        operands, counts = {}, {}
+        for operand in self._flatten():
+            if not _is_empty(operand):
+                key = operand._key()
+                operands.setdefault(key, operand)
+                counts[key] = counts.get(key, 0) + 1
+
+        return self._rebuild([operand for key, operand in operands.items() if counts[key] % 2 == 1])
+
+    def _predicate(self, positions: dict):
+        predicates = [operand._predicate(positions) for operand in self.operands]
+        return lambda mask: sum(predicate(mask) for predicate in predicates) % 2 == 1
+
+def _is_empty(expression: IntervalExpression) -> bool:
+    return isinstance(expression, Operand) and not expression.disjoint_interval.intervals
+
+def _operand_labels(expression: IntervalExpression) -> dict:
+    # Stable names for the distinct operands, in order of appearance
+    labels = {}
+    for disjoint_interval in expression._operands():
+        labels.setdefault(id(disjoint_interval), f"#{len(labels)}")
+
+    return labels
+
+class _TruthTable(dict):
+    # Predicate results memoized per mask of the operands covering a range
+    def __init__(self, predicate):
+        self.predicate = predicate
+
+    def __missing__(self, mask: int) -> bool:
+        is_kept = self[mask] = self.predicate(mask)
+        return is_kept
+
+class _Plan:
+    # Distinct operands of a simplified expression and its compiled predicate
+    def __init__(self, expression: IntervalExpression):
+        self.expression = expression
+
+        positions = {}
+        self.operands = []
+        for disjoint_interval in expression._operands():
+            if id(disjoint_interval) not in positions:
+                positions[id(disjoint_interval)] = len(self.operands)
+                self.operands.append(disjoint_interval)
+
+        self.keep = _TruthTable(expression._predicate(positions))
+
+def _fused_sweep(operands: list, keep) -> list:
+    # Single sweep over the boundaries of all operands, emitting the ranges
+    # where keep[mask] holds; bit i of the mask tells whether operand i
+    # covers the range after the current boundary. Boundaries are keys
+    # (value, side) as in _boundary_keys, tagged with their operand's bit.
+    keys = []
+    for position, operand in enumerate(operands):
+        bit = 1 << position
+        for interval in operand.intervals:
+            keys.append((interval.start, interval.is_start_open, bit))
+            keys.append((interval.end, not interval.is_end_open, bit))
+
+    # Each operand contributes one sorted run, which the sort merges
+    keys.sort()
+
+    mask = 0
+    is_kept = keep[mask]
+    start_key = (-inf, 1)
+    result = []
+
+    last = len(keys) - 1
+    for i, (value, side, bit) in enumerate(keys):
+        mask ^= bit
+
+        # Test the predicate once every operand has crossed the key
+        if i < last and keys[i + 1][0] == value and keys[i + 1][1] == side:
+            continue
+
+        kept = keep[mask]
+        if kept and not is_kept:
+            start_key = (value, side)
+        elif is_kept and not kept:
+            interval = _interval_between(start_key, (value, side))
+            if interval is not None:
+                result.append(interval)
+        is_kept = kept
+
+    if is_kept:
+        result.append(_interval_between(start_key, (inf, 0)))
+
+    return result
@@ -0,0 +1,139 @@
+from bisect import bisect_right
+
+from .utils import sort_intervals
+
+def _point_value(point):
+    return getattr(point, 'value', point)
+
+class SortedIntervalIndex:
+    """
+    Stabbing index over pairwise disjoint intervals.
+
+    Queries bisect the sorted start values, so each lookup costs O(log n).
+    """
+
+    def __init__(self, intervals):
+        self.intervals = sort_intervals(intervals)
+        self._starts = [interval.start for interval in self.intervals]
+
+    @classmethod
+    def _from_sorted(cls, intervals: list, starts: list):
+        # Index sharing already sorted lists, so that it follows their updates
+        index = cls.__new__(cls)
+        index.intervals = intervals
+        index._starts = starts
+
+        return index
+
+    def _find_at(self, position, value):
+        # An open start may push the containing interval one slot back
+        for candidate in (position - 1, position - 2):
+            if candidate < 0:
+                break
+
+            interval = self.intervals[candidate]
+            if interval.contains_value(value):
+                return interval
+
+        return None
+
+    def find(self, point):
+        value = _point_value(point)
+        return self._find_at(bisect_right(self._starts, value), value)
+
+    def find_all(self, points) -> list:
+        values = [_point_value(point) for point in points]
+        order = sorted(range(len(values)), key=values.__getitem__)
+
+        result = [None] * len(values)
+        position = 0
+        for i in order:
+            value = values[i]
+            while position < len(self._starts) and self._starts[position] <= value:
+                position += 1
+
+            result[i] = self._find_at(position, value)
+
+        return result
+
+class _TreeNode:
+    def __init__(self, center, by_start, by_end, left, right):
+        self.center = center
+        self.by_start = by_start
+        self.by_end = by_end
+        self.left = left
+        self.right = right
+
+def _build_tree(entries):
+    if not entries:
+        return None
+
+    endpoints = sorted(value for _, interval in entries for value in (interval.start, interval.end))
+    center = endpoints[len(endpoints) // 2]
+
+    left, right, middle = [], [], []
+    for entry in entries:
+        interval = entry[1]
+        if interval.end < center:
+            left.append(entry)
+        elif interval.start > center:
+            right.append(entry)
+        else:
+            middle.append(entry)
+
+    by_start = sorted(middle, key=lambda entry: entry[1].start)
+    by_end = sorted(middle, key=lambda entry: entry[1].end, reverse=True)
+
+    return _TreeNode(center, by_start, by_end, _build_tree(left), _build_tree(right))
+
+class IntervalTree:
+    """
+    Centered interval tree for possibly overlapping intervals.
+
+    A stabbing query visits O(log n) nodes plus the k intervals it reports.
+    """
+
+    def __init__(self, intervals):
+        self._root = _build_tree(list(enumerate(intervals)))
+
+    def stab(self, point) -> list:
+        # Return (position, interval) pairs for every interval containing the point
+        value = _point_value(point)
+        result = []
+
+        node = self._root
+        while node is not None:
+            if value < node.center:
+                for entry in node.by_start:
+                    if entry[1].start > value:
+                        break
+                    if entry[1].contains_value(value):
+                        result.append(entry)
+                node = node.left
+
+            elif value > node.center:
+                for entry in node.by_end:
+                    if entry[1].end < value:
+                        break
+                    if entry[1].contains_value(value):
+                        result.append(entry)
+                node = node.right
+
+            else:
+                result.extend(
+                    entry for entry in node.by_start if entry[1].contains_value(value)
+                )
+                node = None
+
+        return result
+
+    def find(self, point):
+        # Match a linear scan by reporting the first containing interval
+        entries = self.stab(point)
+        if not entries:
+            return None
+
+        return min(entries, key=lambda entry: entry[0])[1]
+
+    def find_all(self, points) -> list:
+        return [self.find(point) for point in points]
@@ -1,59 +1,89 @@
+from bisect import bisect_left, bisect_right
+from functools import lru_cache
+from heapq import merge as heapq_merge
+from math import inf
+from operator import and_, or_, xor
+
+import numpy as np
+
 from .errors import PointError, \
-    ContinuousIntervalError
+    ContinuousIntervalError, \
+    ImmutableAttributeError
 
-from .utils import continuous_interval_values
+from .utils import continuous_interval_values, interval_sort_key, sort_intervals
+from .index import SortedIntervalIndex
 
 class EmptySet:
     pass
 
+INTERN_CACHE_SIZE = 2 ** 16
+
 class Point:
+    __slots__ = ('value',)
+
     def __init__(self, value: float):
-        self.value = value
+        _set_point_value(self, value)
+
+    def __setattr__(self, name, value):
+        raise ImmutableAttributeError('Point', name)
+
+    def __delattr__(self, name):
+        raise ImmutableAttributeError('Point', name)
+
+    def __reduce__(self):
+        return (Point, (self.value,))
 
+    def __hash__(self) -> int:
+        # Tagged with the class, so that mixed hash tables never compare a Point
+        # with its bare value, which raises PointError
+        return hash((Point, self.value))
+
+    # Operands are checked against the exact class first, which is about twice
+    # as fast as isinstance alone when sorting or comparing many points
     def __eq__(self, other) -> bool:
-        if isinstance(other, Point):
+        if other.__class__ is Point or isinstance(other, Point):
             return self.value == other.value
         else:
             raise PointError('==', other)
 
     def __ne__(self, other) -> bool:
-        if isinstance(other, Point):
+        if other.__class__ is Point or isinstance(other, Point):
             return self.value != other.value
         else:
             raise PointError('!=', other)
 
     def __lt__(self, other) -> bool:
-        if isinstance(other, Point):
+        if other.__class__ is Point or isinstance(other, Point):
             return self.value < other.value
         else:
             raise PointError('<', other)
 
     def __le__(self, other) -> bool:
-        if isinstance(other, Point):
+        if other.__class__ is Point or isinstance(other, Point):
             return self.value <= other.value
         else:
             raise PointError('<=', other)
 
     def __gt__(self, other) -> bool:
-        if isinstance(other, Point):
+        if other.__class__ is Point or isinstance(other, Point):
             return self.value > other.value
         else:
             raise PointError('>', other)
 
     def __ge__(self, other) -> bool:
-        if isinstance(other, Point):
+        if other.__class__ is Point or isinstance(other, Point):
             return self.value >= other.value
         else:
             raise PointError('>=', other)
 
     def __add__(self, other) -> bool:
-        if isinstance(other, Point):
+        if other.__class__ is Point or isinstance(other, Point):
             return Point(self.value + other.value)
         else:
             raise PointError('+', other)
 
     def __sub__(self, other) -> bool:
-        if isinstance(other, Point):
+        if other.__class__ is Point or isinstance(other, Point):
             return Point(self.value - other.value)
         else:
             raise PointError('-', other)
@@ -61,7 +91,12 @@ class Point:
     def __repr__(self) -> str:
         return f"Point({self.value})"
 
+# Instances are frozen, so __init__ writes through the slot descriptors
+_set_point_value = Point.value.__set__
+
 class ContinuousInterval:
+    __slots__ = ('start', 'end', 'is_start_open', 'is_end_open')
+
     def __init__(self, start, end, is_start_open=False, is_end_open=False):
         if start >= end:
             category='Invalid interval'
@@ -69,10 +104,22 @@ class ContinuousInterval:
             inverted_msg=f"{category}: {reason}"
             raise ValueError(inverted_msg)
 
-        self.start = start
-        self.end = end
-        self.is_start_open = is_start_open
-        self.is_end_open = is_end_open
+        _set_start(self, start)
+        _set_end(self, end)
+        _set_start_open(self, is_start_open)
+        _set_end_open(self, is_end_open)
+
+    def __setattr__(self, name, value):
+        raise ImmutableAttributeError('ContinuousInterval', name)
+
+    def __delattr__(self, name):
+        raise ImmutableAttributeError('ContinuousInterval', name)
+
+    def __reduce__(self):
+        return (ContinuousInterval, continuous_interval_values(self))
+
+    def __hash__(self) -> int:
+        return hash((ContinuousInterval,) + continuous_interval_values(self))
     
     @staticmethod
     def empty():
@@ -100,29 +147,29 @@ class ContinuousInterval:
         return False
 
     def __eq__(self, other) -> bool:
-        if isinstance(other, EmptySet):
+        if other.__class__ is ContinuousInterval or isinstance(other, ContinuousInterval):
+            return self.start == other.start and \
+                self.end == other.end and \
+                self.is_start_open == other.is_start_open and \
+                self.is_end_open == other.is_end_open
+
+        elif isinstance(other, EmptySet):
             return False
-        
-        elif isinstance(other, ContinuousInterval):
-            self_props=continuous_interval_values(self)
-            other_props=continuous_interval_values(other)
 
-            return self_props == other_props
-                   
         else:
             raise ContinuousIntervalError('==', other)
 
     def __ne__(self, other) -> bool:
-        if isinstance(other, ContinuousInterval):
-            self_props=continuous_interval_values(self)
-            other_props=continuous_interval_values(other)
-
-            return self_props != other_props
+        if other.__class__ is ContinuousInterval or isinstance(other, ContinuousInterval):
+            return self.start != other.start or \
+                self.end != other.end or \
+                self.is_start_open != other.is_start_open or \
+                self.is_end_open != other.is_end_open
         else:
             raise ContinuousIntervalError('!=', other)
 
     def __lt__(self, other) -> bool:
-        if isinstance(other, ContinuousInterval):
+        if other.__class__ is ContinuousInterval or isinstance(other, ContinuousInterval):
             end_lesser_than_start = self.end < other.start
             open_overlapping = self.end == other.start and \
                 (self.is_end_open or other.is_start_open)
@@ -135,7 +182,7 @@ class ContinuousInterval:
         raise ContinuousIntervalError('<=', other)
     
     def __gt__(self, other) -> bool:
-        if isinstance(other, ContinuousInterval):
+        if other.__class__ is ContinuousInterval or isinstance(other, ContinuousInterval):
             start_greater_than_end = self.start > other.end
             open_overlapping = self.start == other.end and \
                 (self.is_start_open or other.is_end_open)
@@ -159,9 +206,11 @@ class ContinuousInterval:
         else:
             raise ContinuousIntervalError('+', other)
 
-    # todo: implement __sub__ method
     def __sub__(self, other):
-        raise ContinuousIntervalError('-', other)
+        if isinstance(other, ContinuousInterval):
+            return DisjointInterval([self]).difference(DisjointInterval([other]))
+        else:
+            raise ContinuousIntervalError('-', other)
     
     def length(self) -> float:
         return self.end - self.start
@@ -303,53 +352,392 @@ class ContinuousInterval:
         
         return f"{left_bracket}{self.start}, {self.end}{right_bracket}"
     
+_set_start = ContinuousInterval.start.__set__
+_set_end = ContinuousInterval.end.__set__
+_set_start_open = ContinuousInterval.is_start_open.__set__
+_set_end_open = ContinuousInterval.is_end_open.__set__
+
+@lru_cache(maxsize=INTERN_CACHE_SIZE)
+def interned_interval(start, end, is_start_open=False, is_end_open=False) -> ContinuousInterval:
+    # Shared instance for frequently repeated intervals; clear with cache_clear()
+    return ContinuousInterval(start, end, is_start_open, is_end_open)
+
+def _lower_start(a, b) -> tuple:
+    # Leftmost start of two intervals, closed if either is closed there
+    if a.start != b.start:
+        lowest = a if a.start < b.start else b
+        return lowest.start, lowest.is_start_open
+
+    return a.start, a.is_start_open and b.is_start_open
+
+def _upper_end(a, b) -> tuple:
+    # Rightmost end of two intervals, closed if either is closed there
+    if a.end != b.end:
+        highest = a if a.end > b.end else b
+        return highest.end, highest.is_end_open
+
+    return a.end, a.is_end_open and b.is_end_open
+
+def _are_mergeable(a, b) -> bool:
+    # Whether a and b (with a.start <= b.start) overlap or touch
+    if b.start != a.end:
+        return b.start < a.end
+
+    return not (a.is_end_open and b.is_start_open)
+
+def _merge(a, b) -> ContinuousInterval:
+    start, is_start_open = _lower_start(a, b)
+    end, is_end_open = _upper_end(a, b)
+
+    return ContinuousInterval(start, end, is_start_open, is_end_open)
+
+def _coalesce_step(merged_intervals: list, interval: ContinuousInterval):
+    if merged_intervals and _are_mergeable(merged_intervals[-1], interval):
+        merged_intervals[-1] = _merge(merged_intervals[-1], interval)
+
+        # Ties on start may close an open start that touches the previous interval
+        if len(merged_intervals) > 1 and _are_mergeable(merged_intervals[-2], merged_intervals[-1]):
+            last = merged_intervals.pop()
+            merged_intervals[-1] = _merge(merged_intervals[-1], last)
+    else:
+        merged_intervals.append(interval)
+
+def _coalesce(sorted_intervals) -> list:
+    merged_intervals = []
+
+    for interval in sorted_intervals:
+        _coalesce_step(merged_intervals, interval)
+
+    return merged_intervals
+
+def merge_sorted(*iterables):
+    # Lazily k-way merge interval streams sorted by start, yielding coalesced
+    # intervals as soon as no later interval can touch them
+    pending = []
+    last_start = None
+
+    for interval in heapq_merge(*iterables, key=interval_sort_key):
+        if last_start is not None and interval.start < last_start:
+            category='Invalid interval stream'
+            reason='intervals must be sorted by start'
+            raise ValueError(f"{category}: {reason}")
+        last_start = interval.start
+
+        while len(pending) > 1 and pending[0].end < interval.start:
+            yield pending.pop(0)
+
+        _coalesce_step(pending, interval)
+
+    yield from pending
+
+def _boundary_keys(intervals):
+    # Endpoints as keys on the extended line, where (x, 0) sits just before x
+    # and (x, 1) just after it, so every interval is the open range between
+    # its two keys whatever its open/closed flags
+    for interval in intervals:
+        yield (interval.start, 1 if interval.is_start_open else 0)
+        yield (interval.end, 0 if interval.is_end_open else 1)
+
+def _interval_between(start_key, end_key):
+    # Ranges collapsing to a single point are not representable and yield None
+    start, start_side = start_key
+    end, end_side = end_key
+    if not start < end:
+        return None
+
+    return ContinuousInterval(start, end, start_side == 1, end_side == 0)
+
+def _only_first(inside_first: bool, inside_second: bool) -> bool:
+    return inside_first and not inside_second
+
+def _neither(inside_first: bool, inside_second: bool) -> bool:
+    return not (inside_first or inside_second)
+
+def _sweep(first, second, keep) -> list:
+    # Two-pointer sweep over the sorted boundaries of two disjoint sets,
+    # emitting the ranges where keep(inside_first, inside_second) holds
+    first_keys = _boundary_keys(first)
+    second_keys = _boundary_keys(second)
+    first_key = next(first_keys, None)
+    second_key = next(second_keys, None)
+
+    inside_first = inside_second = False
+    inside = keep(False, False)
+    start_key = (-inf, 1)
+    result = []
+
+    while first_key is not None or second_key is not None:
+        if second_key is None or (first_key is not None and first_key <= second_key):
+            key = first_key
+        else:
+            key = second_key
+
+        if first_key == key:
+            inside_first = not inside_first
+            first_key = next(first_keys, None)
+        if second_key == key:
+            inside_second = not inside_second
+            second_key = next(second_keys, None)
+
+        is_kept = keep(inside_first, inside_second)
+        if is_kept and not inside:
+            start_key = key
+        elif inside and not is_kept:
+            interval = _interval_between(start_key, key)
+            if interval is not None:
+                result.append(interval)
+        inside = is_kept
+
+    if inside:
+        result.append(_interval_between(start_key, (inf, 0)))
+
+    return result
+
 class DisjointInterval:
-    def __init__(self, intervals: list):
-        self.intervals = intervals
+    def __init__(self, intervals: list, indexed: bool = False):
+        self.indexed = indexed
+        self._set_intervals(intervals)
+
+    @classmethod
+    def _from_normalized(cls, intervals: list, indexed: bool = False):
+        disjoint_interval = cls([], indexed)
+        disjoint_interval._replace(0, 0, intervals)
+
+        return disjoint_interval
+
+    def _set_intervals(self, intervals):
+        # Intervals are kept sorted and merged, with their endpoints mirrored
+        # in plain lists so that updates and lookups can bisect them
+        self.intervals = _coalesce(sort_intervals(intervals))
+        self._starts = [interval.start for interval in self.intervals]
+        self._ends = [interval.end for interval in self.intervals]
 
-    # TODO: Create private method to verify if there is overlapping intervals 
+    def _replace(self, lo: int, hi: int, intervals: list):
+        self.intervals[lo:hi] = intervals
+        self._starts[lo:hi] = [interval.start for interval in intervals]
+        self._ends[lo:hi] = [interval.end for interval in intervals]
+
+    def _candidates(self, interval) -> tuple:
+        # Slice of stored intervals that overlap or touch the given one
+        lo = bisect_left(self._ends, interval.start)
+        hi = bisect_right(self._starts, interval.end)
+
+        return lo, hi
 
     def add_interval(self, interval: ContinuousInterval):
-        # Add a new continuous interval to the collection
-        # FIXME: Verify if it overlaps any existent interval and fix it
-        self.intervals.append(interval)
+        # Add a new continuous interval, coalescing it with its neighbours
+        lo, hi = self._candidates(interval)
+
+        if lo < hi and not _are_mergeable(self.intervals[lo], interval):
+            lo += 1
+        if lo < hi and not _are_mergeable(interval, self.intervals[hi - 1]):
+            hi -= 1
+
+        if lo < hi:
+            interval = _merge(_merge(self.intervals[lo], interval), self.intervals[hi - 1])
+
+        self._replace(lo, hi, [interval])
+
+    def remove_interval(self, interval: ContinuousInterval):
+        # Remove the values covered by the given interval. Leftovers reduced
+        # to a single point cannot be represented and are dropped.
+        lo, hi = self._candidates(interval)
+        if lo == hi:
+            return
+
+        first, last = self.intervals[lo], self.intervals[hi - 1]
+        remainders = []
+
+        if first.start < interval.start:
+            if first.end > interval.start:
+                end, is_end_open = interval.start, not interval.is_start_open
+            else:
+                end, is_end_open = first.end, first.is_end_open or not interval.is_start_open
+
+            remainders.append(ContinuousInterval(first.start, end, first.is_start_open, is_end_open))
+
+        if interval.end < last.end:
+            if last.start < interval.end:
+                start, is_start_open = interval.end, not interval.is_end_open
+            else:
+                start, is_start_open = last.start, last.is_start_open or not interval.is_end_open
+
+            remainders.append(ContinuousInterval(start, last.end, is_start_open, last.is_end_open))
+
+        self._replace(lo, hi, remainders)
 
     def merge_overlapping_intervals(self):
         # Merge overlapping intervals within the collection
-        # FIXME: Add guard to verify overlapping
-        merged_intervals = []
-        sorted_intervals = sorted(self.intervals, key=lambda interval: interval.start)
-        
-        for interval in sorted_intervals:
-            if not merged_intervals or merged_intervals[-1].end < interval.start:
-                merged_intervals.append(interval)
-            else:
-                merged_intervals[-1].end = max(merged_intervals[-1].end, interval.end)
-        
-        self.intervals = merged_intervals
+        self._set_intervals(self.intervals)
 
     def get_non_overlapping_intervals(self):
         # Retrieve a list of non-overlapping intervals
-        self.merge_overlapping_intervals()
         return self.intervals
 
+    # Set algebra runs one linear sweep over both sorted boundary lists
+    def union(self, other):
+        return DisjointInterval._from_normalized(_sweep(self.intervals, other.intervals, or_))
+
+    def intersection(self, other):
+        return DisjointInterval._from_normalized(_sweep(self.intervals, other.intervals, and_))
+
+    def difference(self, other):
+        return DisjointInterval._from_normalized(_sweep(self.intervals, other.intervals, _only_first))
+
+    def symmetric_difference(self, other):
+        return DisjointInterval._from_normalized(_sweep(self.intervals, other.intervals, xor))
+
+    # Operators build lazy expressions, evaluated by one fused sweep
+    def _expression(self):
+        from .expressions import Operand
+
+        return Operand(self)
+
+    def __or__(self, other):
+        return self._expression() | other
+
+    def __and__(self, other):
+        return self._expression() & other
+
+    def __sub__(self, other):
+        return self._expression() - other
+
+    def __xor__(self, other):
+        return self._expression() ^ other
+
+    def __invert__(self):
+        return ~self._expression()
+
+    def complement(self, within: ContinuousInterval = None):
+        # Complement over the real line, or relative to the given interval
+        if within is not None:
+            return DisjointInterval([within]).difference(self)
+
+        return DisjointInterval._from_normalized(_sweep(self.intervals, [], _neither))
+
+    @classmethod
+    def load(cls, path, indexed: bool = False):
+        # Saved DisjointIntervals skip normalization; other interval files are merged
+        from .storage import INTERVALS, NORMALIZED, read_blocks
+
+        kind, flags, array = read_blocks(path)[0]
+        if kind != INTERVALS:
+            category='Invalid interval file'
+            reason='first block does not hold intervals'
+            raise ValueError(f"{category}: {reason}")
+
+        if flags & NORMALIZED:
+            return cls._from_normalized(array.to_intervals(), indexed)
+
+        return cls(array.to_intervals(), indexed)
+
+    def save(self, path):
+        from .arrays import IntervalArray
+        from .storage import INTERVALS, NORMALIZED, write_blocks
+
+        write_blocks(path, [(INTERVALS, NORMALIZED, IntervalArray.from_intervals(self.intervals))])
+
+    def covered_length(self) -> float:
+        from .arrays import IntervalArray
+
+        return IntervalArray.from_intervals(self.intervals).covered_length()
+
+    def max_depth(self) -> int:
+        # Stored intervals never overlap
+        return 1 if self.intervals else 0
+
+    def coverage_profile(self, bins=10) -> tuple:
+        # Fraction of each bin covered by the intervals, and the bin edges
+        from .arrays import IntervalArray
+
+        return IntervalArray.from_intervals(self.intervals).coverage_profile(bins)
+
+    def get_index(self):
+        # Stored intervals are sorted and disjoint, so the index bisects them in place
+        return SortedIntervalIndex._from_sorted(self.intervals, self._starts)
+
     def get_interval_containing_point(self, point):
         # Find the interval (if any) that contains the given point
+        if self.indexed:
+            return self.get_index().find(point)
+
         for interval in self.intervals:
             if interval.contains_point(point):
                 return interval
         
         return None
 
+    def find_containing(self, points) -> list:
+        # Containing interval (or None) for each point, answered in one sweep
+        return self.get_index().find_all(points)
+
 class IntervalSet:
     def __init__(self, points, intervals, disjoint_intervals):
         self.points = points
         self.intervals = intervals
         self.disjoint_intervals = disjoint_intervals
 
-    def find_intervals_containing_points(self, points):
-        # Perform operations involving points and intervals together
-        pass
+    @classmethod
+    def load(cls, path, mmap: bool = True):
+        # Intervals come back as an IntervalArray, memory-mapped unless mmap is False
+        from .storage import INTERVALS, POINTS, read_blocks
+
+        blocks = read_blocks(path, mmap)
+        if [kind for kind, _, _ in blocks[:2]] != [POINTS, INTERVALS] or len(blocks) != 3:
+            category='Invalid interval file'
+            reason='expected point, interval and disjoint interval blocks'
+            raise ValueError(f"{category}: {reason}")
+
+        (_, _, values), (_, _, intervals), (_, _, disjoint_intervals) = blocks
+
+        if disjoint_intervals is not None:
+            disjoint_intervals = DisjointInterval._from_normalized(disjoint_intervals.to_intervals())
+
+        return cls([Point(value) for value in values.tolist()], intervals, disjoint_intervals)
+
+    def save(self, path):
+        from .arrays import IntervalArray
+        from .storage import INTERVALS, POINTS, MISSING, NORMALIZED, write_blocks
+
+        values = [getattr(point, 'value', point) for point in self.points]
+        intervals = self._interval_array()
+
+        if self.disjoint_intervals is None:
+            disjoint_block = (MISSING, 0, None)
+        else:
+            disjoint_array = IntervalArray.from_intervals(self.disjoint_intervals.intervals)
+            disjoint_block = (INTERVALS, NORMALIZED, disjoint_array)
+
+        write_blocks(path, [(POINTS, 0, values), (INTERVALS, 0, intervals), disjoint_block])
+
+    def _interval_array(self):
+        from .arrays import IntervalArray
+
+        if isinstance(self.intervals, IntervalArray):
+            return self.intervals
+
+        return IntervalArray.from_intervals(self.intervals)
+
+    def covered_length(self) -> float:
+        # Measure of the union of the (possibly overlapping) intervals
+        return self._interval_array().covered_length()
+
+    def max_depth(self) -> int:
+        # Largest number of intervals sharing a value
+        return self._interval_array().max_depth()
+
+    def coverage_profile(self, bins=10) -> tuple:
+        # Mean number of intervals covering each bin, and the bin edges
+        return self._interval_array().coverage_profile(bins)
+
+    def find_intervals_containing_points(self, points) -> tuple:
+        # Sparse (point index, interval index) pairs with point in interval
+        intervals = self._interval_array()
+
+        if not isinstance(points, np.ndarray):
+            points = [getattr(point, 'value', point) for point in points]
+
+        return intervals.containing_pairs(points)
 
     def merge_overlapping_intervals_within_disjoint_intervals(self):
         # Perform operations involving intervals and disjoint intervals together
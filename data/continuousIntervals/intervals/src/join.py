@@ -0,0 +1,53 @@
+from heapq import heappush, heappop, merge
+
+from .utils import interval_sort_key
+
+def _start_events(intervals, side: int):
+    keys = list(map(interval_sort_key, intervals))
+    order = sorted(range(len(intervals)), key=keys.__getitem__)
+
+    for index in order:
+        interval = intervals[index]
+        yield interval.start, interval.is_start_open, side, index
+
+class _ActiveIntervals:
+    # Intervals whose end has not been swept past yet, evicted by end value
+    def __init__(self):
+        self.intervals = {}
+        self._ends = []
+
+    def add(self, index, interval):
+        self.intervals[index] = interval
+        heappush(self._ends, (interval.end, not interval.is_end_open, index))
+
+    def evict_before(self, start):
+        # Drop intervals that end before start or at start with an open end
+        while self._ends and self._ends[0] < (start, True):
+            del self.intervals[heappop(self._ends)[2]]
+
+def overlap_join(left, right):
+    """
+    Lazily yield (left index, right index) for every pair of overlapping
+    intervals, with the open/closed semantics of is_overlapping.
+
+    Both collections are sorted by start once and swept together, so the
+    join costs O((n + m) log(n + m) + k) for k overlapping pairs.
+    """
+    left = list(left)
+    right = list(right)
+    sides = (left, right)
+    active = (_ActiveIntervals(), _ActiveIntervals())
+
+    events = merge(_start_events(left, 0), _start_events(right, 1))
+    for start, is_start_open, side, index in events:
+        other = active[1 - side]
+        other.evict_before(start)
+
+        # Survivors end after start, or exactly at it with a closed end
+        for other_index, other_interval in other.intervals.items():
+            if other_interval.end == start and is_start_open:
+                continue
+
+            yield (index, other_index) if side == 0 else (other_index, index)
+
+        active[side].add(index, sides[side][index])
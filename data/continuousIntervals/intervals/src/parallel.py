@@ -0,0 +1,277 @@
+import os
+from concurrent.futures import ProcessPoolExecutor
+from multiprocessing import shared_memory
+
+import numpy as np
+
+from .arrays import IntervalArray, _common_dtype, _query_column, concatenate, set_intersection
+
+_COLUMNS = ('starts', 'ends', 'is_start_open', 'is_end_open')
+
+class _SharedColumns:
+    # Named shared-memory copies of NumPy arrays that workers map without copying
+    def __init__(self, **columns):
+        self.blocks = {}
+        self.spec = {}
+
+        for name, column in columns.items():
+            column = np.ascontiguousarray(column)
+            block = shared_memory.SharedMemory(create=True, size=max(column.nbytes, 1))
+            np.ndarray(column.shape, column.dtype, buffer=block.buf)[:] = column
+
+            self.blocks[name] = block
+            self.spec[name] = (block.name, column.dtype.str, len(column))
+
+    def release(self):
+        for block in self.blocks.values():
+            block.close()
+            block.unlink()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc_info):
+        self.release()
+
+def _attach(spec) -> tuple:
+    blocks, columns = [], {}
+
+    for name, (block_name, dtype, length) in spec.items():
+        block = shared_memory.SharedMemory(name=block_name)
+        blocks.append(block)
+        columns[name] = np.ndarray((length,), np.dtype(dtype), buffer=block.buf)
+
+    return blocks, columns
+
+def _run_attached(task, spec, *args):
+    blocks, columns = _attach(spec)
+    try:
+        return task(columns, *args)
+    finally:
+        # Views on the blocks must be gone before they can be closed
+        del columns
+        for block in blocks:
+            block.close()
+
+def _partition_array(columns, prefix: str, dtype, native: tuple, spanning: np.ndarray) -> IntervalArray:
+    # Intervals starting in the partition plus the ones reaching into it
+    lo, hi = native
+    indices = np.concatenate((np.arange(lo, hi), spanning))
+
+    return IntervalArray(*(columns[prefix + name][indices] for name in _COLUMNS), dtype)
+
+def _clip(array: IntervalArray, lo, hi) -> IntervalArray:
+    # Part of normalized intervals within [lo, hi); None leaves a side unbounded
+    starts, ends = array.starts, array.ends
+    is_start_open, is_end_open = array.is_start_open, array.is_end_open
+
+    keep = np.ones(len(array), bool)
+    if lo is not None:
+        keep &= (ends > lo) | ((ends == lo) & ~is_end_open)
+    if hi is not None:
+        keep &= starts < hi
+    starts, ends = starts[keep], ends[keep]
+    is_start_open, is_end_open = is_start_open[keep], is_end_open[keep]
+
+    if lo is not None:
+        below = starts < lo
+        starts = np.where(below, lo, starts)
+        is_start_open = is_start_open & ~below
+    if hi is not None:
+        above = ends >= hi
+        ends = np.where(above, hi, ends)
+        is_end_open = is_end_open | above
+
+    return IntervalArray(starts, ends, is_start_open, is_end_open, array.dtype)
+
+def _stitch(results, dtype) -> IntervalArray:
+    # Join normalized partition results following each other in start order.
+    # Only the interval reaching furthest so far can overlap or touch the
+    # next intervals, and only the leading ones of each following result.
+    array = concatenate(results)
+    starts, ends = array.starts, array.ends.copy()
+    is_start_open, is_end_open = array.is_start_open, array.is_end_open.copy()
+    keep = np.ones(len(array), bool)
+
+    tail = None
+    offset = 0
+    for result in results:
+        size = len(result)
+        joined = 0
+        if tail is not None and size:
+            joined = int(np.searchsorted(starts[offset:offset + size], ends[tail], side='left'))
+            if joined < size and starts[offset + joined] == ends[tail] \
+                    and not (is_end_open[tail] and is_start_open[offset + joined]):
+                joined += 1
+
+        if joined:
+            # Ends grow within a normalized result, so the last joined one reaches furthest
+            last = offset + joined - 1
+            if ends[last] > ends[tail] or (ends[last] == ends[tail] and not is_end_open[last]):
+                ends[tail], is_end_open[tail] = ends[last], is_end_open[last]
+            keep[offset:last + 1] = False
+
+        if joined < size:
+            tail = offset + size - 1
+        offset += size
+
+    return IntervalArray(starts[keep], ends[keep], is_start_open[keep], is_end_open[keep], dtype)
+
+def _merge_task(columns, dtype, native):
+    # Merging needs no spanning intervals: the stitching joins partitions.
+    # Columns are already in start order, so they are merged without sorting again.
+    lo, hi = native
+    return IntervalArray(*(columns[name][lo:hi] for name in _COLUMNS), dtype)._merge_sorted()
+
+def _intersection_task(columns, dtype, first_partition, second_partition, bounds):
+    first = _partition_array(columns, 'first_', dtype, *first_partition)
+    second = _partition_array(columns, 'second_', dtype, *second_partition)
+
+    # Outside its range a partition misses intervals, so only the range is kept
+    return _clip(set_intersection(first, second), *bounds)
+
+def _point_join_task(columns, dtype, native, spanning, value_range):
+    indices = np.concatenate((np.arange(*native), spanning))
+    array = IntervalArray(*(columns[name][indices] for name in _COLUMNS), dtype)
+
+    lo, hi = value_range
+    local_values, local_intervals = array.containing_pairs(columns['values'][lo:hi])
+
+    # Back to positions in the caller's collections
+    return columns['value_order'][lo + local_values], columns['interval_order'][indices[local_intervals]]
+
+def _sorted_columns(array: IntervalArray) -> tuple:
+    # Start order with closed starts first on ties, as the merge expects
+    order = np.lexsort((array.is_start_open, array.starts))
+    columns = {
+        'starts': array.starts[order],
+        'ends': array.ends[order],
+        'is_start_open': array.is_start_open[order],
+        'is_end_open': array.is_end_open[order],
+    }
+
+    return order, columns
+
+def _cut_points(starts: np.ndarray, partitions: int) -> np.ndarray:
+    # Inner range boundaries at start quantiles, in the storage dtype so that
+    # they stay exact; partition p covers [cuts[p - 1], cuts[p]), unbounded
+    # below for the first partition and above for the last one
+    positions = (np.arange(1, partitions) * len(starts)) // partitions
+    return np.unique(starts[positions]) if len(starts) else starts[:0]
+
+def _bounds(cuts: np.ndarray) -> list:
+    # (lo, hi) of every partition, None where it is unbounded
+    edges = [None] + list(cuts) + [None]
+    return list(zip(edges[:-1], edges[1:]))
+
+def _assign(starts: np.ndarray, ends: np.ndarray, cuts: np.ndarray) -> tuple:
+    # Native slices of start-sorted intervals and the spanning ones per partition
+    partitions = len(cuts) + 1
+    first = np.searchsorted(cuts, starts, side='right')
+    last = np.searchsorted(cuts, ends, side='right')
+
+    bounds = np.searchsorted(first, np.arange(partitions + 1))
+    native = [(int(bounds[p]), int(bounds[p + 1])) for p in range(partitions)]
+
+    spans = last - first
+    spanning_indices = np.repeat(np.arange(len(starts)), spans)
+    offsets = np.arange(len(spanning_indices)) - np.repeat(np.cumsum(spans) - spans, spans)
+    spanning_partitions = np.repeat(first, spans) + offsets + 1
+
+    order = np.argsort(spanning_partitions, kind='stable')
+    spanning_indices = spanning_indices[order]
+    spanning_bounds = np.searchsorted(spanning_partitions[order], np.arange(partitions + 1))
+    spanning = [spanning_indices[spanning_bounds[p]:spanning_bounds[p + 1]] for p in range(partitions)]
+
+    return native, spanning
+
+class ParallelIntervalExecutor:
+    """
+    Runs interval operations over range partitions in a process pool.
+
+    Intervals are sorted by start and split at start quantiles; intervals
+    reaching past their partition are repeated in the partitions they span.
+    Columns travel to the workers through shared memory, and per-partition
+    results are stitched back together in one pass over the partition
+    boundaries.
+    """
+
+    def __init__(self, workers: int = None, partitions: int = None):
+        self.workers = workers or os.cpu_count() or 1
+        self.partitions = partitions or self.workers
+        self._pool = None
+
+    @property
+    def pool(self) -> ProcessPoolExecutor:
+        if self._pool is None:
+            self._pool = ProcessPoolExecutor(max_workers=self.workers)
+
+        return self._pool
+
+    def close(self):
+        if self._pool is not None:
+            self._pool.shutdown()
+            self._pool = None
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc_info):
+        self.close()
+
+    def _map(self, task, spec, dtype, arguments) -> list:
+        futures = [self.pool.submit(_run_attached, task, spec, dtype, *args) for args in arguments]
+        return [future.result() for future in futures]
+
+    def merge(self, array: IntervalArray) -> IntervalArray:
+        _, columns = _sorted_columns(array)
+        cuts = _cut_points(columns['starts'], self.partitions)
+        native, _ = _assign(columns['starts'], columns['ends'], cuts)
+
+        with _SharedColumns(**columns) as shared:
+            results = self._map(_merge_task, shared.spec, array.dtype, zip(native))
+
+        return _stitch(results, array.dtype)
+
+    def intersection(self, first: IntervalArray, second: IntervalArray) -> IntervalArray:
+        # Values covered by both collections, as sorted non-overlapping intervals
+        dtype = _common_dtype([first, second])
+
+        _, first_columns = _sorted_columns(first)
+        _, second_columns = _sorted_columns(second)
+
+        all_starts = np.sort(np.concatenate((first_columns['starts'], second_columns['starts'])))
+        cuts = _cut_points(all_starts, self.partitions)
+        first_partitions = zip(*_assign(first_columns['starts'], first_columns['ends'], cuts))
+        second_partitions = zip(*_assign(second_columns['starts'], second_columns['ends'], cuts))
+
+        columns = {f"first_{name}": column for name, column in first_columns.items()}
+        columns.update({f"second_{name}": column for name, column in second_columns.items()})
+
+        with _SharedColumns(**columns) as shared:
+            arguments = zip(first_partitions, second_partitions, _bounds(cuts))
+            results = self._map(_intersection_task, shared.spec, dtype, arguments)
+
+        return _stitch(results, dtype)
+
+    def point_join(self, array: IntervalArray, values) -> tuple:
+        # (value index, interval index) pairs, as IntervalArray.containing_pairs
+        values = _query_column(values, array.dtype)
+        interval_order, columns = _sorted_columns(array)
+        value_order = np.argsort(values)
+        sorted_values = values[value_order]
+
+        cuts = _cut_points(columns['starts'], self.partitions)
+        native, spanning = _assign(columns['starts'], columns['ends'], cuts)
+        value_bounds = np.concatenate(([0], np.searchsorted(sorted_values, cuts, side='left'), [len(sorted_values)]))
+        value_ranges = [(int(value_bounds[p]), int(value_bounds[p + 1])) for p in range(len(cuts) + 1)]
+
+        columns.update(values=sorted_values, value_order=value_order, interval_order=interval_order)
+
+        with _SharedColumns(**columns) as shared:
+            results = self._map(_point_join_task, shared.spec, array.dtype, zip(native, spanning, value_ranges))
+
+        value_indices = np.concatenate([result[0] for result in results])
+        interval_indices = np.concatenate([result[1] for result in results])
+
+        return value_indices, interval_indices
@@ -0,0 +1,155 @@
+"""
+Versioned binary format for interval collections.
+
+A file holds a header followed by one or more blocks:
+
+    header  magic (8 bytes), format version (uint16), block count (uint16), 4 padding bytes
+    block   kind (uint8), flags (uint8), endpoint dtype code (uint8), 5 padding bytes,
+            row count n (uint64)
+            intervals: starts (n float64 or int64), ends (n float64 or int64),
+                       start and end open flags (ceil(n / 8) bytes each, packed bits)
+            points:    values (n float64)
+            missing:   no payload
+
+All numbers are little-endian and every block starts on an 8-byte boundary,
+so a memory-mapped file is read directly as NumPy arrays: loading costs one
+mmap call and the pages are shared by every process mapping the same file.
+
+The dtype code is the position of the IntervalArray backend in DTYPES, so
+0 is float64, 1 int64 and 2 datetimes as int64 nanoseconds since the epoch.
+Version 1 files had no dtype code and only float64 endpoints; they are read
+as code 0 from the padding byte.
+"""
+
+import struct
+
+import numpy as np
+
+from .arrays import DTYPES, IntervalArray
+
+MAGIC = b'RFINTVL\x00'
+FORMAT_VERSION = 2
+READABLE_VERSIONS = (1, 2)
+
+INTERVALS = 0
+POINTS = 1
+MISSING = 2
+
+# Block flag: intervals are sorted and non-overlapping, as in DisjointInterval
+NORMALIZED = 1
+
+_HEADER = struct.Struct('<8sHH4x')
+_BLOCK = struct.Struct('<BBB5xQ')
+
+_FLOAT64 = np.dtype('<f8')
+
+# Little-endian storage of the endpoint columns of each IntervalArray dtype
+_ENDPOINT_TYPES = (np.dtype('<f8'), np.dtype('<i8'), np.dtype('<i8'))
+
+def _padding(size: int) -> bytes:
+    return bytes(-size % 8)
+
+def _interval_payload(array: IntervalArray) -> list:
+    endpoint_type = _ENDPOINT_TYPES[DTYPES.index(array.dtype)]
+
+    return [
+        array.starts.astype(endpoint_type, copy=False).tobytes(),
+        array.ends.astype(endpoint_type, copy=False).tobytes(),
+        array._start_open_bits.tobytes(),
+        array._end_open_bits.tobytes(),
+    ]
+
+def write_blocks(path, blocks):
+    # Each block is a (kind, flags, data) triple; data is an IntervalArray,
+    # an array of point values or None
+    with open(path, 'wb') as file:
+        file.write(_HEADER.pack(MAGIC, FORMAT_VERSION, len(blocks)))
+
+        for kind, flags, data in blocks:
+            dtype_code = 0
+            if kind == INTERVALS:
+                dtype_code = DTYPES.index(data.dtype)
+                size, payload = len(data), _interval_payload(data)
+            elif kind == POINTS:
+                data = np.asarray(data, dtype=_FLOAT64)
+                size, payload = len(data), [data.tobytes()]
+            else:
+                size, payload = 0, []
+
+            file.write(_BLOCK.pack(kind, flags, dtype_code, size))
+            for part in payload:
+                file.write(part)
+
+            file.write(_padding(sum(len(part) for part in payload)))
+
+def _check_header(buffer: np.ndarray) -> int:
+    if len(buffer) < _HEADER.size:
+        category='Invalid interval file'
+        reason='file is shorter than its header'
+        raise ValueError(f"{category}: {reason}")
+
+    magic, version, block_count = _HEADER.unpack(buffer[:_HEADER.size].tobytes())
+
+    if magic != MAGIC:
+        category='Invalid interval file'
+        reason='unknown file signature'
+        raise ValueError(f"{category}: {reason}")
+
+    if version not in READABLE_VERSIONS:
+        category='Unsupported interval file'
+        reason=f"format version {version}, expected one of {READABLE_VERSIONS}"
+        raise ValueError(f"{category}: {reason}")
+
+    return block_count
+
+def read_blocks(path, mmap: bool = True) -> list:
+    # (kind, flags, data) triples; with mmap the arrays are read-only views
+    # on the mapped file instead of copies in memory
+    buffer = np.memmap(path, dtype=np.uint8, mode='r') if mmap else np.fromfile(path, dtype=np.uint8)
+    block_count = _check_header(buffer)
+
+    def take(offset: int, size: int, dtype) -> np.ndarray:
+        nbytes = size * np.dtype(dtype).itemsize
+        if offset + nbytes > len(buffer):
+            category='Invalid interval file'
+            reason='file is truncated'
+            raise ValueError(f"{category}: {reason}")
+
+        return buffer[offset:offset + nbytes].view(dtype)
+
+    blocks = []
+    offset = _HEADER.size
+    for _ in range(block_count):
+        kind, flags, dtype_code, size = _BLOCK.unpack(take(offset, _BLOCK.size, np.uint8).tobytes())
+        offset += _BLOCK.size
+        start = offset
+
+        if kind == INTERVALS:
+            if dtype_code >= len(DTYPES):
+                category='Invalid interval file'
+                reason=f"unknown endpoint dtype code {dtype_code}"
+                raise ValueError(f"{category}: {reason}")
+
+            endpoint_type = _ENDPOINT_TYPES[dtype_code]
+            flag_size = (size + 7) // 8
+            starts = take(offset, size, endpoint_type)
+            ends = take(offset + 8 * size, size, endpoint_type)
+            start_open_bits = take(offset + 16 * size, flag_size, np.uint8)
+            end_open_bits = take(offset + 16 * size + flag_size, flag_size, np.uint8)
+
+            data = IntervalArray.from_packed(starts, ends, start_open_bits, end_open_bits, DTYPES[dtype_code])
+            offset += 16 * size + 2 * flag_size
+        elif kind == POINTS:
+            data = take(offset, size, _FLOAT64)
+            offset += 8 * size
+        elif kind == MISSING:
+            data = None
+        else:
+            category='Invalid interval file'
+            reason=f"unknown block kind {kind}"
+            raise ValueError(f"{category}: {reason}")
+
+        offset += len(_padding(offset - start))
+        blocks.append((kind, flags, data))
+
+    return blocks
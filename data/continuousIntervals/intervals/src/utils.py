@@ -1,3 +1,5 @@
+from operator import attrgetter
+
 def operandErrorMessage(this_type, operation, other_type):
     classes_msg=f"'{this_type}' and '{other_type}'"
     return f"Unsupported operand type(s) for {operation}: {classes_msg}"
@@ -16,4 +18,11 @@ def continuous_interval_values(interval) -> tuple:
         interval.end, \
         interval.is_start_open, \
         interval.is_end_open, \
-    )
\ No newline at end of file
+    )
+
+# Intervals are ordered by start; ties keep their input order
+interval_sort_key = attrgetter('start')
+
+def sort_intervals(intervals) -> list:
+    # The key is read in C in a single pass, with no Python call per interval
+    return sorted(intervals, key=interval_sort_key)
@@ -0,0 +1,290 @@
+import math
+import random
+
+import pytest
+
+from src.intervals import Point, ContinuousInterval, DisjointInterval, merge_sorted
+from src.index import SortedIntervalIndex, IntervalTree
+
+@pytest.fixture
+def disjoint_intervals():
+    return [
+        ContinuousInterval(8, 10, True, False),
+        ContinuousInterval(0, 5, False, True),
+        ContinuousInterval(5, 8, True, True),
+        ContinuousInterval(12, 15, True, True),
+    ]
+
+@pytest.fixture
+def overlapping_intervals():
+    return [
+        ContinuousInterval(0, 10),
+        ContinuousInterval(2, 4, True, True),
+        ContinuousInterval(3, 12, False, True),
+        ContinuousInterval(11, 20),
+    ]
+
+@pytest.mark.parametrize("value", [-1, 0, 4.5, 5, 8, 9, 10, 11, 12, 13, 15, 16])
+def test_indexed_lookup_matches_linear_scan(disjoint_intervals, value):
+    linear = DisjointInterval(disjoint_intervals)
+    indexed = DisjointInterval(disjoint_intervals, indexed=True)
+
+    assert isinstance(indexed.get_index(), SortedIntervalIndex)
+    assert indexed.get_interval_containing_point(Point(value)) is \
+        linear.get_interval_containing_point(Point(value))
+
+@pytest.mark.parametrize("value", [-1, 0, 2, 3, 4, 10, 11, 12, 20, 21])
+def test_tree_lookup_matches_linear_scan(overlapping_intervals, value):
+    tree = IntervalTree(overlapping_intervals)
+    expected_result = next(
+        (interval for interval in overlapping_intervals if interval.contains_value(value)),
+        None
+    )
+
+    assert tree.find(Point(value)) is expected_result
+
+def test_tree_stab(overlapping_intervals):
+    tree = IntervalTree(overlapping_intervals)
+    positions = sorted(position for position, _ in tree.stab(Point(3)))
+
+    assert positions == [0, 1, 2]
+
+def test_find_containing():
+    rng = random.Random(42)
+    intervals = []
+    for _ in range(200):
+        start = rng.uniform(0, 100)
+        intervals.append(ContinuousInterval(start, start + rng.uniform(0.1, 5), rng.random() < 0.5))
+    points = [Point(rng.uniform(-5, 110)) for _ in range(500)]
+
+    disjoint_interval = DisjointInterval(intervals)
+    expected_result = [disjoint_interval.get_interval_containing_point(point) for point in points]
+
+    assert disjoint_interval.find_containing(points) == expected_result
+
+def test_index_is_rebuilt_after_add_interval(disjoint_intervals):
+    disjoint_interval = DisjointInterval(disjoint_intervals, indexed=True)
+    assert disjoint_interval.get_interval_containing_point(Point(20)) is None
+
+    disjoint_interval.add_interval(ContinuousInterval(18, 22))
+    assert disjoint_interval.get_interval_containing_point(Point(20)) == ContinuousInterval(18, 22)
+
+def test_index_follows_updates(disjoint_intervals):
+    disjoint_interval = DisjointInterval(disjoint_intervals, indexed=True)
+    index = disjoint_interval.get_index()
+
+    disjoint_interval.add_interval(ContinuousInterval(18, 22))
+    disjoint_interval.remove_interval(ContinuousInterval(0, 2))
+
+    assert index.find(Point(20)) == ContinuousInterval(18, 22)
+    assert index.find(Point(1)) is None
+    for value in [-1, 2, 4.5, 5, 9, 12, 13, 20, 22, 23]:
+        assert disjoint_interval.get_interval_containing_point(Point(value)) is \
+            next((interval for interval in disjoint_interval.intervals if interval.contains_value(value)), None)
+
+def test_intervals_are_normalized_on_construction(overlapping_intervals):
+    disjoint_interval = DisjointInterval(overlapping_intervals)
+    assert disjoint_interval.intervals == [ContinuousInterval(0, 20)]
+
+    disjoint_interval = DisjointInterval([
+        ContinuousInterval(5, 8, True, False),
+        ContinuousInterval(0, 5, False, True),
+        ContinuousInterval(8, 9, False, True),
+    ])
+    assert disjoint_interval.intervals == [
+        ContinuousInterval(0, 5, False, True),
+        ContinuousInterval(5, 9, True, True),
+    ]
+
+@pytest.mark.parametrize("interval, expected_result", [
+    (ContinuousInterval(20, 25), [(0, 5, False, True), (8, 10, True, False), (20, 25, False, False)]),
+    (ContinuousInterval(5, 8, True, False), [(0, 5, False, True), (5, 10, True, False)]),
+    (ContinuousInterval(5, 8), [(0, 10, False, False)]),
+    (ContinuousInterval(4, 9, True, True), [(0, 10, False, False)]),
+    (ContinuousInterval(-5, 0, False, True), [(-5, 5, False, True), (8, 10, True, False)]),
+    (ContinuousInterval(10, 11, True, False), [(0, 5, False, True), (8, 11, True, False)]),
+])
+def test_add_interval(interval, expected_result):
+    disjoint_interval = DisjointInterval([
+        ContinuousInterval(0, 5, False, True),
+        ContinuousInterval(8, 10, True, False),
+    ])
+    disjoint_interval.add_interval(interval)
+
+    assert disjoint_interval.intervals == [ContinuousInterval(*values) for values in expected_result]
+
+@pytest.mark.parametrize("interval, expected_result", [
+    (ContinuousInterval(20, 25), [(0, 10, False, False), (12, 15, False, True)]),
+    (ContinuousInterval(2, 4), [(0, 2, False, True), (4, 10, True, False), (12, 15, False, True)]),
+    (ContinuousInterval(2, 4, True, True), [(0, 2, False, False), (4, 10, False, False), (12, 15, False, True)]),
+    (ContinuousInterval(5, 13), [(0, 5, False, True), (13, 15, True, True)]),
+    (ContinuousInterval(10, 12, True, True), [(0, 10, False, False), (12, 15, False, True)]),
+    (ContinuousInterval(10, 12), [(0, 10, False, True), (12, 15, True, True)]),
+    (ContinuousInterval(-1, 15), []),
+])
+def test_remove_interval(interval, expected_result):
+    disjoint_interval = DisjointInterval([
+        ContinuousInterval(0, 10),
+        ContinuousInterval(12, 15, False, True),
+    ])
+    disjoint_interval.remove_interval(interval)
+
+    assert disjoint_interval.intervals == [ContinuousInterval(*values) for values in expected_result]
+
+def test_incremental_matches_bulk_normalization():
+    rng = random.Random(7)
+    intervals = []
+    disjoint_interval = DisjointInterval([])
+
+    for _ in range(300):
+        start = rng.randint(0, 200)
+        interval = ContinuousInterval(start, start + rng.randint(1, 6), rng.random() < 0.5, rng.random() < 0.5)
+        intervals.append(interval)
+        disjoint_interval.add_interval(interval)
+
+    assert disjoint_interval.intervals == DisjointInterval(intervals).intervals
+
+@pytest.fixture
+def calendar():
+    return DisjointInterval([ContinuousInterval(0, 10), ContinuousInterval(20, 30, True, True)])
+
+@pytest.fixture
+def bookings():
+    return DisjointInterval([ContinuousInterval(5, 25, False, True)])
+
+def test_union(calendar, bookings):
+    assert calendar.union(bookings).intervals == [ContinuousInterval(0, 30, False, True)]
+
+def test_intersection(calendar, bookings):
+    assert calendar.intersection(bookings).intervals == [
+        ContinuousInterval(5, 10),
+        ContinuousInterval(20, 25, True, True),
+    ]
+
+def test_difference(calendar, bookings):
+    assert calendar.difference(bookings).intervals == [
+        ContinuousInterval(0, 5, False, True),
+        ContinuousInterval(25, 30, False, True),
+    ]
+
+def test_symmetric_difference(calendar, bookings):
+    assert calendar.symmetric_difference(bookings).intervals == [
+        ContinuousInterval(0, 5, False, True),
+        ContinuousInterval(10, 20, True, False),
+        ContinuousInterval(25, 30, False, True),
+    ]
+
+def test_complement(calendar):
+    assert calendar.complement().intervals == [
+        ContinuousInterval(-math.inf, 0, True, True),
+        ContinuousInterval(10, 20, True, False),
+        ContinuousInterval(30, math.inf, False, True),
+    ]
+    assert calendar.complement(ContinuousInterval(-5, 40)).intervals == [
+        ContinuousInterval(-5, 0, False, True),
+        ContinuousInterval(10, 20, True, False),
+        ContinuousInterval(30, 40),
+    ]
+
+def test_set_algebra_matches_membership():
+    rng = random.Random(5)
+
+    def random_disjoint_interval():
+        intervals = []
+        for _ in range(40):
+            start = rng.randint(0, 100)
+            intervals.append(ContinuousInterval(start, start + rng.randint(1, 6), rng.random() < 0.5, rng.random() < 0.5))
+        return DisjointInterval(intervals)
+
+    def contains(disjoint_interval, value):
+        return any(interval.contains_value(value) for interval in disjoint_interval.intervals)
+
+    a, b = random_disjoint_interval(), random_disjoint_interval()
+    operations = [
+        (a.union(b), lambda x, y: x or y),
+        (a.intersection(b), lambda x, y: x and y),
+        (a.difference(b), lambda x, y: x and not y),
+        (a.symmetric_difference(b), lambda x, y: x != y),
+    ]
+
+    def expected_contains(expected, value):
+        return expected(contains(a, value), contains(b, value))
+
+    for value in [i / 2 for i in range(-2, 220)]:
+        for result, expected in operations:
+            if contains(result, value) == expected_contains(expected, value):
+                continue
+
+            # Only isolated single points may be missing from the result
+            assert expected_contains(expected, value)
+            assert not expected_contains(expected, value - 0.25)
+            assert not expected_contains(expected, value + 0.25)
+
+def test_continuous_interval_subtraction():
+    result = ContinuousInterval(0, 10) - ContinuousInterval(3, 4, True, True)
+
+    assert result.intervals == [ContinuousInterval(0, 3), ContinuousInterval(4, 10)]
+
+def test_merge_sorted():
+    first = iter([ContinuousInterval(0, 2), ContinuousInterval(5, 6, True, False), ContinuousInterval(9, 10)])
+    second = iter([ContinuousInterval(1, 3, False, True), ContinuousInterval(5, 7, False, True)])
+    third = iter([ContinuousInterval(3, 4, True, False)])
+
+    merged = merge_sorted(first, second, third)
+
+    assert next(merged) == ContinuousInterval(0, 3, False, True)
+    assert list(merged) == [
+        ContinuousInterval(3, 4, True, False),
+        ContinuousInterval(5, 7, False, True),
+        ContinuousInterval(9, 10),
+    ]
+
+def test_merge_sorted_matches_bulk_normalization():
+    rng = random.Random(13)
+    streams = []
+    for _ in range(5):
+        stream = []
+        for _ in range(60):
+            start = rng.randint(0, 150)
+            stream.append(ContinuousInterval(start, start + rng.randint(1, 5), rng.random() < 0.5, rng.random() < 0.5))
+        streams.append(sorted(stream, key=lambda interval: interval.start))
+
+    expected_result = DisjointInterval([interval for stream in streams for interval in stream]).intervals
+
+    assert list(merge_sorted(*streams)) == expected_result
+
+def test_merge_sorted_rejects_unsorted_stream():
+    with pytest.raises(ValueError):
+        list(merge_sorted([ContinuousInterval(5, 6), ContinuousInterval(0, 1)]))
+
+def test_save_and_load_round_trip(tmp_path):
+    disjoint_interval = DisjointInterval([
+        ContinuousInterval(0, 2, True, False),
+        ContinuousInterval(5, 8, False, True),
+        ContinuousInterval(1, 3),
+    ])
+    path = tmp_path / 'disjoint.bin'
+    disjoint_interval.save(path)
+
+    loaded = DisjointInterval.load(path, indexed=True)
+
+    assert loaded.intervals == disjoint_interval.intervals
+    assert loaded.get_interval_containing_point(Point(6)) == ContinuousInterval(5, 8, False, True)
+
+def test_load_normalizes_interval_array_files(tmp_path):
+    from src.arrays import IntervalArray
+
+    path = tmp_path / 'intervals.bin'
+    IntervalArray([4, 0, 1], [6, 2, 3]).save(path)
+
+    assert DisjointInterval.load(path).intervals == [ContinuousInterval(0, 3), ContinuousInterval(4, 6)]
+
+def test_coverage_aggregates():
+    disjoint_interval = DisjointInterval([ContinuousInterval(0, 2), ContinuousInterval(1, 3), ContinuousInterval(5, 6)])
+
+    profile, edges = disjoint_interval.coverage_profile([0, 4, 8])
+
+    assert disjoint_interval.covered_length() == 4
+    assert disjoint_interval.max_depth() == 1
+    assert DisjointInterval([]).max_depth() == 0
+    assert profile.tolist() == [0.75, 0.25]
@@ -0,0 +1,126 @@
+import random
+
+import pytest
+
+from src.intervals import ContinuousInterval, DisjointInterval
+from src.expressions import Difference, IntervalExpression, Operand, Union
+
+def random_disjoint_interval(rng, size=30):
+    intervals = []
+    for _ in range(size):
+        start = rng.randint(0, 100)
+        intervals.append(ContinuousInterval(start, start + rng.randint(1, 10), rng.random() < 0.5, rng.random() < 0.5))
+
+    return DisjointInterval(intervals)
+
+@pytest.fixture
+def operands():
+    rng = random.Random(7)
+    return [random_disjoint_interval(rng) for _ in range(4)]
+
+def test_operators_build_expressions(operands):
+    a, b, c, _ = operands
+
+    expression = a | b & ~c
+
+    assert isinstance(expression, IntervalExpression)
+    assert repr(expression) == '(#0 | (#1 & ~#2))'
+
+def contains(disjoint_interval, value):
+    return any(interval.contains_value(value) for interval in disjoint_interval.intervals)
+
+@pytest.mark.parametrize('seed', range(5))
+def test_evaluate_matches_membership(seed):
+    rng = random.Random(seed)
+    a, b, c, d = [random_disjoint_interval(rng) for _ in range(4)]
+
+    cases = [
+        (a | b & ~c, lambda x, y, z, w: x or (y and not z)),
+        ((a - b) ^ (c | d), lambda x, y, z, w: (x and not y) != (z or w)),
+        (~(a & b) - ~c, lambda x, y, z, w: not (x and y) and z),
+        (a ^ b ^ c ^ d, lambda x, y, z, w: (x + y + z + w) % 2 == 1),
+    ]
+
+    def expected_contains(expected, value):
+        return expected(*(contains(operand, value) for operand in (a, b, c, d)))
+
+    for expression, expected in cases:
+        result = expression.evaluate()
+
+        for value in [i / 2 for i in range(-2, 230)]:
+            if contains(result, value) == expected_contains(expected, value):
+                continue
+
+            # Only isolated single points may be missing from the result
+            assert expected_contains(expected, value)
+            assert not expected_contains(expected, value - 0.25)
+            assert not expected_contains(expected, value + 0.25)
+
+def test_evaluate_matches_eager_set_algebra_for_single_operations(operands):
+    a, b, _, _ = operands
+
+    assert (a | b).evaluate().intervals == a.union(b).intervals
+    assert (a & b).evaluate().intervals == a.intersection(b).intervals
+    assert (a - b).evaluate().intervals == a.difference(b).intervals
+    assert (a ^ b).evaluate().intervals == a.symmetric_difference(b).intervals
+    assert (~a).evaluate().intervals == a.complement().intervals
+
+def test_simplify(operands):
+    a, b, c, _ = operands
+    empty = DisjointInterval([])
+
+    assert repr((a | (b | c)).simplify()) == '(#0 | #1 | #2)'
+    assert repr((a - b).simplify()) == '(#0 & ~#1)'
+    assert repr((~~a).simplify()) == '#0'
+    assert repr((a | a | empty).simplify()) == '#0'
+    assert repr((a ^ b ^ a).simplify()) == '#0'
+    assert (a & b & empty).evaluate().intervals == []
+
+def test_evaluate_copies_single_operands(operands):
+    a = operands[0]
+
+    result = (a | a).evaluate()
+
+    assert result.intervals == a.intervals
+    assert result.intervals is not a.intervals
+
+def test_explain_shows_the_fused_plan(operands):
+    a, b, c, _ = operands
+
+    plan = ((a | b) - c | a).explain()
+
+    assert 'simplified: (((#0 | #1) & ~#2) | #0)' in plan
+    assert 'one fused sweep over 3 operands' in plan
+
+def test_complement_over_the_real_line():
+    a = DisjointInterval([ContinuousInterval(0, 1, False, True)])
+
+    assert (~a).evaluate().intervals == [
+        ContinuousInterval(float('-inf'), 0, True, True),
+        ContinuousInterval(1, float('inf'), False, True),
+    ]
+
+def test_unsupported_operand():
+    with pytest.raises(TypeError):
+        Operand(DisjointInterval([])) | 1
+
+    with pytest.raises(TypeError):
+        Union(Operand(DisjointInterval([]))) & [ContinuousInterval(0, 1)]
+
+def test_incomplete_nodes_fail_when_built():
+    class Incomplete(IntervalExpression):
+        def simplify(self):
+            return self
+
+    with pytest.raises(TypeError):
+        IntervalExpression()
+
+    with pytest.raises(TypeError):
+        Incomplete()
+
+def test_difference_predicate(operands):
+    a, b, _, _ = operands
+    positions = {id(a): 0, id(b): 1}
+    predicate = Difference(Operand(a), Operand(b))._predicate(positions)
+
+    assert [predicate(mask) for mask in range(4)] == [False, True, False, False]
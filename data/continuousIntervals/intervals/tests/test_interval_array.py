@@ -0,0 +1,265 @@
+from datetime import datetime, timedelta
+
+import numpy as np
+import pytest
+
+from src.intervals import ContinuousInterval, EmptySet, Point
+from src.arrays import IntervalArray
+
+@pytest.fixture
+def intervals():
+    return [
+        ContinuousInterval(0, 5),
+        ContinuousInterval(3, 8, True, True),
+        ContinuousInterval(8, 10, True, False),
+        ContinuousInterval(12, 15, False, True),
+    ]
+
+def test_round_trip(intervals):
+    array = IntervalArray.from_intervals(intervals)
+
+    assert len(array) == 4
+    assert array.to_intervals() == intervals
+    assert array[1] == intervals[1]
+    assert list(array.is_start_open) == [False, True, True, False]
+
+def test_invalid_interval_array():
+    with pytest.raises(ValueError):
+        IntervalArray([5], [1])
+
+def test_length(intervals):
+    array = IntervalArray.from_intervals(intervals)
+    assert list(array.length()) == [5, 5, 2, 3]
+
+@pytest.mark.parametrize("value, expected_result", [
+    (0, [True, False, False, False]),
+    (3, [True, False, False, False]),
+    (8, [False, False, False, False]),
+    (10, [False, False, True, False]),
+    (15, [False, False, False, False]),
+])
+def test_contains_value(intervals, value, expected_result):
+    array = IntervalArray.from_intervals(intervals)
+
+    assert list(array.contains_value(value)) == expected_result
+    assert expected_result == [interval.contains_value(value) for interval in intervals]
+
+def test_overlaps(intervals):
+    others = [
+        ContinuousInterval(5, 6),
+        ContinuousInterval(5, 8, True, False),
+        ContinuousInterval(10, 11, True, False),
+        ContinuousInterval(15, 20),
+    ]
+    array = IntervalArray.from_intervals(intervals)
+    other_array = IntervalArray.from_intervals(others)
+
+    assert list(array.overlaps(other_array)) == [True, True, False, False]
+
+def test_intersection(intervals):
+    array = IntervalArray.from_intervals(intervals)
+    result = array.intersection(ContinuousInterval(4, 9, False, True))
+
+    assert list(result.is_empty()) == [False, False, False, True]
+    assert result[:3].to_intervals() == [
+        ContinuousInterval(4, 5),
+        ContinuousInterval(4, 8, False, True),
+        ContinuousInterval(8, 9, True, True),
+    ]
+
+def test_intersection_round_trip():
+    array = IntervalArray.from_intervals([
+        ContinuousInterval(0, 1),
+        ContinuousInterval(5, 6),
+        ContinuousInterval(2, 4),
+    ])
+    result = array.intersection(ContinuousInterval(1, 3))
+
+    # Disjoint rows are empty and touching closed rows are single points
+    first, second, third = result.to_intervals()
+    assert first == Point(1)
+    assert isinstance(second, EmptySet)
+    assert third == ContinuousInterval(2, 3)
+
+    assert result[0] == Point(1)
+    assert isinstance(result[1], EmptySet)
+
+def test_union(intervals):
+    array = IntervalArray.from_intervals(intervals)
+    result = array.union(ContinuousInterval(15, 16, True, False))
+
+    assert result.to_intervals() == [
+        ContinuousInterval(0, 8, False, True),
+        ContinuousInterval(8, 10, True, False),
+        ContinuousInterval(12, 15, False, True),
+        ContinuousInterval(15, 16, True, False),
+    ]
+
+def test_union_touching_closed_boundary():
+    array = IntervalArray(np.array([0, 5]), np.array([5, 6]), [False, True], [True, False])
+    assert len(array.union()) == 2
+
+    array = IntervalArray(np.array([0, 5]), np.array([5, 6]), [False, False], [True, False])
+    assert array.union().to_intervals() == [ContinuousInterval(0, 6)]
+
+def test_save_and_load_round_trip(tmp_path):
+    array = IntervalArray([0, 2, 5], [1, 4, 9], [False, True, False], [True, False, True])
+    path = tmp_path / 'intervals.bin'
+    array.save(path)
+
+    for mmap in (True, False):
+        loaded = IntervalArray.load(path, mmap=mmap)
+        assert loaded.to_intervals() == array.to_intervals()
+
+def test_load_memory_maps_columns(tmp_path):
+    path = tmp_path / 'intervals.bin'
+    IntervalArray(np.arange(20.0), np.arange(20.0) + 1, np.arange(20) % 3 == 0).save(path)
+
+    loaded = IntervalArray.load(path)
+
+    assert isinstance(loaded.starts, np.memmap)
+    assert not loaded.starts.flags.writeable
+    assert loaded.union().to_intervals() == [ContinuousInterval(0, 20, True, False)]
+
+def test_load_rejects_unknown_files(tmp_path):
+    path = tmp_path / 'intervals.bin'
+    path.write_bytes(b'not an interval file')
+
+    with pytest.raises(ValueError):
+        IntervalArray.load(path)
+
+def test_load_rejects_other_versions(tmp_path):
+    path = tmp_path / 'intervals.bin'
+    IntervalArray.empty().save(path)
+    content = bytearray(path.read_bytes())
+    content[8] += 1
+    path.write_bytes(bytes(content))
+
+    with pytest.raises(ValueError, match='format version'):
+        IntervalArray.load(path)
+
+def random_intervals(seed, size=200):
+    rng = np.random.default_rng(seed)
+    starts = rng.integers(0, 100, size)
+    ends = starts + rng.integers(1, 15, size)
+    return [
+        ContinuousInterval(int(start), int(end), bool(start_open), bool(end_open))
+        for start, end, start_open, end_open in zip(starts, ends, rng.random(size) < 0.5, rng.random(size) < 0.5)
+    ]
+
+@pytest.mark.parametrize('seed', range(5))
+def test_covered_length_and_max_depth_match_brute_force(seed):
+    intervals = random_intervals(seed)
+    array = IntervalArray.from_intervals(intervals)
+
+    union_length = sum(array.union().length())
+    values = {value for interval in intervals for value in (interval.start, interval.end)}
+    values |= {value + 0.5 for value in values}
+    depth = max(sum(interval.contains_value(value) for interval in intervals) for value in values)
+
+    assert array.covered_length() == union_length
+    assert array.max_depth() == depth
+
+def test_max_depth_of_touching_intervals():
+    closed = IntervalArray([0, 1], [1, 2])
+    half_open = IntervalArray([0, 1], [1, 2], [False, False], [True, True])
+
+    assert closed.max_depth() == 2
+    assert half_open.max_depth() == 1
+    assert IntervalArray([1, 0], [1, 2]).max_depth() == 2
+    assert IntervalArray.empty().max_depth() == 0
+
+@pytest.mark.parametrize('seed', range(5))
+def test_coverage_profile_matches_overlap_lengths(seed):
+    intervals = random_intervals(seed)
+    edges = np.array([-10, 0, 7.5, 30, 31, 64, 100, 130])
+
+    profile, returned_edges = IntervalArray.from_intervals(intervals).coverage_profile(edges)
+
+    expected = [
+        sum(max(0, min(interval.end, hi) - max(interval.start, lo)) for interval in intervals) / (hi - lo)
+        for lo, hi in zip(edges[:-1], edges[1:])
+    ]
+    assert np.array_equal(returned_edges, edges)
+    assert np.allclose(profile, expected)
+
+def test_coverage_profile_with_bin_count():
+    profile, edges = IntervalArray([0, 0], [4, 2]).coverage_profile(2)
+
+    assert edges.tolist() == [0, 2, 4]
+    assert profile.tolist() == [2, 1]
+
+def test_coverage_profile_rejects_decreasing_edges():
+    with pytest.raises(ValueError):
+        IntervalArray([0], [1]).coverage_profile([1, 0])
+
+def test_dtype_is_inferred_from_endpoints():
+    assert IntervalArray([0, 2], [1, 4]).dtype == np.int64
+    assert IntervalArray([0, 2.5], [1, 4]).dtype == np.float64
+    assert IntervalArray.from_intervals([ContinuousInterval(0, 1.5)]).dtype == np.float64
+    assert IntervalArray.from_intervals([ContinuousInterval(datetime(2024, 1, 1), datetime(2024, 1, 2))]).dtype == 'datetime64[ns]'
+    assert IntervalArray([0, 2], [1, 4], dtype='float64').dtype == np.float64
+
+    with pytest.raises(ValueError):
+        IntervalArray([0], [1], dtype='float32')
+
+def test_int64_backend_keeps_exact_endpoints():
+    big = 2 ** 60
+    array = IntervalArray([big, big + 1], [big + 1, big + 3], [False, True], [False, False])
+
+    assert array.union().to_intervals() == [ContinuousInterval(big, big + 3)]
+    assert array.contains_value(big + 1).tolist() == [True, False]
+    assert array.covered_length() == 3
+
+def test_datetime_backend():
+    day = datetime(2024, 3, 1)
+    intervals = [
+        ContinuousInterval(day, day + timedelta(hours=2)),
+        ContinuousInterval(day + timedelta(hours=1), day + timedelta(hours=3), True, True),
+        ContinuousInterval(day + timedelta(hours=5), day + timedelta(hours=6)),
+    ]
+    array = IntervalArray.from_intervals(intervals)
+
+    assert array.starts.dtype == np.int64
+    assert array[0] == intervals[0]
+    assert array.union().to_intervals() == [
+        ContinuousInterval(day, day + timedelta(hours=3), False, True),
+        intervals[2],
+    ]
+    assert array.contains_value(day + timedelta(minutes=90)).tolist() == [True, True, False]
+    assert array.covered_length() == timedelta(hours=4)
+    assert array.length()[0] == np.timedelta64(2, 'h')
+
+    queries = [day + timedelta(hours=4), day + timedelta(minutes=30), np.datetime64('2024-03-01T05:30')]
+    assert sorted(zip(*array.containing_pairs(queries))) == [(1, 0), (2, 2)]
+
+    profile, edges = array.coverage_profile([day, day + timedelta(hours=3), day + timedelta(hours=6)])
+    assert edges[1] == np.datetime64('2024-03-01T03:00')
+    assert np.allclose(profile, [4 / 3, 1 / 3])
+
+def test_datetime_backend_rejects_numbers():
+    array = IntervalArray(np.array(['2024-01-01', '2024-01-02'], 'datetime64[ns]'), np.array(['2024-01-03', '2024-01-04'], 'datetime64[ns]'))
+
+    with pytest.raises(ValueError):
+        array.union(IntervalArray([0], [1]))
+
+def test_save_and_load_keeps_dtype(tmp_path):
+    path = tmp_path / 'intervals.bin'
+    day = datetime(2024, 3, 1)
+    array = IntervalArray.from_intervals([ContinuousInterval(day, day + timedelta(seconds=1), True, False)])
+    array.save(path)
+
+    loaded = IntervalArray.load(path)
+
+    assert loaded.dtype == 'datetime64[ns]'
+    assert loaded.to_intervals() == array.to_intervals()
+
+def test_load_reads_version_1_files(tmp_path):
+    path = tmp_path / 'intervals.bin'
+    array = IntervalArray([0.5, 2], [1, 4])
+    array.save(path)
+    content = bytearray(path.read_bytes())
+    content[8] = 1
+    path.write_bytes(bytes(content))
+
+    assert IntervalArray.load(path).to_intervals() == array.to_intervals()
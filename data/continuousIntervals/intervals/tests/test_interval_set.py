@@ -0,0 +1,71 @@
+import random
+
+import numpy as np
+
+from src.intervals import Point, ContinuousInterval, DisjointInterval, IntervalSet
+from src.arrays import IntervalArray
+
+def test_find_intervals_containing_points():
+    intervals = [
+        ContinuousInterval(0, 5),
+        ContinuousInterval(3, 8, True, True),
+        ContinuousInterval(8, 10, True, False),
+    ]
+    points = [Point(8), Point(3), Point(10), Point(-1), Point(4)]
+    interval_set = IntervalSet([], intervals, None)
+
+    point_indices, interval_indices = interval_set.find_intervals_containing_points(points)
+
+    assert sorted(zip(point_indices, interval_indices)) == [(1, 0), (2, 2), (4, 0), (4, 1)]
+
+def test_find_intervals_containing_points_matches_nested_loop():
+    rng = random.Random(3)
+    intervals = []
+    for _ in range(150):
+        start = rng.randint(0, 100)
+        intervals.append(ContinuousInterval(start, start + rng.randint(1, 20), rng.random() < 0.5, rng.random() < 0.5))
+    values = np.array([rng.randint(-5, 125) for _ in range(400)], dtype=float)
+
+    interval_set = IntervalSet([], IntervalArray.from_intervals(intervals), None)
+    pairs = set(zip(*interval_set.find_intervals_containing_points(values)))
+
+    expected_result = {
+        (i, j)
+        for i, value in enumerate(values)
+        for j, interval in enumerate(intervals)
+        if interval.contains_value(value)
+    }
+    assert pairs == expected_result
+
+def test_save_and_load_round_trip(tmp_path):
+    intervals = [ContinuousInterval(0, 5), ContinuousInterval(3, 8, True, True)]
+    disjoint_intervals = DisjointInterval(intervals)
+    interval_set = IntervalSet([Point(1), Point(7)], intervals, disjoint_intervals)
+    path = tmp_path / 'interval_set.bin'
+    interval_set.save(path)
+
+    loaded = IntervalSet.load(path)
+
+    assert loaded.points == interval_set.points
+    assert loaded.intervals.to_intervals() == intervals
+    assert loaded.disjoint_intervals.intervals == disjoint_intervals.intervals
+
+def test_save_and_load_without_disjoint_intervals(tmp_path):
+    path = tmp_path / 'interval_set.bin'
+    IntervalSet([], IntervalArray.empty(), None).save(path)
+
+    loaded = IntervalSet.load(path, mmap=False)
+
+    assert loaded.points == []
+    assert len(loaded.intervals) == 0
+    assert loaded.disjoint_intervals is None
+
+def test_coverage_aggregates():
+    intervals = [ContinuousInterval(0, 4), ContinuousInterval(2, 6), ContinuousInterval(3, 5)]
+    interval_set = IntervalSet([], intervals, None)
+
+    profile, _ = interval_set.coverage_profile([0, 3, 6])
+
+    assert interval_set.covered_length() == 6
+    assert interval_set.max_depth() == 3
+    assert np.allclose(profile, [4 / 3, 2])
@@ -0,0 +1,45 @@
+import random
+
+from src.intervals import ContinuousInterval
+from src.arrays import IntervalArray
+from src.join import overlap_join
+
+def test_overlap_join_boundaries():
+    left = [
+        ContinuousInterval(0, 5),
+        ContinuousInterval(5, 10, True, False),
+        ContinuousInterval(20, 30),
+    ]
+    right = [
+        ContinuousInterval(5, 6),
+        ContinuousInterval(10, 12, False, True),
+        ContinuousInterval(-3, 0, False, True),
+    ]
+
+    pairs = overlap_join(left, right)
+
+    assert next(pairs) == (0, 0)
+    assert sorted(pairs) == [(1, 0), (1, 1)]
+
+def test_overlap_join_matches_pairwise_overlaps():
+    rng = random.Random(11)
+
+    def random_intervals(size):
+        intervals = []
+        for _ in range(size):
+            start = rng.randint(0, 60)
+            intervals.append(ContinuousInterval(start, start + rng.randint(1, 8), rng.random() < 0.5, rng.random() < 0.5))
+        return intervals
+
+    left, right = random_intervals(120), random_intervals(90)
+    left_array = IntervalArray.from_intervals(left)
+
+    expected_result = {
+        (i, j)
+        for j, interval in enumerate(right)
+        for i in left_array.overlaps(interval).nonzero()[0].tolist()
+    }
+    pairs = list(overlap_join(left, right))
+
+    assert len(pairs) == len(expected_result)
+    assert set(pairs) == expected_result
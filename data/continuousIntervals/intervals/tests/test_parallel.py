@@ -0,0 +1,61 @@
+import numpy as np
+import pytest
+
+from src.arrays import IntervalArray, set_intersection
+from src.parallel import ParallelIntervalExecutor
+
+def random_array(rng, size):
+    starts = rng.integers(0, 500, size).astype(float)
+    ends = starts + rng.integers(1, 30, size)
+    return IntervalArray(starts, ends, rng.random(size) < 0.5, rng.random(size) < 0.5)
+
+def long_intervals(rng, size=5):
+    starts = rng.integers(0, 400, size)
+    array = IntervalArray(starts, starts + rng.integers(100, 300, size), rng.random(size) < 0.5, rng.random(size) < 0.5)
+    return array.to_intervals()
+
+def assert_same_intervals(array, other):
+    assert array.to_intervals() == other.to_intervals()
+
+@pytest.fixture(scope='module')
+def executor():
+    with ParallelIntervalExecutor(workers=2, partitions=4) as executor:
+        yield executor
+
+def test_parallel_merge(executor):
+    array = random_array(np.random.default_rng(0), 400)
+    assert_same_intervals(executor.merge(array), array.union())
+
+def test_parallel_intersection(executor):
+    rng = np.random.default_rng(1)
+    first, second = random_array(rng, 300), random_array(rng, 200)
+
+    assert_same_intervals(executor.intersection(first, second), set_intersection(first, second))
+
+@pytest.mark.parametrize('seed', range(10))
+def test_parallel_stitching_across_partitions(executor, seed):
+    # Integer endpoints touch at the cuts, and long intervals span several partitions
+    rng = np.random.default_rng(seed)
+    first = IntervalArray.from_intervals(random_array(rng, 150).to_intervals() + long_intervals(rng), 'int64')
+    second = IntervalArray.from_intervals(random_array(rng, 150).to_intervals() + long_intervals(rng), 'int64')
+
+    assert_same_intervals(executor.merge(first), first.union())
+    assert_same_intervals(executor.intersection(first, second), set_intersection(first, second))
+
+def test_parallel_point_join(executor):
+    rng = np.random.default_rng(2)
+    array = random_array(rng, 300)
+    values = rng.integers(-10, 540, 1000).astype(float)
+
+    pairs = set(zip(*executor.point_join(array, values)))
+
+    assert pairs == set(zip(*array.containing_pairs(values)))
+
+def test_parallel_merge_keeps_datetimes(executor):
+    array = random_array(np.random.default_rng(3), 200)
+    array = IntervalArray(array.starts.astype('datetime64[s]'), array.ends.astype('datetime64[s]'), array.is_start_open, array.is_end_open)
+
+    merged = executor.merge(array)
+
+    assert merged.dtype == 'datetime64[ns]'
+    assert_same_intervals(merged, array.union())
@@ -1,6 +1,8 @@
+import pickle
+
 import pytest
 
-from src.intervals import Point, ContinuousInterval
+from src.intervals import Point, ContinuousInterval, interned_interval
 from src.utils import PointError
 
 @pytest.mark.parametrize(
@@ -105,4 +107,42 @@ def test_point_invalid_operations(point, invalid_operation):
         point + invalid_operation
 
     with pytest.raises(TypeError):
-        point - invalid_operation
\ No newline at end of file
+        point - invalid_operation
+
+def test_point_is_immutable_and_hashable(point):
+    with pytest.raises(AttributeError):
+        point.value = 10
+
+    assert not hasattr(point, '__dict__')
+    assert {point: 'five'}[Point(5)] == 'five'
+
+    # Mixed with bare values in hash tables
+    assert len({Point(5), 5}) == 2
+    assert {5: 'five'}.get(Point(5)) is None
+
+def test_continuous_interval_is_immutable_and_hashable():
+    interval = ContinuousInterval(1, 5, True, False)
+
+    with pytest.raises(AttributeError):
+        interval.end = 10
+
+    with pytest.raises(AttributeError):
+        del interval.start
+
+    assert not hasattr(interval, '__dict__')
+    assert hash(interval) == hash(ContinuousInterval(1, 5, True, False))
+    assert len({interval, ContinuousInterval(1, 5, True, False), ContinuousInterval(1, 5)}) == 2
+    assert {(1, 5, True, False): 'values'}.get(interval) is None
+
+def test_continuous_interval_pickle():
+    interval = ContinuousInterval(1, 5, True, False)
+    assert pickle.loads(pickle.dumps(interval)) == interval
+    assert pickle.loads(pickle.dumps(Point(3))) == Point(3)
+
+def test_interned_interval():
+    interned_interval.cache_clear()
+
+    interval = interned_interval(1, 5, True)
+    assert interned_interval(1, 5, True) is interval
+    assert interned_interval(1, 5) is not interval
+    assert interned_interval.cache_info().hits == 1
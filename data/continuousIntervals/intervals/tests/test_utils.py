@@ -0,0 +1,17 @@
+from src.intervals import ContinuousInterval
+from src.utils import sort_intervals
+
+def test_sort_intervals():
+    intervals = [
+        ContinuousInterval(3, 4),
+        ContinuousInterval(1, 5, True, False),
+        ContinuousInterval(1, 2),
+        ContinuousInterval(1, 2, False, True),
+    ]
+
+    assert sort_intervals(intervals) == [
+        ContinuousInterval(1, 5, True, False),
+        ContinuousInterval(1, 2),
+        ContinuousInterval(1, 2, False, True),
+        ContinuousInterval(3, 4),
+    ]
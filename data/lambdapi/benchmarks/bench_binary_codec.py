@@ -0,0 +1,50 @@
+"""
+Benchmark of JSON and binary payloads through the prediction handler.
+
+Compares the body size and the handler time of a JSON payload with JSON
+predictions against a base64 little-endian float64 payload with binary predictions,
+for full precision random floats.
+
+Run from the project root:
+
+    python -m benchmarks.bench_binary_codec
+"""
+
+import timeit
+
+import numpy as np
+
+from lambda_api import json_codec
+from lambda_api.binary_codec import encode_array
+from lambda_api.default_values import BINARY_CONTENT_TYPE
+from lambda_api.predict_service import predict
+
+SIZES = (1_000, 100_000, 1_000_000)
+
+
+def best_time(event: dict, number: int) -> float:
+    return min(timeit.repeat(lambda: predict(event, {}), number=number, repeat=5)) / number
+
+
+def main():
+    print(f"codec: {json_codec.codec.name}")
+    print(f"{'size':>10}{'json (KB)':>11}{'binary (KB)':>13}{'json (ms)':>11}{'binary (ms)':>13}{'speedup':>9}")
+    for size in SIZES:
+        values = np.random.default_rng(0).uniform(-100, 100, size)
+        json_event = {"body": json_codec.dumps(values)}
+        binary_event = {
+            "headers": {"Content-Type": BINARY_CONTENT_TYPE},
+            "body": encode_array(values),
+            "isBase64Encoded": True,
+        }
+        number = max(1, 10_000 // size)
+
+        json_time = best_time(json_event, number)
+        binary_time = best_time(binary_event, number)
+
+        print(f"{size:>10,}{len(json_event['body']) / 1024:>11.0f}{len(binary_event['body']) / 1024:>13.0f}"
+              f"{json_time * 1e3:>11.2f}{binary_time * 1e3:>13.2f}{json_time / binary_time:>8.1f}x")
+
+
+if __name__ == "__main__":
+    main()
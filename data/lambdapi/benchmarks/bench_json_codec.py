@@ -0,0 +1,48 @@
+"""
+Benchmark of the JSON backends.
+
+Times decoding a request body of floats, and encoding an array of predictions,
+for every installed backend. The standard library encodes the array through
+`.tolist()`, while orjson serializes it natively.
+
+Run from the project root:
+
+    python -m benchmarks.bench_json_codec
+"""
+
+import timeit
+
+import numpy as np
+
+from lambda_api.json_codec import BACKENDS, load_codec
+
+SIZES = (1_000, 100_000, 1_000_000)
+
+
+def best_time(function, value, number: int) -> float:
+    return min(timeit.repeat(lambda: function(value), number=number, repeat=5)) / number
+
+
+def main():
+    codecs = []
+    for backend in BACKENDS:
+        try:
+            codecs.append(load_codec(backend))
+        except ImportError:
+            print(f"{backend} is not installed")
+
+    print(f"{'backend':>10}{'size':>12}{'loads (ms)':>14}{'dumps (ms)':>14}")
+    for size in SIZES:
+        predictions = np.random.default_rng(0).uniform(-100, 100, size)
+        body = load_codec("json").dumps({"data": predictions})
+        number = max(1, 10_000 // size)
+
+        for codec in codecs:
+            loads_time = best_time(codec.loads, body, number)
+            dumps_time = best_time(codec.dumps, predictions, number)
+
+            print(f"{codec.name:>10}{size:>12,}{loads_time * 1e3:>14.2f}{dumps_time * 1e3:>14.2f}")
+
+
+if __name__ == "__main__":
+    main()
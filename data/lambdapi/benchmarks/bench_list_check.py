@@ -0,0 +1,50 @@
+"""
+Benchmark of the validation of numeric payload lists.
+
+Compares the former `functools.reduce` type check, after which the model adapter
+still had to convert the list, with `list_check`, which types numeric lists into
+a NumPy array in a single pass.
+
+Run from the project root:
+
+    python -m benchmarks.bench_list_check
+"""
+
+import random
+import timeit
+from functools import reduce
+
+import numpy as np
+
+from lambda_api.model_resolver import ALLOWED_TYPES
+from lambda_api.predict_service import list_check
+
+SIZES = (1_000, 100_000, 1_000_000)
+
+
+def reduce_check(candidate: list) -> np.ndarray:
+    def is_types_map(is_types_acc, x):
+        return is_types_acc and isinstance(x, ALLOWED_TYPES)
+
+    if reduce(is_types_map, candidate):
+        return np.ascontiguousarray(candidate)
+
+
+def best_time(function, payload: list, number: int) -> float:
+    return min(timeit.repeat(lambda: function(payload), number=number, repeat=5)) / number
+
+
+def main():
+    print(f"{'size':>10}{'reduce (ms)':>14}{'list_check (ms)':>18}{'speedup':>10}")
+    for size in SIZES:
+        payload = [random.uniform(-100, 100) for _ in range(size)]
+        number = max(1, 100_000 // size)
+
+        reduce_time = best_time(reduce_check, payload, number)
+        check_time = best_time(list_check, payload, number)
+
+        print(f"{size:>10,}{reduce_time * 1e3:>14.2f}{check_time * 1e3:>18.2f}{reduce_time / check_time:>9.1f}x")
+
+
+if __name__ == "__main__":
+    main()
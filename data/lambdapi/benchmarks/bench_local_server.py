@@ -0,0 +1,102 @@
+"""
+Load test of the local HTTP server.
+
+Starts the server in a child process, then sends small prediction requests over
+concurrent keep-alive connections, with and without pipelining, and reports the
+throughput. Client and server share the machine, so the results are a lower bound
+of the server throughput.
+
+Run from the project root:
+
+    python -m benchmarks.bench_local_server
+"""
+
+import asyncio
+import multiprocessing
+import socket
+import time
+
+from lambda_api.local_server import serve
+
+HOST = "127.0.0.1"
+CONNECTIONS = 64
+REQUESTS_PER_CONNECTION = 400
+PIPELINE_DEPTHS = (1, 16)
+WORKERS = (0, 4)
+
+BODY = b'{"data": [1, 2, 3, 4, 5, 6, 7, 8]}'
+REQUEST = (
+    b"POST /predict HTTP/1.1\r\nHost: localhost\r\nContent-Type: application/json\r\n"
+    b"Content-Length: " + str(len(BODY)).encode() + b"\r\n\r\n" + BODY
+)
+
+
+def free_port() -> int:
+    with socket.socket() as sock:
+        sock.bind((HOST, 0))
+        return sock.getsockname()[1]
+
+
+async def wait_for_server(port: int):
+    for _ in range(100):
+        try:
+            _, writer = await asyncio.open_connection(HOST, port)
+            writer.close()
+            return
+        except OSError:
+            await asyncio.sleep(0.05)
+
+    raise RuntimeError("The server did not start.")
+
+
+async def response_size(port: int) -> int:
+    reader, writer = await asyncio.open_connection(HOST, port)
+    writer.write(REQUEST)
+    head = await reader.readuntil(b"\r\n\r\n")
+    writer.close()
+
+    content_length = int(head.split(b"Content-Length: ")[1].split(b"\r\n")[0])
+    return len(head) + content_length
+
+
+async def client(port: int, depth: int, size: int):
+    reader, writer = await asyncio.open_connection(HOST, port)
+
+    for _ in range(REQUESTS_PER_CONNECTION // depth):
+        writer.write(REQUEST * depth)
+        await reader.readexactly(size * depth)
+
+    writer.close()
+
+
+async def load(port: int, depth: int) -> float:
+    await wait_for_server(port)
+    size = await response_size(port)
+
+    started = time.perf_counter()
+    await asyncio.gather(*(client(port, depth, size) for _ in range(CONNECTIONS)))
+    elapsed = time.perf_counter() - started
+
+    return CONNECTIONS * (REQUESTS_PER_CONNECTION // depth) * depth / elapsed
+
+
+def main():
+    print(f"{CONNECTIONS} keep-alive connections, {REQUESTS_PER_CONNECTION} requests each")
+    print(f"{'workers':>8}{'pipeline':>10}{'requests/s':>12}")
+    for workers in WORKERS:
+        port = free_port()
+        server = multiprocessing.Process(target=serve, args=(HOST, port), kwargs={"workers": workers},
+                                         daemon=True)
+        server.start()
+
+        try:
+            for depth in PIPELINE_DEPTHS:
+                throughput = asyncio.run(load(port, depth))
+                print(f"{workers:>8}{depth:>10}{throughput:>12,.0f}")
+        finally:
+            server.terminate()
+            server.join()
+
+
+if __name__ == "__main__":
+    main()
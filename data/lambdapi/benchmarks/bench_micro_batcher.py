@@ -0,0 +1,81 @@
+"""
+Benchmark of micro-batching under concurrent load.
+
+Concurrent client threads send small requests to `predict_service.predict`,
+either scored one by one or coalesced by a MicroBatcher. The model has a
+fixed cost per call, such as the input checks of a scikit-learn estimator,
+which batching pays once per batch instead of once per request.
+
+Run from the project root:
+
+    python -m benchmarks.bench_micro_batcher
+"""
+
+import threading
+import time
+
+import numpy as np
+
+from lambda_api.default_values import DEFAULT_MODEL_NAME
+from lambda_api.micro_batcher import MicroBatcher
+from lambda_api.model_resolver import model_registry
+from lambda_api.predict_service import make_prediction, predict
+
+CLIENTS = 128
+REQUESTS_PER_CLIENT = 50
+ENTRIES_PER_REQUEST = 8
+CALL_OVERHEADS = (0, 50e-6, 200e-6)
+
+
+class OverheadModel:
+    def __init__(self, overhead: float):
+        self.overhead = overhead
+
+    def predict(self, inputs: np.ndarray) -> np.ndarray:
+        # Busy wait, holding the interpreter like Python-level input checks
+        deadline = time.perf_counter() + self.overhead
+        while time.perf_counter() < deadline:
+            pass
+
+        return np.square(inputs)
+
+
+def run_clients(batcher) -> tuple:
+    event = {"body": str({"data": list(range(ENTRIES_PER_REQUEST))}).replace("'", '"')}
+    latencies = []
+
+    def client():
+        for _ in range(REQUESTS_PER_CLIENT):
+            started = time.perf_counter()
+            predict(event, {}, batcher)
+            latencies.append(time.perf_counter() - started)
+
+    threads = [threading.Thread(target=client) for _ in range(CLIENTS)]
+
+    started = time.perf_counter()
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+    elapsed = time.perf_counter() - started
+
+    return len(latencies) / elapsed, np.percentile(latencies, 50), np.percentile(latencies, 99)
+
+
+def main():
+    print(f"{CLIENTS} clients, {REQUESTS_PER_CLIENT} requests each of {ENTRIES_PER_REQUEST} entries")
+    print(f"{'overhead (us)':>14}{'mode':>10}{'requests/s':>12}{'p50 (ms)':>10}{'p99 (ms)':>10}{'batches':>9}")
+    for overhead in CALL_OVERHEADS:
+        model_registry.register(DEFAULT_MODEL_NAME, lambda: OverheadModel(overhead))
+
+        throughput, p50, p99 = run_clients(None)
+        print(f"{overhead * 1e6:>14.0f}{'single':>10}{throughput:>12,.0f}{p50 * 1e3:>10.2f}{p99 * 1e3:>10.2f}{'':>9}")
+
+        with MicroBatcher(make_prediction) as batcher:
+            throughput, p50, p99 = run_clients(batcher)
+
+        print(f"{overhead * 1e6:>14.0f}{'batched':>10}{throughput:>12,.0f}{p50 * 1e3:>10.2f}{p99 * 1e3:>10.2f}{batcher.batches:>9}")
+
+
+if __name__ == "__main__":
+    main()
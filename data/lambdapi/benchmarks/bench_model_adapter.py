@@ -0,0 +1,47 @@
+"""
+Benchmark of element-wise and vectorized model calls.
+
+Compares the former `map`-based scoring of the payload with the ModelAdapter
+batch path, both returning a list ready for JSON serialization.
+
+Run from the project root:
+
+    python -m benchmarks.bench_model_adapter
+"""
+
+import random
+import timeit
+
+from lambda_api.model_adapter import ModelAdapter
+from lambda_api.model_resolver import SquareModel
+
+SIZES = (1, 1_000, 1_000_000)
+
+
+def map_prediction(payload_list: list) -> list:
+    def square_lambda(x):
+        return x ** 2
+
+    return list(map(square_lambda, payload_list))
+
+
+def best_time(function, payload, number: int) -> float:
+    return min(timeit.repeat(lambda: function(payload), number=number, repeat=5)) / number
+
+
+def main():
+    adapter = ModelAdapter(SquareModel())
+
+    print(f"{'size':>10}{'map (ms)':>14}{'adapter (ms)':>14}{'speedup':>10}")
+    for size in SIZES:
+        payload = [random.uniform(-100, 100) for _ in range(size)]
+        number = max(1, 100_000 // size)
+
+        map_time = best_time(map_prediction, payload, number)
+        adapter_time = best_time(adapter.predict_list, payload, number)
+
+        print(f"{size:>10,}{map_time * 1e3:>14.4f}{adapter_time * 1e3:>14.4f}{map_time / adapter_time:>9.1f}x")
+
+
+if __name__ == "__main__":
+    main()
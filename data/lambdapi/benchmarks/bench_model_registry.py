@@ -0,0 +1,52 @@
+"""
+Benchmark of cold and warm model loads.
+
+Pickles a model holding a large coefficient array, then compares unpickling it
+on every request with the registry, which only unpickles on the first request
+of an execution instance.
+
+Run from the project root:
+
+    python -m benchmarks.bench_model_registry
+"""
+
+import os
+import tempfile
+import timeit
+
+import cloudpickle
+import numpy as np
+
+from lambda_api.model_registry import ModelRegistry, pickle_loader
+
+SIZES_MB = (1, 64, 256)
+
+
+class LinearModel:
+    def __init__(self, coefficients: np.ndarray):
+        self.coefficients = coefficients
+
+    def predict(self, inputs: np.ndarray) -> np.ndarray:
+        return inputs * self.coefficients[0]
+
+
+def main():
+    print(f"{'model (MB)':>10}{'cold (ms)':>14}{'warm (us)':>14}")
+    with tempfile.TemporaryDirectory() as directory:
+        for size in SIZES_MB:
+            path = os.path.join(directory, f"model_{size}.pickle")
+            with open(path, "wb") as file:
+                cloudpickle.dump(LinearModel(np.ones(size * 2 ** 17)), file)
+
+            registry = ModelRegistry()
+            registry.register_pickle("linear", path)
+            registry.get("linear")
+
+            cold_time = min(timeit.repeat(pickle_loader(path), number=1, repeat=5))
+            warm_time = min(timeit.repeat(lambda: registry.get("linear"), number=10_000, repeat=5)) / 10_000
+
+            print(f"{size:>10}{cold_time * 1e3:>14.2f}{warm_time * 1e6:>14.2f}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,73 @@
+"""
+Benchmark of the prediction cache.
+
+Scores payloads with a small dense model, whose cost grows with the number of
+entries, without cache, on repeated payloads, and with per-entry memoization
+on payloads sharing 90% of their entries with earlier ones.
+
+Run from the project root:
+
+    python -m benchmarks.bench_prediction_cache
+"""
+
+import timeit
+
+import numpy as np
+
+from lambda_api.model_adapter import ModelAdapter
+from lambda_api.prediction_cache import PredictionCache
+
+SIZES = (100, 10_000, 100_000)
+HIDDEN_UNITS = 256
+
+
+class DenseModel:
+    def __init__(self):
+        rng = np.random.default_rng(0)
+        self.weights = rng.normal(size=HIDDEN_UNITS)
+        self.output = rng.normal(size=HIDDEN_UNITS)
+
+    def predict(self, inputs: np.ndarray) -> np.ndarray:
+        return np.tanh(np.outer(inputs, self.weights)) @ self.output
+
+
+def best_time(function, number: int) -> float:
+    return min(timeit.repeat(function, number=number, repeat=5)) / number
+
+
+def main():
+    adapter = ModelAdapter(DenseModel())
+    rng = np.random.default_rng(1)
+
+    print(f"{'size':>10}{'no cache (ms)':>15}{'repeated (ms)':>15}{'no memo, 90% (ms)':>19}{'memo, 90% (ms)':>16}")
+    for size in SIZES:
+        payload = rng.integers(0, 1_000_000, size)
+        number = max(1, 10_000 // size)
+
+        cache = PredictionCache()
+        cache.predict(payload, adapter.predict, "v1")
+
+        no_cache_time = best_time(lambda: adapter.predict(payload), number)
+        hit_time = best_time(lambda: cache.predict(payload, adapter.predict, "v1"), number)
+
+        # Payloads replacing 10% of the entries of the first one
+        def overlapping_payloads():
+            while True:
+                overlapping = payload.copy()
+                indices = rng.choice(size, size // 10, replace=False)
+                overlapping[indices] = rng.integers(1_000_000, 2_000_000, size // 10)
+                yield overlapping
+
+        memo = PredictionCache(per_element=True)
+        memo.predict(payload, adapter.predict, "v1")
+        partial = overlapping_payloads()
+
+        miss_time = best_time(lambda: cache.predict(next(partial), adapter.predict, "v1"), number)
+        memo_time = best_time(lambda: memo.predict(next(partial), adapter.predict, "v1"), number)
+
+        print(f"{size:>10,}{no_cache_time * 1e3:>15.3f}{hit_time * 1e3:>15.3f}"
+              f"{miss_time * 1e3:>19.3f}{memo_time * 1e3:>16.3f}")
+
+
+if __name__ == "__main__":
+    main()
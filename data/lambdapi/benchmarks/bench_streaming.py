@@ -0,0 +1,53 @@
+"""
+Benchmark of the peak memory of whole and streamed predictions.
+
+Measures with tracemalloc the memory allocated on top of the request body by
+`predict`, which builds the whole response body, and by `predict_stream`, whose
+body is consumed piece by piece as a server would send it.
+
+Run from the project root:
+
+    python -m benchmarks.bench_streaming
+"""
+
+import time
+import tracemalloc
+
+import numpy as np
+
+from lambda_api.json_codec import dumps
+from lambda_api.predict_service import predict, predict_stream
+
+SIZES = (100_000, 1_000_000, 4_000_000)
+
+
+def measure(handler, event: dict) -> tuple:
+    tracemalloc.start()
+    started = time.perf_counter()
+
+    response = handler(event, {})
+    body = response["body"]
+    if not isinstance(body, str):
+        size = sum(len(piece) for piece in body)
+    else:
+        size = len(body)
+
+    elapsed = time.perf_counter() - started
+    _, peak = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+
+    return peak, elapsed, size
+
+
+def main():
+    print(f"{'size':>10}{'mode':>8}{'peak (MB)':>11}{'time (ms)':>11}{'body (MB)':>11}")
+    for size in SIZES:
+        event = {"body": dumps({"data": np.random.default_rng(0).uniform(-100, 100, size)})}
+
+        for mode, handler in (("whole", predict), ("stream", predict_stream)):
+            peak, elapsed, body_size = measure(handler, event)
+            print(f"{size:>10,}{mode:>8}{peak / 2 ** 20:>11.1f}{elapsed * 1e3:>11.0f}{body_size / 2 ** 20:>11.1f}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,47 @@
+"""
+Benchmark of the request pipeline with and without the JSON round-trip.
+
+The former `predict` serialized the validated payload into a response body with
+`validate_event`, then parsed it back before predicting. The current `predict`
+keeps the typed payload from `validate_payload` and serializes only the response.
+
+Run from the project root:
+
+    python -m benchmarks.bench_validation
+"""
+
+import json
+import random
+import timeit
+
+from lambda_api.predict_service import api_return, make_prediction, predict, validate_event
+
+SIZES = (1_000, 100_000, 1_000_000)
+
+
+def round_trip_predict(event: dict, context: dict) -> dict:
+    payload = validate_event(event, context)
+    payload_list = json.loads(payload["body"])
+
+    return api_return(make_prediction(payload_list), payload["statusCode"])
+
+
+def best_time(function, event: dict, number: int) -> float:
+    return min(timeit.repeat(lambda: function(event, {}), number=number, repeat=5)) / number
+
+
+def main():
+    print(f"{'size':>10}{'round-trip (ms)':>18}{'single-pass (ms)':>18}{'saved (ms)':>12}")
+    for size in SIZES:
+        event = {"body": json.dumps({"data": [random.uniform(-100, 100) for _ in range(size)]})}
+        number = max(1, 10_000 // size)
+
+        round_trip_time = best_time(round_trip_predict, event, number)
+        single_pass_time = best_time(predict, event, number)
+
+        print(f"{size:>10,}{round_trip_time * 1e3:>18.2f}{single_pass_time * 1e3:>18.2f}"
+              f"{(round_trip_time - single_pass_time) * 1e3:>12.2f}")
+
+
+if __name__ == "__main__":
+    main()
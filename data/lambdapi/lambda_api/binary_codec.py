@@ -0,0 +1,85 @@
+"""
+Module: binary_codec
+
+This module encodes numeric payloads and predictions as raw binary arrays.
+
+Instead of JSON numbers, entries are sent as the bytes of a little-endian float64
+array, base64-encoded by API Gateway as for any binary media type. Such bodies are
+about three times smaller than their JSON encoding for full precision floats, and
+are decoded without parsing a single number, the array being a view of the decoded
+bytes. The binary encoding is negotiated with the `application/octet-stream`
+Content-Type of the request and Accept header of the response.
+
+Functions:
+    is_binary_content_type(content_type: str) -> bool: Check whether a media type is binary.
+    decode_array(body: Union[str, bytes], is_base64_encoded: bool) -> np.ndarray:
+        Decode a binary body into an array of entries.
+    encode_array(array) -> str: Encode an array as a base64 binary body.
+"""
+
+import base64
+import binascii
+from typing import Union
+
+import numpy as np
+
+from .default_values import BINARY_CONTENT_TYPE
+
+# Little-endian float64, the layout of binary bodies whatever the host byte order
+BINARY_DTYPE = np.dtype("<f8")
+
+
+def is_binary_content_type(content_type: str) -> bool:
+    """
+    Check whether a Content-Type header value is the binary media type.
+
+    Args:
+        content_type (str): The header value, possibly with parameters.
+
+    Returns:
+        bool: True if the media type is the binary one, otherwise False.
+    """
+    return (content_type or "").split(";")[0].strip().lower() == BINARY_CONTENT_TYPE
+
+
+def decode_array(body: Union[str, bytes], is_base64_encoded: bool) -> np.ndarray:
+    """
+    Decode a binary body into a read-only array of entries, without copying its bytes.
+
+    Args:
+        body (Union[str, bytes]): The request body.
+        is_base64_encoded (bool): Whether the body is base64-encoded, as set by API Gateway.
+
+    Returns:
+        np.ndarray: The one-dimensional float64 array of entries.
+
+    Raises:
+        ValueError: If the body is not valid base64 or its size is not a whole number of entries.
+    """
+    if is_base64_encoded:
+        try:
+            body = base64.b64decode(body, validate=True)
+        except binascii.Error as e:
+            raise ValueError(f"Invalid base64 body: {e}") from e
+    elif isinstance(body, str):
+        body = body.encode("latin-1")
+
+    if len(body) % BINARY_DTYPE.itemsize:
+        raise ValueError(f"Binary body size is not a multiple of {BINARY_DTYPE.itemsize} bytes.")
+
+    return np.frombuffer(body, dtype=BINARY_DTYPE)
+
+
+def encode_array(array) -> str:
+    """
+    Encode an array as the base64 text of its little-endian float64 bytes.
+
+    Args:
+        array: Array or list of numbers, flattened in row-major order.
+
+    Returns:
+        str: The base64-encoded body.
+    """
+    array = np.ascontiguousarray(array, dtype=BINARY_DTYPE)
+
+    return base64.b64encode(array).decode("ascii")
@@ -10,3 +10,57 @@ CLIENT_ERROR_STATUS_CODE = 400
 
 # Default server error status code
 SERVER_ERROR_STATUS_CODE = 500
+
+# Default largest number of entries scored by a single model call
+DEFAULT_MAX_BATCH_SIZE = 65536
+
+# Default version of a registered model
+DEFAULT_MODEL_VERSION = "latest"
+
+# Default name of the model scored by the prediction service
+DEFAULT_MODEL_NAME = "default"
+
+# Default memory budget of the loaded models, in bytes
+DEFAULT_MODEL_MEMORY_BUDGET = 512 * 1024 * 1024
+
+# Default error message pointing to the first entry of invalid type
+DEFAULT_INVALID_ENTRY_MESSAGE = "Invalid entry at index {index}."
+
+# Default number of entries after which a micro-batch is dispatched
+DEFAULT_MICRO_BATCH_SIZE = 4096
+
+# Default longest wait of a micro-batch for more requests, in seconds
+DEFAULT_MICRO_BATCH_WAIT = 0.002
+
+# Default address of the local HTTP server
+DEFAULT_SERVER_HOST = "127.0.0.1"
+
+# Default port of the local HTTP server
+DEFAULT_SERVER_PORT = 8080
+
+# Default number of unanswered pipelined requests after which a connection stops reading
+DEFAULT_SERVER_MAX_PIPELINE = 128
+
+# Default largest size of a request header, in bytes
+DEFAULT_SERVER_MAX_HEADER_SIZE = 65536
+
+# Default number of payloads kept by the prediction cache
+DEFAULT_CACHE_MAX_ENTRIES = 1024
+
+# Default number of entries kept by the per-entry memo of the prediction cache
+DEFAULT_CACHE_MAX_ELEMENTS = 1_000_000
+
+# Default lifetime of cached predictions, in seconds
+DEFAULT_CACHE_TTL = 300.0
+
+# Default content type of responses
+JSON_CONTENT_TYPE = "application/json"
+
+# Content type of streamed responses with one JSON value per line
+NDJSON_CONTENT_TYPE = "application/x-ndjson"
+
+# Default number of entries converted, scored and encoded at once by streamed predictions
+DEFAULT_STREAM_CHUNK_SIZE = 65536
+
+# Content type of payloads and predictions sent as little-endian float64 arrays
+BINARY_CONTENT_TYPE = "application/octet-stream"
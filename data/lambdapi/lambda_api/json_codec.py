@@ -0,0 +1,194 @@
+"""
+Module: json_codec
+
+This module provides the JSON encoder and decoder of the prediction service.
+
+The backend is chosen at import: the one named by the JSON_BACKEND environment
+variable, otherwise the first importable one among orjson, ujson and the standard
+library json module. orjson serializes NumPy arrays natively, so predictions are
+encoded without a `.tolist()` conversion; the other backends convert them through
+`json_default`.
+
+Classes:
+    JsonCodec: JSON encoder and decoder pair of a backend.
+
+Functions:
+    json_default(value) -> Union[list, int, float, str]: Convert a value unknown to a JSON encoder.
+    load_codec(name: str = None) -> JsonCodec: Create the codec of a backend.
+    set_codec(name: str = None) -> JsonCodec: Select the codec used by `loads` and `dumps`.
+    item_separator() -> str: Separator of array items written by the selected codec.
+    loads(text: Union[str, bytes]): Decode a JSON document.
+    dumps(value) -> str: Encode a value as a JSON document.
+"""
+
+import json
+import os
+from typing import Callable, Union
+
+import numpy as np
+
+# Backends in order of preference for auto-detection
+BACKENDS = ("orjson", "ujson", "json")
+
+
+def json_default(value) -> Union[list, int, float, str]:
+    """
+    Convert a value unknown to a JSON encoder, e.g. a NumPy array of predictions.
+
+    Args:
+        value: The value to convert.
+
+    Returns:
+        Union[list, int, float, str]: The entries of NumPy arrays, the Python number of NumPy
+            scalars, or the string form of other values.
+    """
+    if isinstance(value, np.ndarray):
+        return value.tolist()
+
+    if isinstance(value, np.generic):
+        return value.item()
+
+    return str(value)
+
+
+class JsonCodec:
+    """
+    JSON encoder and decoder pair of a backend.
+
+    Decoding errors of every backend are instances of ValueError.
+
+    Args:
+        name (str): The backend name.
+        loads (Callable): Function decoding a JSON document.
+        dumps (Callable): Function encoding a value as a JSON string.
+        separator (str): Separator of array items written by `dumps`.
+    """
+
+    def __init__(self, name: str, loads: Callable, dumps: Callable, separator: str = ", "):
+        self.name = name
+        self.loads = loads
+        self.dumps = dumps
+        self.separator = separator
+
+    def __repr__(self) -> str:
+        return f"JsonCodec({self.name!r})"
+
+
+def _json_codec() -> JsonCodec:
+    def dumps(value) -> str:
+        return json.dumps(value, default=json_default)
+
+    return JsonCodec("json", json.loads, dumps)
+
+
+def _orjson_codec() -> JsonCodec:
+    import orjson
+
+    def dumps(value) -> str:
+        try:
+            return orjson.dumps(value, default=json_default, option=orjson.OPT_SERIALIZE_NUMPY).decode()
+        except orjson.JSONEncodeError:
+            # orjson rejects integers beyond 64 bits, which the standard library encodes exactly
+            return json.dumps(value, default=json_default)
+
+    return JsonCodec("orjson", orjson.loads, dumps, ",")
+
+
+def _ujson_codec() -> JsonCodec:
+    import ujson
+
+    def dumps(value) -> str:
+        return ujson.dumps(value, default=json_default, escape_forward_slashes=False)
+
+    return JsonCodec("ujson", ujson.loads, dumps, ",")
+
+
+_CODEC_FACTORIES = {
+    "orjson": _orjson_codec,
+    "ujson": _ujson_codec,
+    "json": _json_codec,
+}
+
+
+def load_codec(name: str = None) -> JsonCodec:
+    """
+    Create the codec of a backend.
+
+    Args:
+        name (str): The backend name, one of BACKENDS. By default, the first importable one.
+
+    Returns:
+        JsonCodec: The codec.
+
+    Raises:
+        ValueError: If the backend is unknown.
+        ImportError: If the named backend is not installed.
+    """
+    if name is not None:
+        if name not in _CODEC_FACTORIES:
+            raise ValueError(f"Unknown JSON backend: {name}. Expected one of {BACKENDS}.")
+
+        return _CODEC_FACTORIES[name]()
+
+    for backend in BACKENDS[:-1]:
+        try:
+            return _CODEC_FACTORIES[backend]()
+        except ImportError:
+            continue
+
+    return _json_codec()
+
+
+def set_codec(name: str = None) -> JsonCodec:
+    """
+    Select the codec used by `loads` and `dumps`.
+
+    Args:
+        name (str): The backend name, one of BACKENDS. By default, the first importable one.
+
+    Returns:
+        JsonCodec: The selected codec.
+    """
+    global codec
+    codec = load_codec(name)
+
+    return codec
+
+
+def item_separator() -> str:
+    """
+    Separator of array items written by the selected codec, e.g. to join encoded chunks.
+
+    Returns:
+        str: ", " for the standard library json module, "," for the compact backends.
+    """
+    return codec.separator
+
+
+def loads(text: Union[str, bytes]):
+    """
+    Decode a JSON document with the selected codec.
+
+    Args:
+        text (Union[str, bytes]): The JSON document.
+
+    Returns:
+        The decoded value.
+    """
+    return codec.loads(text)
+
+
+def dumps(value) -> str:
+    """
+    Encode a value as a JSON document with the selected codec.
+
+    Args:
+        value: The value to encode, possibly holding NumPy arrays.
+
+    Returns:
+        str: The JSON document.
+    """
+    return codec.dumps(value)
+
+
+codec = load_codec(os.environ.get("JSON_BACKEND"))
@@ -0,0 +1,495 @@
+"""
+Module: local_server
+
+This module serves the Lambda handler over HTTP/1.1 without AWS, for on-premises
+deployments and offline load tests.
+
+Each HTTP request is adapted into an API Gateway proxy event, passed to the handler,
+and its response dictionary is written back as an HTTP response. Connections are kept
+alive and pipelined requests are answered in order. The handler runs inline on the
+event loop by default, which is the fastest option for short handlers; with `workers`,
+it runs in a thread pool, which lets a MicroBatcher coalesce the model calls of
+concurrent requests with --batch.
+Several server processes can share the port to use every core. Handlers returning
+a generator body, such as `predict_stream` with --stream, are sent with chunked
+transfer encoding, one piece at a time as the connection drains; with `workers`, the
+pieces are produced in the thread pool as well.
+
+Run from the project root:
+
+    python -m lambda_api.local_server --port 8080 --processes 4
+    python -m lambda_api.local_server --port 8080 --workers 32 --batch
+
+Classes:
+    HttpProtocol: asyncio protocol adapting HTTP/1.1 requests to Lambda events.
+
+Functions:
+    make_event(method: str, target: str, headers: dict, body: bytes) -> dict: Create the event of a request.
+    is_streamed(response: dict) -> bool: Check whether a handler result has a streamed body.
+    make_response(response: dict, keep_alive: bool, chunked: bool) -> bytes: Create the HTTP response of a handler result.
+    serve(host: str, port: int, handler: Callable, workers: int, processes: int, batch: bool): Run the server.
+"""
+
+import argparse
+import asyncio
+import base64
+import functools
+import logging
+import multiprocessing
+from collections import deque
+from concurrent.futures import ThreadPoolExecutor
+from http import HTTPStatus
+from typing import Callable, Optional
+from urllib.parse import parse_qsl, urlsplit
+
+from .binary_codec import is_binary_content_type
+from .default_values import DEFAULT_SERVER_HOST, DEFAULT_SERVER_PORT, \
+    DEFAULT_SERVER_MAX_PIPELINE, DEFAULT_SERVER_MAX_HEADER_SIZE, SERVER_ERROR_STATUS_CODE
+from .micro_batcher import MicroBatcher
+from .predict_service import make_prediction, predict, predict_stream
+
+_HEADER_END = b"\r\n\r\n"
+
+# Returned by next() at the end of a streamed body, as StopIteration cannot cross a Future
+_STREAM_END = object()
+
+
+def make_event(method: str, target: str, headers: dict, body: bytes) -> dict:
+    """
+    Create the API Gateway proxy event of an HTTP request.
+
+    Args:
+        method (str): The HTTP method.
+        target (str): The request target, i.e. the path and query string.
+        headers (dict): The request headers, with lowercase names.
+        body (bytes): The request body.
+
+    Returns:
+        dict: The event, with a base64-encoded body if it is binary or not valid UTF-8.
+    """
+    url = urlsplit(target)
+
+    # Binary media types are base64-encoded, even when their bytes happen to be valid UTF-8
+    is_base64_encoded = is_binary_content_type(headers.get("content-type", ""))
+
+    if not is_base64_encoded:
+        try:
+            body_text = body.decode()
+        except UnicodeDecodeError:
+            is_base64_encoded = True
+
+    if is_base64_encoded:
+        body_text = base64.b64encode(body).decode()
+
+    return {
+        "httpMethod": method,
+        "path": url.path,
+        "headers": headers,
+        "queryStringParameters": dict(parse_qsl(url.query)) or None,
+        "body": body_text,
+        "isBase64Encoded": is_base64_encoded,
+    }
+
+
+def is_streamed(response: dict) -> bool:
+    """
+    Check whether a handler result has a streamed body, e.g. from `predict_stream`.
+
+    Args:
+        response (dict): The handler result.
+
+    Returns:
+        bool: True if the body is an iterable of text or bytes pieces.
+    """
+    return not isinstance(response.get("body") or "", (str, bytes))
+
+
+def make_response(response: dict, keep_alive: bool, chunked: bool = True) -> bytes:
+    """
+    Create the HTTP response of a handler result.
+
+    For streamed bodies, only the response head is created, announcing a chunked body,
+    or a body delimited by the end of the connection if chunked encoding is not allowed.
+
+    Args:
+        response (dict): The handler result, with statusCode, headers, body and isBase64Encoded.
+        keep_alive (bool): Whether the connection stays open after the response.
+        chunked (bool): Whether chunked transfer encoding is allowed, i.e. not for HTTP/1.0.
+
+    Returns:
+        bytes: The HTTP/1.1 response, or its head for streamed bodies.
+    """
+    status = response["statusCode"]
+    body = response.get("body") or ""
+
+    try:
+        reason = HTTPStatus(status).phrase
+    except ValueError:
+        reason = ""
+
+    lines = [f"HTTP/1.1 {status} {reason}"]
+    for name, value in (response.get("headers") or {}).items():
+        lines.append(f"{name}: {value}")
+
+    if is_streamed(response):
+        if chunked:
+            lines.append("Transfer-Encoding: chunked")
+        body = b""
+    else:
+        if response.get("isBase64Encoded"):
+            body = base64.b64decode(body)
+        elif isinstance(body, str):
+            body = body.encode()
+
+        lines.append(f"Content-Length: {len(body)}")
+
+    lines.append("Connection: keep-alive" if keep_alive else "Connection: close")
+
+    return ("\r\n".join(lines) + "\r\n\r\n").encode("latin-1") + body
+
+
+def _error_response(status: int, message: str) -> dict:
+    return {
+        "statusCode": status,
+        "headers": {"Content-Type": "text/plain"},
+        "body": message,
+        "isBase64Encoded": False,
+    }
+
+
+class HttpProtocol(asyncio.Protocol):
+    """
+    asyncio protocol adapting HTTP/1.1 requests to Lambda events.
+
+    Args:
+        handler (Callable): The Lambda handler, called as handler(event, context).
+        executor (ThreadPoolExecutor): Pool running the handler, or None to run it inline.
+        max_pipeline (int): Number of unanswered requests after which reading pauses.
+    """
+
+    def __init__(self, handler: Callable, executor: Optional[ThreadPoolExecutor] = None,
+                 max_pipeline: int = DEFAULT_SERVER_MAX_PIPELINE):
+        self.handler = handler
+        self.executor = executor
+        self.max_pipeline = max_pipeline
+
+        self._transport = None
+        self._buffer = bytearray()
+        self._pending = deque()
+        self._is_reading = True
+        self._is_closing = False
+
+        # Streamed response being written: (pieces, keep_alive, chunked)
+        self._stream = None
+        self._is_writing = True
+        self._is_stream_scheduled = False
+        self._is_stream_advancing = False
+
+    def connection_made(self, transport):
+        self._transport = transport
+
+    def connection_lost(self, exc):
+        self._transport = None
+        for entry in self._pending:
+            if isinstance(entry[0], asyncio.Future):
+                entry[0].cancel()
+
+        # A generator running in the executor is closed once its piece is ready
+        if not self._is_stream_advancing:
+            self._close_stream()
+
+    def pause_writing(self):
+        self._is_writing = False
+
+    def resume_writing(self):
+        self._is_writing = True
+        if self._stream is not None:
+            self._schedule_stream()
+
+    def data_received(self, data: bytes):
+        self._buffer += data
+
+        # Several pipelined requests may arrive in one segment
+        while not self._is_closing:
+            request = self._parse_request()
+            if request is None:
+                break
+
+            self._handle(*request)
+
+        self._flush()
+
+    def _parse_request(self) -> Optional[tuple]:
+        header_end = self._buffer.find(_HEADER_END)
+        if header_end == -1:
+            if len(self._buffer) > DEFAULT_SERVER_MAX_HEADER_SIZE:
+                self._reject(HTTPStatus.REQUEST_HEADER_FIELDS_TOO_LARGE, "Request header too large.")
+            return None
+
+        try:
+            head = self._buffer[:header_end].decode("latin-1").split("\r\n")
+            method, target, version = head[0].split(" ")
+
+            headers = {}
+            for line in head[1:]:
+                name, _, value = line.partition(":")
+                headers[name.strip().lower()] = value.strip()
+
+            # int() accepts signs, and a negative length would end the body inside the header
+            content_length = headers.get("content-length", "0")
+            if not content_length.isdigit():
+                raise ValueError(f"Invalid Content-Length: {content_length!r}")
+
+            content_length = int(content_length)
+        except ValueError:
+            self._reject(HTTPStatus.BAD_REQUEST, "Malformed request.")
+            return None
+
+        if "chunked" in headers.get("transfer-encoding", ""):
+            self._reject(HTTPStatus.LENGTH_REQUIRED, "Chunked request bodies are not supported.")
+            return None
+
+        body_start = header_end + len(_HEADER_END)
+        body_end = body_start + content_length
+        if len(self._buffer) < body_end:
+            return None
+
+        body = bytes(self._buffer[body_start:body_end])
+        del self._buffer[:body_end]
+
+        connection = headers.get("connection", "").lower()
+        if version == "HTTP/1.0":
+            keep_alive = connection == "keep-alive"
+        else:
+            keep_alive = connection != "close"
+
+        return make_event(method, target, headers, body), keep_alive, version != "HTTP/1.0"
+
+    def _handle(self, event: dict, keep_alive: bool, chunked: bool):
+        if self.executor is None:
+            result = self._call_handler(event)
+        else:
+            loop = asyncio.get_running_loop()
+            result = loop.run_in_executor(self.executor, self._call_handler, event)
+            result.add_done_callback(lambda _: self._flush())
+
+        self._pending.append((result, keep_alive, chunked))
+        if not keep_alive:
+            self._is_closing = True
+
+        if self._is_reading and len(self._pending) >= self.max_pipeline:
+            self._transport.pause_reading()
+            self._is_reading = False
+
+    def _call_handler(self, event: dict) -> dict:
+        try:
+            return self.handler(event, {})
+        except Exception as e:
+            logging.error(f"Unhandled handler error: {e}")
+            return _error_response(SERVER_ERROR_STATUS_CODE, "Internal server error.")
+
+    def _reject(self, status: HTTPStatus, message: str):
+        self._pending.append((_error_response(status.value, message), False, True))
+        self._is_closing = True
+
+    def _flush(self):
+        # Responses are written in request order, as pipelining requires
+        if self._transport is None or self._stream is not None:
+            return
+
+        chunks = []
+        keep_alive = True
+        while self._pending and keep_alive:
+            result, is_kept_alive, chunked = self._pending[0]
+            if isinstance(result, asyncio.Future):
+                if not result.done():
+                    break
+                result = result.result()
+
+            self._pending.popleft()
+            keep_alive = is_kept_alive and (chunked or not is_streamed(result))
+            chunks.append(make_response(result, keep_alive, chunked))
+
+            # Later responses wait until the streamed body is written
+            if is_streamed(result):
+                self._stream = (iter(result["body"]), keep_alive, chunked)
+                break
+
+        if chunks:
+            self._transport.write(b"".join(chunks))
+
+        if self._stream is not None:
+            self._schedule_stream()
+        elif not keep_alive:
+            self._transport.close()
+        elif not self._is_reading and len(self._pending) < self.max_pipeline:
+            self._transport.resume_reading()
+            self._is_reading = True
+
+    def _close_stream(self):
+        if self._stream is not None and hasattr(self._stream[0], "close"):
+            self._stream[0].close()
+
+    def _schedule_stream(self):
+        if not self._is_stream_scheduled:
+            self._is_stream_scheduled = True
+            asyncio.get_running_loop().call_soon(self._write_stream)
+
+    def _write_stream(self):
+        # Write one piece of the streamed body per loop iteration, while the
+        # transport buffer is below its high-water mark. Pieces are produced
+        # in the executor when there is one, as producing them scores the model.
+        self._is_stream_scheduled = False
+        if self._transport is None or not self._is_writing or self._is_stream_advancing:
+            return
+
+        pieces = self._stream[0]
+        if self.executor is not None:
+            self._is_stream_advancing = True
+            piece = asyncio.get_running_loop().run_in_executor(self.executor, next, pieces, _STREAM_END)
+            piece.add_done_callback(self._on_piece)
+            return
+
+        try:
+            piece = next(pieces, _STREAM_END)
+        except Exception as e:
+            self._fail_stream(e)
+            return
+
+        self._write_piece(piece)
+
+    def _on_piece(self, piece: asyncio.Future):
+        self._is_stream_advancing = False
+        if self._transport is None or piece.cancelled():
+            self._close_stream()
+            return
+
+        try:
+            piece = piece.result()
+        except Exception as e:
+            self._fail_stream(e)
+            return
+
+        self._write_piece(piece)
+
+    def _fail_stream(self, error: Exception):
+        # The status is already sent: an unterminated body tells the client
+        logging.error(f"Unhandled streaming error: {error}")
+        self._transport.close()
+
+    def _write_piece(self, piece):
+        _, keep_alive, chunked = self._stream
+        if piece is _STREAM_END:
+            self._stream = None
+            if chunked:
+                self._transport.write(b"0\r\n\r\n")
+
+            if keep_alive:
+                self._flush()
+            else:
+                self._transport.close()
+            return
+
+        data = piece.encode() if isinstance(piece, str) else piece
+        if data:
+            self._transport.write(b"%x\r\n%b\r\n" % (len(data), data) if chunked else data)
+
+        self._schedule_stream()
+
+
+async def _serve_forever(host: str, port: int, handler: Callable, workers: int,
+                         reuse_port: bool, batch: bool):
+    executor = ThreadPoolExecutor(workers) if workers > 0 else None
+    loop = asyncio.get_running_loop()
+
+    # Each process batches the model calls of its own worker threads
+    batcher = MicroBatcher(make_prediction) if batch else None
+    if batcher is not None:
+        handler = functools.partial(handler, batcher=batcher)
+
+    server = await loop.create_server(
+        lambda: HttpProtocol(handler, executor), host, port, reuse_port=reuse_port or None
+    )
+
+    try:
+        async with server:
+            await server.serve_forever()
+    finally:
+        if batcher is not None:
+            batcher.close()
+
+
+def _run(host: str, port: int, handler: Callable, workers: int, reuse_port: bool, batch: bool):
+    try:
+        asyncio.run(_serve_forever(host, port, handler, workers, reuse_port, batch))
+    except KeyboardInterrupt:
+        pass
+
+
+def serve(host: str = DEFAULT_SERVER_HOST, port: int = DEFAULT_SERVER_PORT,
+          handler: Callable = predict, workers: int = 0, processes: int = 1, batch: bool = False):
+    """
+    Run the server until interrupted.
+
+    Args:
+        host (str): The address to bind.
+        port (int): The port to bind.
+        handler (Callable): The Lambda handler, called as handler(event, context).
+        workers (int): Number of threads running the handler in each process, or 0 to run it
+            on the event loop.
+        processes (int): Number of server processes, sharing the port through SO_REUSEPORT.
+        batch (bool): Whether each process scores concurrent requests with a MicroBatcher,
+            passed to the handler as its `batcher` argument, e.g. of `predict`. Requires
+            worker threads, since inline handlers never run concurrently.
+    """
+    if batch and workers <= 0:
+        raise ValueError("Micro-batching requires worker threads.")
+
+    if processes <= 1:
+        _run(host, port, handler, workers, False, batch)
+        return
+
+    children = [
+        multiprocessing.Process(target=_run, args=(host, port, handler, workers, True, batch))
+        for _ in range(processes)
+    ]
+
+    for child in children:
+        child.start()
+
+    try:
+        for child in children:
+            child.join()
+    except KeyboardInterrupt:
+        for child in children:
+            child.join()
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Serve the prediction handler over HTTP.")
+    parser.add_argument("--host", default=DEFAULT_SERVER_HOST)
+    parser.add_argument("--port", type=int, default=DEFAULT_SERVER_PORT)
+    parser.add_argument("--workers", type=int, default=0,
+                        help="threads running the handler per process, 0 to run it inline")
+    parser.add_argument("--processes", type=int, default=1,
+                        help="server processes sharing the port")
+    mode = parser.add_mutually_exclusive_group()
+    mode.add_argument("--stream", action="store_true",
+                      help="stream responses chunk by chunk with predict_stream")
+    mode.add_argument("--batch", action="store_true",
+                      help="coalesce the model calls of concurrent requests, requires --workers")
+    parser.add_argument("--log-level", default="WARNING",
+                        help="logging level, INFO logs every prediction")
+    args = parser.parse_args()
+
+    if args.batch and args.workers <= 0:
+        parser.error("--batch requires --workers")
+
+    logging.basicConfig(level=args.log_level)
+    print(f"Serving on http://{args.host}:{args.port}")
+    handler = predict_stream if args.stream else predict
+    serve(args.host, args.port, handler, args.workers, args.processes, args.batch)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,164 @@
+"""
+Module: micro_batcher
+
+This module coalesces concurrent prediction requests into batched model calls.
+
+When the prediction handler is hosted in a long-running local server, many small
+requests arrive concurrently and each one pays the fixed cost of a model call. A
+MicroBatcher collects the payloads submitted within a short window, or until a
+batch size is reached, scores them with a single call of the prediction function,
+and scatters the results back to each caller. It is not meant for AWS Lambda,
+which serves a single request per execution instance.
+
+Classes:
+    MicroBatcher: Background dispatcher of batched predictions.
+"""
+
+import queue
+import threading
+import time
+from concurrent.futures import Future
+from typing import Callable
+
+import numpy as np
+
+from .default_values import DEFAULT_MICRO_BATCH_SIZE, DEFAULT_MICRO_BATCH_WAIT
+
+
+class MicroBatcher:
+    """
+    Background dispatcher coalescing concurrent payloads into batched predictions.
+
+    Payloads are grouped by dtype, so that every caller gets the predictions it would
+    get from an isolated call of an element-wise model.
+
+    Args:
+        prediction (Callable): Function scoring a one-dimensional array of entries, such as
+            `predict_service.make_prediction`.
+        max_batch_size (int): Number of entries after which a batch is dispatched without
+            waiting any longer. Larger values raise throughput.
+        max_wait (float): Longest time, in seconds, a batch waits for more requests after
+            the first one arrived. Smaller values lower latency.
+    """
+
+    def __init__(self, prediction: Callable, max_batch_size: int = DEFAULT_MICRO_BATCH_SIZE,
+                 max_wait: float = DEFAULT_MICRO_BATCH_WAIT):
+        if max_batch_size < 1:
+            raise ValueError("max_batch_size must be a positive integer.")
+
+        if max_wait < 0:
+            raise ValueError("max_wait must be a non-negative number of seconds.")
+
+        self.prediction = prediction
+        self.max_batch_size = max_batch_size
+        self.max_wait = max_wait
+
+        self.batches = 0
+        self.requests = 0
+
+        self._queue = queue.SimpleQueue()
+        self._lock = threading.Lock()
+        self._closed = False
+        self._thread = threading.Thread(target=self._run, name="micro-batcher", daemon=True)
+        self._thread.start()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc_info):
+        self.close()
+
+    def submit(self, payload) -> Future:
+        """
+        Queue a payload for the next batch.
+
+        Args:
+            payload: List or array of entries.
+
+        Returns:
+            Future: Future resolving to the predictions of the payload.
+        """
+        future = Future()
+
+        with self._lock:
+            if self._closed:
+                raise RuntimeError("The micro-batcher is closed.")
+
+            self._queue.put((np.asarray(payload), future))
+
+        return future
+
+    def predict(self, payload) -> np.ndarray:
+        """
+        Score a payload within the next batch, waiting for its predictions.
+
+        Args:
+            payload: List or array of entries.
+
+        Returns:
+            np.ndarray: The predictions of the payload.
+        """
+        return self.submit(payload).result()
+
+    def close(self):
+        """
+        Dispatch the queued payloads and stop the background thread.
+        """
+        with self._lock:
+            if self._closed:
+                return
+
+            self._closed = True
+            self._queue.put(None)
+
+        self._thread.join()
+
+    def _run(self):
+        is_running = True
+        while is_running:
+            request = self._queue.get()
+            if request is None:
+                break
+
+            batch = [request]
+            size = len(request[0])
+            deadline = time.monotonic() + self.max_wait
+
+            # Gather requests until the batch is full or the window is over
+            while size < self.max_batch_size:
+                timeout = deadline - time.monotonic()
+                try:
+                    request = self._queue.get(timeout=timeout) if timeout > 0 else self._queue.get_nowait()
+                except queue.Empty:
+                    break
+
+                if request is None:
+                    is_running = False
+                    break
+
+                batch.append(request)
+                size += len(request[0])
+
+            self._dispatch(batch)
+
+    def _dispatch(self, batch: list):
+        groups = {}
+        for payload, future in batch:
+            groups.setdefault(payload.dtype, []).append((payload, future))
+
+        for group in groups.values():
+            payloads = [payload for payload, _ in group]
+            futures = [future for _, future in group]
+            offsets = np.cumsum([len(payload) for payload in payloads])[:-1]
+
+            try:
+                predictions = np.asarray(self.prediction(np.concatenate(payloads)))
+            except Exception as e:
+                for future in futures:
+                    future.set_exception(e)
+            else:
+                for future, result in zip(futures, np.split(predictions, offsets)):
+                    future.set_result(result)
+
+            self.batches += 1
+            self.requests += len(group)
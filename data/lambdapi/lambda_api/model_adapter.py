@@ -0,0 +1,94 @@
+"""
+Module: model_adapter
+
+This module adapts a model with a batch `predict` method to the prediction service.
+
+The validated payload is converted once into a contiguous NumPy array and scored
+with one vectorized call per chunk of at most `max_batch_size` entries, so that the
+cost per element stays inside NumPy and the model instead of the Python interpreter.
+
+Classes:
+    ModelAdapter: Vectorized, chunked wrapper around a model.
+"""
+
+import numpy as np
+
+from .default_values import DEFAULT_MAX_BATCH_SIZE
+
+
+class ModelAdapter:
+    """
+    Vectorized wrapper around a model exposing `predict(inputs) -> array-like`.
+
+    Args:
+        model: The model to call, e.g. a scikit-learn estimator.
+        max_batch_size (int): Largest number of entries passed to a single `predict` call.
+        features (int): When set, inputs are reshaped to (n, features), as expected by
+            scikit-learn estimators. Otherwise they are passed as a flat array.
+        dtype: NumPy dtype of the model inputs. Inferred from the payload when omitted.
+    """
+
+    def __init__(self, model, max_batch_size: int = DEFAULT_MAX_BATCH_SIZE,
+                 features: int = None, dtype=None):
+        if max_batch_size < 1:
+            raise ValueError("max_batch_size must be a positive integer.")
+
+        self.model = model
+        self.max_batch_size = max_batch_size
+        self.features = features
+        self.dtype = dtype
+
+    def to_array(self, payload) -> np.ndarray:
+        """
+        Convert the payload into a contiguous NumPy array of model inputs.
+
+        Args:
+            payload: List or array of numeric entries.
+
+        Returns:
+            np.ndarray: The model inputs.
+        """
+        inputs = np.ascontiguousarray(payload, dtype=self.dtype)
+
+        if self.features is not None:
+            inputs = inputs.reshape(-1, self.features)
+
+        return inputs
+
+    def predict(self, payload) -> np.ndarray:
+        """
+        Score the payload in vectorized chunks of at most `max_batch_size` entries.
+
+        Args:
+            payload: List or array of numeric entries.
+
+        Returns:
+            np.ndarray: One prediction per input row.
+        """
+        inputs = self.to_array(payload)
+        size = self.max_batch_size
+
+        if len(inputs) == 0:
+            return np.empty(0, dtype=inputs.dtype)
+
+        if len(inputs) <= size:
+            return np.asarray(self.model.predict(inputs))
+
+        chunks = [
+            np.asarray(self.model.predict(inputs[start:start + size]))
+            for start in range(0, len(inputs), size)
+        ]
+
+        return np.concatenate(chunks)
+
+    def predict_list(self, payload) -> list:
+        """
+        Score the payload and convert the predictions to Python numbers in one pass.
+
+        Args:
+            payload: List or array of numeric entries.
+
+        Returns:
+            list: The predictions, ready for JSON serialization.
+        """
+        return self.predict(payload).tolist()
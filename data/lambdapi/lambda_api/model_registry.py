@@ -0,0 +1,197 @@
+"""
+Module: model_registry
+
+This module keeps deserialized models alive across warm Lambda invocations.
+
+Models are registered by name and version with a loader, and loaded lazily on
+their first use. Loaded models stay in memory, at module scope, until the total
+estimated size of the loaded models exceeds the memory budget, in which case the
+least recently used ones are evicted. The time spent in each cold load is recorded.
+
+Classes:
+    ModelRegistry: Lazy, LRU-evicting cache of named and versioned models.
+
+Functions:
+    pickle_loader(path: str) -> Callable: Loader unpickling a model file with cloudpickle.
+"""
+
+import logging
+import os
+import threading
+import time
+from collections import OrderedDict
+from typing import Callable
+
+from .default_values import DEFAULT_MODEL_MEMORY_BUDGET, DEFAULT_MODEL_VERSION
+
+
+def pickle_loader(path: str) -> Callable:
+    """
+    Create a loader unpickling the model stored at the given path.
+
+    Args:
+        path (str): Path of the cloudpickle file.
+
+    Returns:
+        Callable: Function without arguments returning the unpickled model.
+    """
+    def load_model():
+        from cloudpickle import load
+
+        with open(path, "rb") as file:
+            return load(file)
+
+    return load_model
+
+
+class ModelRegistry:
+    """
+    Lazy cache of named and versioned models with LRU eviction.
+
+    Args:
+        memory_budget (int): Largest total size, in bytes, of the loaded models.
+            The most recently used model is always kept, even if it exceeds the budget.
+    """
+
+    def __init__(self, memory_budget: int = DEFAULT_MODEL_MEMORY_BUDGET):
+        if memory_budget < 0:
+            raise ValueError("memory_budget must be a non-negative integer.")
+
+        self.memory_budget = memory_budget
+
+        self._loaders = {}
+        self._sizes = {}
+        self._latest = {}
+        self._registrations = 0
+        self._revisions = {}
+        self._models = OrderedDict()
+        self._lock = threading.Lock()
+
+        self.load_times = {}
+        self.loads = 0
+        self.hits = 0
+        self.evictions = 0
+
+    def register(self, name: str, loader: Callable,
+                 version: str = DEFAULT_MODEL_VERSION, size: int = 0):
+        """
+        Register a model without loading it.
+
+        The last registered version of a name becomes its default version.
+        Registering an existing name and version again drops its loaded model.
+
+        Args:
+            name (str): The model name.
+            loader (Callable): Function without arguments returning the model.
+            version (str): The model version.
+            size (int): Estimated size of the loaded model in bytes, used for eviction.
+        """
+        key = (name, version)
+
+        with self._lock:
+            self._loaders[key] = loader
+            self._sizes[key] = size
+            self._latest[name] = version
+            self._registrations += 1
+            self._revisions[key] = self._registrations
+            self._models.pop(key, None)
+
+    def register_pickle(self, name: str, path: str, version: str = DEFAULT_MODEL_VERSION):
+        """
+        Register a cloudpickle model file, using the file size as size estimate.
+
+        Args:
+            name (str): The model name.
+            path (str): Path of the cloudpickle file.
+            version (str): The model version.
+        """
+        self.register(name, pickle_loader(path), version, os.path.getsize(path))
+
+    def get(self, name: str, version: str = None):
+        """
+        Return a model, loading it on first use.
+
+        Args:
+            name (str): The model name.
+            version (str): The model version, by default the last registered one.
+
+        Returns:
+            The loaded model.
+        """
+        key = self._key(name, version)
+
+        with self._lock:
+            if key in self._models:
+                self.hits += 1
+                self._models.move_to_end(key)
+                return self._models[key]
+
+            started = time.perf_counter()
+            model = self._loaders[key]()
+            load_time = time.perf_counter() - started
+
+            self.loads += 1
+            self.load_times[key] = load_time
+            self._models[key] = model
+            self._evict()
+
+        logging.info(f"Cold load of model {name}:{key[1]} in {load_time * 1e3:.1f} ms")
+
+        return model
+
+    def revision(self, name: str, version: str = None) -> tuple:
+        """
+        Identify a registered model, e.g. to key cached predictions.
+
+        Registering a name and version again gives it a new revision.
+
+        Args:
+            name (str): The model name.
+            version (str): The model version, by default the last registered one.
+
+        Returns:
+            tuple: The model name, version and registration number.
+        """
+        key = self._key(name, version)
+
+        return key + (self._revisions[key],)
+
+    def is_loaded(self, name: str, version: str = None) -> bool:
+        """
+        Check whether a model is currently in memory.
+
+        Args:
+            name (str): The model name.
+            version (str): The model version, by default the last registered one.
+
+        Returns:
+            bool: True if the model is loaded, otherwise False.
+        """
+        return self._key(name, version) in self._models
+
+    def loaded_size(self) -> int:
+        """
+        Estimated total size of the loaded models.
+
+        Returns:
+            int: The size in bytes.
+        """
+        return sum(self._sizes[key] for key in self._models)
+
+    def _key(self, name: str, version: str) -> tuple:
+        if name not in self._latest:
+            raise KeyError(f"Unknown model: {name}")
+
+        key = (name, self._latest[name] if version is None else version)
+        if key not in self._loaders:
+            raise KeyError(f"Unknown model version: {name}:{version}")
+
+        return key
+
+    def _evict(self):
+        # Drop least recently used models, keeping at least the last one
+        while len(self._models) > 1 and self.loaded_size() > self.memory_budget:
+            key, _ = self._models.popitem(last=False)
+            self.evictions += 1
+
+            logging.info(f"Evicted model {key[0]}:{key[1]}")
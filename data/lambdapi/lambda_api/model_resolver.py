@@ -1,20 +1,53 @@
+import os
 
-# By loading the pickle outside `predict`,
-# we re-use it across different Lambda calls
-# for the same execution instance
-#
-# from cloudpickle import load
-# with open('model.pickle', 'rb') as f:
-#     model = load(f)
+import numpy as np
+
+from .default_values import DEFAULT_MODEL_NAME
+from .model_adapter import ModelAdapter
+from .model_registry import ModelRegistry
+
+# By keeping the registry outside `predict`,
+# we re-use loaded models across different Lambda calls
+# for the same execution instance. Models are only
+# deserialized on their first use.
 
 ALLOWED_TYPES = (int, float)
 
-# REPLACE WITH:
-#   - command call model.predict(payload).tolist()
 
-def model_prediction_map(payload_list: list):
-    def square_lambda(x):
-        return x ** 2
-    square_map = map(square_lambda, payload_list)
+class SquareModel:
+    """
+    Placeholder model squaring its inputs.
+
+    REPLACE WITH the deployed model, e.g. by setting MODEL_PATH to its cloudpickle file.
+    """
+
+    def predict(self, inputs: np.ndarray) -> np.ndarray:
+        # Squares of fixed-width integers wrap around silently, so large ones are squared
+        # as Python integers, which are exact
+        inputs = np.asarray(inputs)
+        if inputs.dtype.kind in "iu" and inputs.size:
+            limit = np.iinfo(inputs.dtype).max ** 0.5
+            if inputs.max() > limit or inputs.min() < -limit:
+                inputs = inputs.astype(object)
+
+        return np.square(inputs)
+
+
+model_registry = ModelRegistry()
+
+if "MODEL_PATH" in os.environ:
+    model_registry.register_pickle(DEFAULT_MODEL_NAME, os.environ["MODEL_PATH"])
+else:
+    model_registry.register(DEFAULT_MODEL_NAME, SquareModel)
+
+
+def model_revision(name: str = DEFAULT_MODEL_NAME, version: str = None) -> tuple:
+    return model_registry.revision(name, version)
+
+
+def model_prediction_map(payload_list: list, name: str = DEFAULT_MODEL_NAME,
+                         version: str = None) -> np.ndarray:
+    model = model_registry.get(name, version)
 
-    return list(square_map)
+    # Predictions are left as an array, serialized natively by the JSON codec
+    return ModelAdapter(model).predict(payload_list)
@@ -6,29 +6,57 @@ It includes functions for handling API requests, validating input data, and form
 
 Functions:
     - make_prediction(payload: dict) -> dict: Wrapper function for the model prediction.
-    - api_return(body: dict, status: int, error: str = '') -> dict: Create a response in JSON-like format.
-    - validate_body(body: Union[str, dict]) -> Tuple[bool, List[Union[int, float, str]]]: Validate input data.
+    - api_return(body: dict, status: int, error: str = '', binary: bool = False) -> dict: Create a response
+      in JSON-like format.
+    - find_invalid_entry(body: Union[str, list, dict]) -> int: Locate the first entry of invalid type.
+    - validate_body(body: Union[str, bytes, dict]) -> Tuple[bool, List[Union[int, float, str]]]: Validate input data.
+    - validate_binary_body(body: Union[str, bytes], is_base64_encoded: bool) -> Tuple[bool, np.ndarray]:
+      Validate a binary body of float64 entries.
+    - validate_payload(event: dict, context: dict) -> Tuple[int, List[Union[int, float]], str]: Validate the request event,
+      returning the typed payload.
     - validate_event(event: dict, context: dict) -> dict: Validate the request event, including its body.
-    - predict(event: dict, context: dict) -> dict: Handle prediction requests and return responses.
+    - predict(event: dict, context: dict, batcher=None, cache=None) -> dict: Handle prediction requests and return responses.
+    - extract_entries(body: Union[str, list, dict]) -> Optional[list]: Extract the entries of the input body.
+    - get_header(event: dict, name: str) -> str: Read a request header, whatever its case.
+    - accepts_binary(event: dict) -> bool: Check whether the request asks for a binary response.
+    - accepts_ndjson(event: dict) -> bool: Check whether the request asks for an NDJSON response.
+    - predict_stream(event: dict, context: dict, chunk_size: int) -> dict: Handle prediction requests
+      with a streamed response body.
 
 Imports:
-    - json.loads and json.dumps from the json module
+    - loads and dumps functions from json_codec module, backed by orjson, ujson or json
+    - decode_array, encode_array and is_binary_content_type functions from binary_codec module
     - logging module for configuring logging settings
     - ALLOWED_TYPES, model_prediction_map, and validate_body functions from model_resolver module
-    - are_types function from utils module
+    - are_types, find_invalid_index, to_numeric_array, media_preference and parse_media_ranges
+      functions from utils module
 
 Author: Bruno Peixoto
 Date: 15 09 2023
 """
 
-from json import loads, dumps, JSONDecodeError
 import logging
-from typing import Union, List, Tuple
-
-from .model_resolver import ALLOWED_TYPES, model_prediction_map
-from .default_values import DEFAULT_TYPE_ERROR_MESSAGE, \
-    CLIENT_ERROR_STATUS_CODE, SUCCESS_STATUS_CODE, SERVER_ERROR_STATUS_CODE
-from .utils import are_types, is_success_status_code
+import os
+from typing import Union, List, Optional, Tuple
+
+import numpy as np
+
+from .binary_codec import decode_array, encode_array, is_binary_content_type
+from .json_codec import loads, dumps
+from .model_resolver import ALLOWED_TYPES, model_prediction_map, model_revision
+from .prediction_cache import PredictionCache
+from .default_values import DEFAULT_TYPE_ERROR_MESSAGE, DEFAULT_INVALID_ENTRY_MESSAGE, \
+    CLIENT_ERROR_STATUS_CODE, SUCCESS_STATUS_CODE, SERVER_ERROR_STATUS_CODE, \
+    DEFAULT_STREAM_CHUNK_SIZE, JSON_CONTENT_TYPE, NDJSON_CONTENT_TYPE, BINARY_CONTENT_TYPE
+from .streaming import validate_chunks, iter_predictions, iter_json_array, iter_ndjson
+from .utils import are_types, find_invalid_index, is_success_status_code, to_numeric_array, \
+    media_preference, parse_media_ranges
+
+# Opt-in cache of repeated payloads, kept across warm invocations,
+# e.g. with PREDICTION_CACHE_SIZE=1024 payloads
+prediction_cache = None
+if "PREDICTION_CACHE_SIZE" in os.environ:
+    prediction_cache = PredictionCache(int(os.environ["PREDICTION_CACHE_SIZE"]))
 
 # Function alias for prediction function wrapping
 
@@ -46,7 +74,7 @@ def make_prediction(payload: dict) -> dict:
     return model_prediction_map(payload)
 
 # Return JSON-like format for prediction response
-def api_return(body: dict, status: int, error: str = "") -> dict:
+def api_return(body: dict, status: int, error: str = "", binary: bool = False) -> dict:
     """
     Create a JSON-like response format for API responses.
 
@@ -54,15 +82,22 @@ def api_return(body: dict, status: int, error: str = "") -> dict:
         body (dict): The response body data.
         status (int): The HTTP status code.
         error (str): The error message (if any).
+        binary (bool): Whether the body, an array of numbers, is sent as base64-encoded
+            little-endian float64 instead of JSON.
 
     Returns:
         dict: The formatted response.
     """
+    if binary:
+        content_type, body = BINARY_CONTENT_TYPE, encode_array(body)
+    else:
+        content_type, body = JSON_CONTENT_TYPE, dumps(body)
+
     response = {
         "statusCode": status,
-        "headers": {"Content-Type": "application/json"},
-        "body": dumps(body, default=str),
-        "isBase64Encoded": False,
+        "headers": {"Content-Type": content_type},
+        "body": body,
+        "isBase64Encoded": binary,
     }
 
     if len(error) != 0:
@@ -71,21 +106,67 @@ def api_return(body: dict, status: int, error: str = "") -> dict:
     return response
 
 
-def list_check(candidate: list) -> Tuple[bool, List[Union[int, float, str]]]:
+def list_check(candidate: list) -> Tuple[bool, Union[np.ndarray, List[Union[int, float]]]]:
     # Initialization
     is_valid = True
     payload = []
 
-    are_allowed_types = are_types(candidate, ALLOWED_TYPES)
+    # Numeric lists are typed in a single pass, other lists are checked per element
+    # and kept as Python numbers, e.g. integers beyond the int64 range
+    numeric_array = to_numeric_array(candidate)
 
-    if are_allowed_types:
-        payload = candidate
+    if numeric_array is not None:
+        payload = numeric_array
+    elif are_types(candidate, ALLOWED_TYPES):
+        payload = np.array(candidate, dtype=object)
     else:
         is_valid = False
 
     return is_valid, payload
 
 
+def find_invalid_entry(body: Union[str, list, dict]) -> int:
+    """
+    Find the first entry of the input body data with a type out of the allowed types.
+
+    Args:
+        body (Union[str, list, dict]): The input body data, as accepted by `validate_body`.
+
+    Returns:
+        int: The index of the first invalid entry, or -1 if the body is not a list of entries.
+    """
+    entries = extract_entries(body)
+
+    return -1 if entries is None else find_invalid_index(entries, ALLOWED_TYPES)
+
+
+def extract_entries(body: Union[str, list, dict]) -> Optional[list]:
+    """
+    Extract the list of entries of the input body data, without type checking them.
+
+    Args:
+        body (Union[str, list, dict]): The input body data, as accepted by `validate_body`.
+
+    Returns:
+        Optional[list]: The entries, or None if the body holds no list or allowed value.
+    """
+    try:
+        body = loads(body) if isinstance(body, str) else body
+    except ValueError:
+        return None
+
+    if isinstance(body, dict):
+        body = body.get("data")
+
+    if isinstance(body, list):
+        return body
+
+    if isinstance(body, ALLOWED_TYPES):
+        return [body]
+
+    return None
+
+
 def validate_data(data):
     """
     Validate the data based on the allowed types.
@@ -95,7 +176,8 @@ def validate_data(data):
         allowed_types (tuple): Tuple of allowed types.
 
     Returns:
-        Tuple[bool, List[Union[int, float]]]: A tuple containing a boolean indicating validity and a list of valid entries.
+        Tuple[bool, List[Union[int, float]]]: A tuple containing a boolean indicating validity and a list of valid entries,
+            as a NumPy array for lists of numbers.
     """
     is_valid = True
     payload = []
@@ -110,27 +192,34 @@ def validate_data(data):
     return is_valid, payload
 
 
-def validate_body(body: Union[str, list, dict]
+def validate_body(body: Union[str, bytes, list, dict]
                   ) -> Tuple[bool, List[Union[int, float, str]]]:
     """
     Validate the format and types of the input body data.
 
     Args:
-        body (Union[str, list, dict]): The input body data, which can be a :
+        body (Union[str, bytes, list, dict]): The input body data, which can be a :
             1. JSON string;
             2. list;
-            3. dictionary.
+            3. dictionary;
+            4. bytes of little-endian float64 entries.
 
     Returns:
-        Tuple[bool, List[Union[int, float, str]]]: A tuple containing a boolean indicating validity and a list of valid entries.
+        Tuple[bool, List[Union[int, float, str]]]: A tuple containing a boolean indicating validity and a list of valid entries,
+            as a NumPy array for lists of numbers.
     """
     # Initialization
     is_valid = True
     payload = []
 
+    # Raw binary entries need no parsing
+    if isinstance(body, (bytes, bytearray, memoryview)):
+        return validate_binary_body(body, False)
+
+    # Decoding errors of every JSON backend are instances of ValueError
     try:
         body = loads(body) if isinstance(body, str) else body
-    except JSONDecodeError:
+    except ValueError:
         is_valid = False
 
     # List with valid typed entries
@@ -158,24 +247,48 @@ def validate_body(body: Union[str, list, dict]
 
     return is_valid, payload
 
-# Request event validation (i.e. body)
-def validate_event(event: dict, context: dict) -> dict:
+# Binary body validation, i.e. of raw float64 entries
+def validate_binary_body(body: Union[str, bytes], is_base64_encoded: bool) -> Tuple[bool, np.ndarray]:
     """
-    Validate the request event, including its body.
+    Validate a binary body of little-endian float64 entries, decoding it without copy.
+
+    Args:
+        body (Union[str, bytes]): The input body data.
+        is_base64_encoded (bool): Whether the body is base64-encoded, as set by API Gateway.
+
+    Returns:
+        Tuple[bool, np.ndarray]: A tuple containing a boolean indicating validity and the
+            read-only array of entries.
+    """
+    try:
+        return True, decode_array(body, is_base64_encoded)
+    except ValueError:
+        return False, []
+
+# Request event validation (i.e. body), keeping the typed payload
+def validate_payload(event: dict, context: dict) -> Tuple[int, List[Union[int, float]], str]:
+    """
+    Validate the request event, including its body, without serializing the payload.
 
     Args:
         event (dict): The request event data.
         context (dict): The Lambda context data.
 
     Returns:
-        dict: The formatted response with validation results.
+        Tuple[int, List[Union[int, float]], str]: The status code, the list of valid entries
+            and the error message (if any).
     """
     # Initialization
     error_msg = ""
 
-    # Validate provided body
+    # Validate provided body, binary or JSON according to its content type
     body = event["body"]
-    is_valid, payload_list = validate_body(body)
+    is_binary = is_binary_content_type(get_header(event, "content-type"))
+
+    if is_binary:
+        is_valid, payload_list = validate_binary_body(body, event.get("isBase64Encoded", False))
+    else:
+        is_valid, payload_list = validate_body(body)
 
     # Validation step
     if is_valid:
@@ -184,47 +297,71 @@ def validate_event(event: dict, context: dict) -> dict:
         error_msg = DEFAULT_TYPE_ERROR_MESSAGE
         code = CLIENT_ERROR_STATUS_CODE
 
+        # Point to the first invalid entry, if any
+        invalid_index = -1 if is_binary else find_invalid_entry(body)
+        if invalid_index != -1:
+            error_msg = f"{error_msg} {DEFAULT_INVALID_ENTRY_MESSAGE.format(index=invalid_index)}"
+
+    return code, payload_list, error_msg
+
+# Request event validation (i.e. body)
+def validate_event(event: dict, context: dict) -> dict:
+    """
+    Validate the request event, including its body.
+
+    Args:
+        event (dict): The request event data.
+        context (dict): The Lambda context data.
+
+    Returns:
+        dict: The formatted response with validation results.
+    """
+    code, payload_list, error_msg = validate_payload(event, context)
+
     return api_return(payload_list, code, error_msg)
 
 # Prediction main map
-def predict(event: dict, context: dict) -> dict:
+def predict(event: dict, context: dict, batcher=None, cache=None) -> dict:
     """
     Handle prediction requests and return predictions along with appropriate HTTP status codes.
 
     Args:
         event (dict): The request event data.
         context (dict): The Lambda context data.
+        batcher (MicroBatcher): Optional dispatcher scoring the payload together with
+            concurrent requests, when hosted in a long-running server.
+        cache (PredictionCache): Optional cache of predictions, by default `prediction_cache`.
 
     Returns:
         dict: The formatted response with prediction results.
     """
     # Initialization
-    error_msg = ""
     prediction_result = []
-    response = {}
 
-    # Payload validation
-    payload = validate_event(event, context)
-    status_code = payload["statusCode"]
+    if cache is None:
+        cache = prediction_cache
+
+    # Payload validation, serialized only once into the final response
+    status_code, payload_list, error_msg = validate_payload(event, context)
 
     is_success = is_success_status_code(status_code)
 
     if (is_success):
         # Try-catch pattern for consistent handling
         try:
-            # Response status code
-            status_code = SUCCESS_STATUS_CODE
-
             # Prediction
-            payload_list=loads(payload['body'])
-            prediction_result = make_prediction(payload_list)
+            prediction = make_prediction if batcher is None else batcher.predict
+
+            if cache is None:
+                prediction_result = prediction(payload_list)
+            else:
+                prediction_result = cache.predict(payload_list, prediction, model_revision())
 
             # Succeful prediction response
-            response = api_return(prediction_result, status_code)
+            response = api_return(prediction_result, status_code, binary=accepts_binary(event))
 
-            # Log successful event
-            log_message = f"Successful prediction: {prediction_result}"
-            logging.info(log_message)
+            # Log successful event, formatted only if the level is enabled
+            logging.info("Successful prediction: %s", prediction_result)
 
         except Exception as e:
             # Response error
@@ -241,6 +378,121 @@ def predict(event: dict, context: dict) -> dict:
             logging.error(log_message)
 
     else:
-        response = payload
+        response = api_return(payload_list, status_code, error_msg)
 
     return response
+
+# Request header lookup, as header names are case-insensitive
+def get_header(event: dict, name: str) -> str:
+    """
+    Read a request header, whatever the case of its name.
+
+    Args:
+        event (dict): The request event data.
+        name (str): The lowercase header name.
+
+    Returns:
+        str: The header value, or an empty string if the header is missing.
+    """
+    for header, value in (event.get("headers") or {}).items():
+        if header.lower() == name:
+            return value
+
+    return ""
+
+# Client preference for binary predictions
+def accepts_binary(event: dict) -> bool:
+    """
+    Check whether the request asks for a binary response.
+
+    Args:
+        event (dict): The request event data.
+
+    Returns:
+        bool: True if the Accept header prefers the binary media type over JSON, by quality,
+            specificity then order, or if it prefers neither and the request body is binary.
+    """
+    ranges = parse_media_ranges(get_header(event, "accept"))
+    binary_preference = media_preference(ranges, BINARY_CONTENT_TYPE)
+    json_preference = media_preference(ranges, JSON_CONTENT_TYPE)
+
+    # Without Accept header, or with the same range for both, e.g. */*, follow the request body
+    if binary_preference == json_preference:
+        is_acceptable = not ranges or binary_preference[0] > 0
+        return is_acceptable and is_binary_content_type(get_header(event, "content-type"))
+
+    return binary_preference[0] > 0 and binary_preference > json_preference
+
+# Client preference for one JSON value per line
+def accepts_ndjson(event: dict) -> bool:
+    """
+    Check whether the request asks for an NDJSON response.
+
+    Args:
+        event (dict): The request event data.
+
+    Returns:
+        bool: True if the Accept header prefers NDJSON over JSON, or if the `format` query
+            parameter asks for NDJSON.
+    """
+    parameters = event.get("queryStringParameters") or {}
+    if parameters.get("format") == "ndjson":
+        return True
+
+    ranges = parse_media_ranges(get_header(event, "accept"))
+    ndjson_preference = media_preference(ranges, NDJSON_CONTENT_TYPE)
+
+    return ndjson_preference[0] > 0 and ndjson_preference > media_preference(ranges, JSON_CONTENT_TYPE)
+
+# Streamed prediction of very large payloads
+def predict_stream(event: dict, context: dict, chunk_size: int = DEFAULT_STREAM_CHUNK_SIZE) -> dict:
+    """
+    Handle prediction requests, validating, scoring and encoding the payload chunk by chunk.
+
+    The response body is a generator of text pieces, a JSON array or NDJSON lines, to be
+    sent as they are produced, e.g. by `local_server` with chunked transfer encoding.
+    Binary bodies are decoded as with `predict`. Invalid requests get the same response
+    as with `predict`, and so do requests accepting binary predictions, which are compact
+    enough to be sent whole.
+
+    Args:
+        event (dict): The request event data.
+        context (dict): The Lambda context data.
+        chunk_size (int): Number of entries converted, scored and encoded at once.
+
+    Returns:
+        dict: The formatted response, with a generator body on success.
+    """
+    if accepts_binary(event):
+        return predict(event, context)
+
+    # Binary entries are typed already, JSON ones are type checked chunk by chunk
+    if is_binary_content_type(get_header(event, "content-type")):
+        is_valid, entries = validate_binary_body(event["body"], event.get("isBase64Encoded", False))
+        if not is_valid:
+            return api_return([], CLIENT_ERROR_STATUS_CODE, DEFAULT_TYPE_ERROR_MESSAGE)
+
+        dtype = entries.dtype
+    else:
+        entries = extract_entries(event["body"])
+        if entries is None:
+            return api_return([], CLIENT_ERROR_STATUS_CODE, DEFAULT_TYPE_ERROR_MESSAGE)
+
+        is_valid, dtype, invalid_index = validate_chunks(entries, ALLOWED_TYPES, chunk_size)
+        if not is_valid:
+            error_msg = f"{DEFAULT_TYPE_ERROR_MESSAGE} {DEFAULT_INVALID_ENTRY_MESSAGE.format(index=invalid_index)}"
+            return api_return([], CLIENT_ERROR_STATUS_CODE, error_msg)
+
+    chunks = iter_predictions(entries, make_prediction, dtype, chunk_size)
+
+    if accepts_ndjson(event):
+        content_type, body = NDJSON_CONTENT_TYPE, iter_ndjson(chunks)
+    else:
+        content_type, body = JSON_CONTENT_TYPE, iter_json_array(chunks)
+
+    return {
+        "statusCode": SUCCESS_STATUS_CODE,
+        "headers": {"Content-Type": content_type},
+        "body": body,
+        "isBase64Encoded": False,
+    }
@@ -0,0 +1,211 @@
+"""
+Module: prediction_cache
+
+This module caches predictions of repeated payloads.
+
+Payloads are keyed by a BLAKE2 hash of their bytes and dtype, together with the
+revision of the model which scored them, so that registering a new model never
+serves stale predictions. Cached payloads are evicted in least recently used order
+beyond a number of entries, or once their time to live has passed. Optionally,
+predictions are also memoized per entry, so that a payload repeating part of
+earlier ones only sends its new entries to the model. This assumes the model scores
+each entry independently.
+
+Classes:
+    PredictionCache: LRU and TTL cache of predictions, with hit and miss counters.
+"""
+
+import hashlib
+import threading
+import time
+from collections import OrderedDict
+from typing import Callable, Hashable
+
+import numpy as np
+
+from .default_values import DEFAULT_CACHE_MAX_ENTRIES, DEFAULT_CACHE_MAX_ELEMENTS, \
+    DEFAULT_CACHE_TTL
+
+
+class _LruTtlStore:
+    # Bounded mapping dropping least recently used and expired values
+
+    def __init__(self, max_entries: int, ttl: float):
+        self.max_entries = max_entries
+        self.ttl = ttl
+        self.evictions = 0
+        self._values = OrderedDict()
+
+    def __len__(self) -> int:
+        return len(self._values)
+
+    def get(self, key: Hashable, now: float):
+        entry = self._values.get(key)
+        if entry is None:
+            return None
+
+        expires_at, value = entry
+        if expires_at <= now:
+            del self._values[key]
+            self.evictions += 1
+            return None
+
+        self._values.move_to_end(key)
+        return value
+
+    def put(self, key: Hashable, value, now: float):
+        self._values[key] = (now + self.ttl, value)
+        self._values.move_to_end(key)
+
+        while len(self._values) > self.max_entries:
+            self._values.popitem(last=False)
+            self.evictions += 1
+
+    def clear(self):
+        self._values.clear()
+
+
+class PredictionCache:
+    """
+    LRU and TTL cache of predictions, keyed by payload hash and model revision.
+
+    Cached predictions are read-only arrays shared by every request hitting them.
+
+    Args:
+        max_entries (int): Number of payloads kept.
+        ttl (float): Lifetime of cached predictions, in seconds.
+        per_element (bool): Whether predictions of one-dimensional payloads are also memoized
+            per entry, for models scoring each entry independently.
+        max_elements (int): Number of entries kept by the per-entry memo.
+    """
+
+    def __init__(self, max_entries: int = DEFAULT_CACHE_MAX_ENTRIES, ttl: float = DEFAULT_CACHE_TTL,
+                 per_element: bool = False, max_elements: int = DEFAULT_CACHE_MAX_ELEMENTS):
+        if max_entries < 1 or max_elements < 1:
+            raise ValueError("max_entries and max_elements must be positive integers.")
+
+        if ttl <= 0:
+            raise ValueError("ttl must be a positive number of seconds.")
+
+        self.per_element = per_element
+
+        self._payloads = _LruTtlStore(max_entries, ttl)
+        self._elements = _LruTtlStore(max_elements, ttl)
+        self._lock = threading.Lock()
+
+        self.hits = 0
+        self.misses = 0
+        self.element_hits = 0
+        self.element_misses = 0
+
+    def predict(self, payload, prediction: Callable, revision: Hashable) -> np.ndarray:
+        """
+        Return the cached predictions of a payload, scoring it on a miss.
+
+        Args:
+            payload: List or array of entries.
+            prediction (Callable): Function scoring an array of entries, such as
+                `predict_service.make_prediction`.
+            revision (Hashable): Identifier of the model, such as `model_registry.revision()`.
+
+        Returns:
+            np.ndarray: The predictions of the payload. Payloads of Python objects are
+                never cached.
+        """
+        payload = np.ascontiguousarray(payload)
+
+        # The bytes of object arrays, e.g. of integers beyond int64, are pointers
+        if payload.dtype.hasobject:
+            return np.asarray(prediction(payload))
+
+        key = (revision, payload.dtype.str, payload.shape, hashlib.blake2b(payload, digest_size=16).digest())
+
+        with self._lock:
+            predictions = self._payloads.get(key, time.monotonic())
+            if predictions is not None:
+                self.hits += 1
+                return predictions
+
+            self.misses += 1
+
+        if self.per_element and payload.ndim == 1:
+            predictions = self._predict_elements(payload, prediction, revision)
+        else:
+            predictions = np.asarray(prediction(payload))
+
+        # The model may keep the array it returned, e.g. as an output buffer
+        predictions = predictions.copy()
+        predictions.setflags(write=False)
+        with self._lock:
+            self._payloads.put(key, predictions, time.monotonic())
+
+        return predictions
+
+    def _predict_elements(self, payload: np.ndarray, prediction: Callable, revision: Hashable) -> np.ndarray:
+        # Only entries missing from the memo are scored, in a single call
+        dtype = payload.dtype.str
+        values = payload.tolist()
+        predictions = [None] * len(values)
+        missing = []
+
+        with self._lock:
+            now = time.monotonic()
+            for index, value in enumerate(values):
+                cached = self._elements.get((revision, dtype, value), now)
+                if cached is None:
+                    missing.append(index)
+                else:
+                    predictions[index] = cached
+
+            self.element_hits += len(values) - len(missing)
+            self.element_misses += len(missing)
+
+        if not missing:
+            return np.array(predictions)
+
+        new_predictions = np.asarray(prediction(payload[missing]))
+        new_values = new_predictions.tolist()
+
+        if len(missing) == len(values):
+            result = new_predictions
+        else:
+            for index, value in zip(missing, new_values):
+                predictions[index] = value
+            result = np.array(predictions, dtype=new_predictions.dtype)
+
+        with self._lock:
+            now = time.monotonic()
+            for index, value in zip(missing, new_values):
+                self._elements.put((revision, dtype, values[index]), value, now)
+
+        return result
+
+    def stats(self) -> dict:
+        """
+        Counters of the cache, for monitoring.
+
+        Returns:
+            dict: Hits, misses and hit ratio of payloads and entries, sizes and evictions.
+        """
+        lookups = self.hits + self.misses
+        element_lookups = self.element_hits + self.element_misses
+
+        return {
+            "hits": self.hits,
+            "misses": self.misses,
+            "hit_ratio": self.hits / lookups if lookups else 0.0,
+            "element_hits": self.element_hits,
+            "element_misses": self.element_misses,
+            "element_hit_ratio": self.element_hits / element_lookups if element_lookups else 0.0,
+            "entries": len(self._payloads),
+            "elements": len(self._elements),
+            "evictions": self._payloads.evictions + self._elements.evictions,
+        }
+
+    def clear(self):
+        """
+        Drop every cached prediction, keeping the counters.
+        """
+        with self._lock:
+            self._payloads.clear()
+            self._elements.clear()
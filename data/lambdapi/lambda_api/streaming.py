@@ -0,0 +1,129 @@
+"""
+Module: streaming
+
+This module validates, scores and encodes very large payloads chunk by chunk.
+
+Instead of typing the whole payload, scoring it at once and encoding every prediction
+into a single JSON string, entries are converted, scored and encoded one chunk at a
+time, so the memory used on top of the decoded request only grows with the chunk size.
+The encoded body is a generator of text pieces, either a JSON array or NDJSON, i.e.
+one JSON value per line.
+
+Functions:
+    validate_chunks(entries: list, types: tuple, chunk_size: int) -> Tuple[bool, np.dtype, int]:
+        Type check a list of entries chunk by chunk.
+    iter_predictions(entries: list, prediction: Callable, dtype: np.dtype, chunk_size: int) -> Iterator[np.ndarray]:
+        Score a list of entries chunk by chunk.
+    iter_json_array(chunks: Iterable[np.ndarray]) -> Iterator[str]: Encode chunks as one JSON array.
+    iter_ndjson(chunks: Iterable[np.ndarray]) -> Iterator[str]: Encode chunks as one JSON value per line.
+"""
+
+from typing import Callable, Iterable, Iterator, Optional, Tuple
+
+import numpy as np
+
+from .json_codec import dumps, item_separator
+from .utils import find_invalid_index, to_numeric_array
+
+
+def validate_chunks(entries: list, types: tuple, chunk_size: int
+                    ) -> Tuple[bool, Optional[np.dtype], int]:
+    """
+    Type check a list of entries chunk by chunk, keeping no converted chunk.
+
+    Args:
+        entries (list): The entries to check.
+        types (tuple): A tuple of allowed types.
+        chunk_size (int): Number of entries converted at once.
+
+    Returns:
+        Tuple[bool, Optional[np.dtype], int]: The validity, the common dtype of the entries
+            and the index of the first invalid entry, or -1.
+    """
+    dtype = np.dtype(np.int64)
+
+    for start in range(0, len(entries), chunk_size):
+        chunk = entries[start:start + chunk_size]
+        numeric_array = to_numeric_array(chunk)
+
+        if numeric_array is None:
+            invalid_index = find_invalid_index(chunk, types)
+            if invalid_index != -1:
+                return False, None, start + invalid_index
+
+            # Python objects keep integers beyond the int64 range exact
+            numeric_array = np.asarray(chunk, dtype=object)
+
+        dtype = np.result_type(dtype, numeric_array.dtype)
+
+    return True, dtype, -1
+
+
+def iter_predictions(entries: list, prediction: Callable, dtype: np.dtype,
+                     chunk_size: int) -> Iterator[np.ndarray]:
+    """
+    Score a list of entries chunk by chunk.
+
+    Args:
+        entries (list): The validated entries.
+        prediction (Callable): Function scoring an array of entries.
+        dtype (np.dtype): The dtype of the entries, as found by `validate_chunks`.
+        chunk_size (int): Number of entries scored at once.
+
+    Yields:
+        np.ndarray: The predictions of each chunk.
+    """
+    for start in range(0, len(entries), chunk_size):
+        chunk = np.asarray(entries[start:start + chunk_size], dtype=dtype)
+
+        yield np.asarray(prediction(chunk))
+
+
+def _encode_entries(chunk: np.ndarray) -> str:
+    # Comma-separated predictions of a chunk, without brackets
+    return dumps(chunk)[1:-1]
+
+
+def iter_json_array(chunks: Iterable[np.ndarray]) -> Iterator[str]:
+    """
+    Encode chunks of predictions as one JSON array, formatted as by the selected codec.
+
+    Args:
+        chunks (Iterable[np.ndarray]): The chunks of predictions.
+
+    Yields:
+        str: Consecutive pieces of the JSON array.
+    """
+    yield "["
+
+    separator = ""
+    for chunk in chunks:
+        if len(chunk):
+            yield separator + _encode_entries(chunk)
+            separator = item_separator()
+
+    yield "]"
+
+
+def iter_ndjson(chunks: Iterable[np.ndarray]) -> Iterator[str]:
+    """
+    Encode chunks of predictions as NDJSON, one JSON value per line.
+
+    Args:
+        chunks (Iterable[np.ndarray]): The chunks of predictions.
+
+    Yields:
+        str: Consecutive lines of predictions, each piece ending with a newline.
+    """
+    for chunk in chunks:
+        if not len(chunk):
+            continue
+
+        # Numbers hold no comma, so a numeric chunk is encoded at once and split;
+        # strings, objects and rows of predictions are encoded one by one
+        if chunk.ndim == 1 and chunk.dtype.kind in "biuf":
+            lines = [entry.strip() for entry in _encode_entries(chunk).split(",")]
+        else:
+            lines = [dumps(entry) for entry in (chunk.tolist() if chunk.ndim == 1 else chunk)]
+
+        yield "\n".join(lines) + "\n"
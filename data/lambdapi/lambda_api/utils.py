@@ -1,24 +1,51 @@
 """
 Module: type_checker
 
-This module provides a function for checking if all elements in a list are of specified types.
+This module provides functions for checking if all elements in a list are of specified types.
 
 Classes:
     None
 
 Functions:
+    find_invalid_index(candidate: list, types: tuple) -> int:
+        Find the first element in the 'candidate' list which is not an instance of the 'types' tuple.
+
     are_types(candidate: list, types: tuple) -> bool:
         Check if all elements in the 'candidate' list are instances of the types specified in the 'types' tuple.
 
-        Args:
-            candidate (list): The list of elements to be checked.
-            types (tuple): A tuple of types to check against.
+    to_numeric_array(candidate: list) -> Optional[np.ndarray]:
+        Convert a list of numbers into a one-dimensional NumPy array in a single pass.
+
+    parse_media_ranges(header: str) -> List[Tuple[str, float]]:
+        Parse the media ranges of an Accept header with their quality.
 
-        Returns:
-            bool: True if all elements in 'candidate' are instances of the specified types, otherwise False.
+    media_preference(ranges: List[Tuple[str, float]], media_type: str) -> Tuple[float, int, int]:
+        Rank a media type against parsed media ranges.
 """
 
-from functools import reduce
+from typing import List, Optional, Tuple
+
+import numpy as np
+
+
+def find_invalid_index(candidate: list, types: tuple) -> int:
+    """
+    Find the first element in the 'candidate' list which is not an instance of the 'types' tuple.
+
+    The scan stops at the first invalid element.
+
+    Args:
+        candidate (list): The list of elements to be checked.
+        types (tuple): A tuple of types to check against.
+
+    Returns:
+        int: The index of the first invalid element, or -1 if all elements are valid.
+    """
+    for index, element in enumerate(candidate):
+        if not isinstance(element, types):
+            return index
+
+    return -1
 
 
 def are_types(candidate: list, types: tuple) -> bool:
@@ -31,11 +58,99 @@ def are_types(candidate: list, types: tuple) -> bool:
 
     Returns:
         bool: True if all elements in 'candidate' are instances of the specified types, otherwise False.
+            An empty list is valid.
+    """
+    return find_invalid_index(candidate, types) == -1
+
+
+def to_numeric_array(candidate: list) -> Optional[np.ndarray]:
+    """
+    Convert a list of numbers into a one-dimensional NumPy array in a single pass.
+
+    NumPy infers an integer or floating point dtype only if every element is a number,
+    so the conversion doubles as a type check running in C instead of one `isinstance`
+    call per element.
+
+    Args:
+        candidate (list): The list of elements to be converted.
+
+    Returns:
+        Optional[np.ndarray]: An int64 or float64 array, or None if the list holds anything
+            else than int and float numbers within the int64 range, such as strings,
+            nested lists or booleans only.
     """
-    def is_types_map(is_types_acc, x):
-        return is_types_acc and isinstance(x, types)
+    try:
+        array = np.array(candidate)
+    except (ValueError, TypeError):
+        return None
+
+    if array.ndim != 1 or array.dtype.kind not in "if":
+        return None
+
+    # Integers beyond the int64 range are promoted to float64, losing precision,
+    # unless a float entry asked for floats anyway
+    if array.dtype.kind == "f" and array.size and not any(isinstance(entry, float) for entry in candidate):
+        return None
+
+    return array
+
+
+def parse_media_ranges(header: str) -> List[Tuple[str, float]]:
+    """
+    Parse the media ranges of an Accept header with their quality, i.e. their q parameter.
+
+    Args:
+        header (str): The Accept header value, e.g. "application/json, */*;q=0.1".
+
+    Returns:
+        List[Tuple[str, float]]: The lowercase media ranges and their quality, in header order.
+            Malformed qualities count as 0, i.e. not acceptable.
+    """
+    ranges = []
+
+    for item in (header or "").split(","):
+        media_range, *parameters = item.split(";")
+        media_range = media_range.strip().lower()
+        if not media_range:
+            continue
+
+        quality = 1.0
+        for parameter in parameters:
+            name, _, value = parameter.partition("=")
+            if name.strip().lower() == "q":
+                try:
+                    quality = float(value)
+                except ValueError:
+                    quality = 0.0
+
+        ranges.append((media_range, quality))
+
+    return ranges
+
+
+def media_preference(ranges: List[Tuple[str, float]], media_type: str) -> Tuple[float, int, int]:
+    """
+    Rank a media type against parsed media ranges, as the most specific matching range does.
+
+    Args:
+        ranges (List[Tuple[str, float]]): The media ranges, as parsed by `parse_media_ranges`.
+        media_type (str): The lowercase media type, e.g. "application/json".
+
+    Returns:
+        Tuple[float, int, int]: The quality, the specificity of the range (2 for the media type
+            itself, 1 for "type/*" and 0 for "*/*") and the negated position of the range, so
+            that greater tuples are preferred. Media types matching no range rank (0.0, -1, 0).
+    """
+    main_type = media_type.split("/")[0]
+    patterns = {media_type: 2, f"{main_type}/*": 1, "*/*": 0}
+
+    preference = (0.0, -1, 0)
+    for position, (media_range, quality) in enumerate(ranges):
+        specificity = patterns.get(media_range, -1)
+        if specificity > preference[1]:
+            preference = (quality, specificity, -position)
 
-    return reduce(is_types_map, candidate)
+    return preference
 
 
 def is_success_status_code(status_code: int) -> bool:
@@ -0,0 +1,32 @@
+import importlib.util
+
+import pytest
+
+from lambda_api import json_codec
+
+# Installed JSON backends, the standard library one always being available
+AVAILABLE_BACKENDS = [
+    name for name in json_codec.BACKENDS
+    if name == "json" or importlib.util.find_spec(name) is not None
+]
+
+
+def use_codec(name: str):
+    codec = json_codec.codec
+    json_codec.set_codec(name)
+
+    yield name
+
+    json_codec.codec = codec
+
+
+# Opt-in for tests comparing responses as strings, in the format of the standard library encoder
+@pytest.fixture
+def standard_json_codec():
+    yield from use_codec("json")
+
+
+# Runs a test once per installed JSON backend
+@pytest.fixture(params=AVAILABLE_BACKENDS)
+def json_backend(request):
+    yield from use_codec(request.param)
@@ -1,18 +1,27 @@
 from unittest.mock import patch
 
+import pytest
+
+from lambda_api import json_codec
+
 from lambda_api.predict_service import make_prediction, \
     predict, \
     api_return, \
     validate_data, \
     validate_body, \
-    validate_event
+    validate_event, \
+    validate_payload
 
 from lambda_api.default_values import SUCCESS_STATUS_CODE, \
     CLIENT_ERROR_STATUS_CODE, \
-    SERVER_ERROR_STATUS_CODE
+    SERVER_ERROR_STATUS_CODE, \
+    DEFAULT_TYPE_ERROR_MESSAGE
 
 MOCKED_ALLOWED_TYPES=(int, float)
 
+# Responses are compared as strings, in the format of the standard library encoder
+pytestmark = pytest.mark.usefixtures("standard_json_codec")
+
 # Define a mock for model_resolver.py
 @patch("lambda_api.predict_service.model_prediction_map")
 def test_predict(mock_model_prediction_map):
@@ -37,18 +46,15 @@ def test_predict(mock_model_prediction_map):
     }
 
 # Mock functions for testing
-def mock_validate_event(event, context):
-    return {
-        'statusCode': SUCCESS_STATUS_CODE,
-        'body': '[1, 2, 3]'  # Sample payload
-    }
+def mock_validate_payload(event, context):
+    return SUCCESS_STATUS_CODE, [1, 2, 3], ''  # Sample payload
 
 def mock_make_prediction(payload):
     raise ValueError("Prediction failed")
 
-@patch('lambda_api.predict_service.validate_event', side_effect=mock_validate_event)
+@patch('lambda_api.predict_service.validate_payload', side_effect=mock_validate_payload)
 @patch('lambda_api.predict_service.make_prediction', side_effect=mock_make_prediction)
-def test_predict_error_handling(mock_validate_event, mock_make_prediction):
+def test_predict_error_handling(mock_validate_payload, mock_make_prediction):
     # Simulate a request with a successful payload
     event = {}
     context = {}
@@ -64,29 +70,27 @@ def test_predict_error_handling(mock_validate_event, mock_make_prediction):
     }
 
 # Mock functions for testing
-def mock_validate_event(event, context):
+def mock_validate_payload_client_error(event, context):
     # Simulate a request with a client error status code
-    return {
-        'headers': {'Content-Type': 'application/json'}, \
-        'isBase64Encoded': False, \
-        'statusCode': CLIENT_ERROR_STATUS_CODE, \
-        'body': 'Invalid request'  # Sample error message
-    }
+    return CLIENT_ERROR_STATUS_CODE, [], 'Invalid request'  # Sample error message
 
-@patch('lambda_api.predict_service.validate_event', side_effect=mock_validate_event)
-def test_predict_client_error(mock_validate_event):
+@patch('lambda_api.predict_service.validate_payload', side_effect=mock_validate_payload_client_error)
+@patch('lambda_api.predict_service.make_prediction')
+def test_predict_client_error(mock_make_prediction, mock_validate_payload):
     # Simulate a request with a client error status code
     event = {}
     context = {}
     response = predict(event, context)
 
-    # Check that the response contains the payload from validate_event
+    # Check that the response carries the validation error and no prediction was made
     assert response == {
         'statusCode': CLIENT_ERROR_STATUS_CODE,
         'headers': {'Content-Type': 'application/json'},
-        'body': 'Invalid request',  # Expected error message
+        'body': '[]',
         'isBase64Encoded': False,
+        'error_message': 'Invalid request'  # Expected error message
     }
+    mock_make_prediction.assert_not_called()
 
 # Test case for make_prediction function
 @patch("lambda_api.predict_service.model_prediction_map")
@@ -124,7 +128,7 @@ def test_validate_data_valid_list():
     is_valid, payload = validate_data(data)
 
     assert is_valid is True
-    assert payload == data
+    assert payload.tolist() == data
 
 @patch("lambda_api.predict_service.ALLOWED_TYPES", MOCKED_ALLOWED_TYPES)
 def test_validate_data_valid_single_value():
@@ -172,14 +176,14 @@ def test_validate_body_json():
     body = '{"data": [1, 2, 3]}'
     is_valid, payload = validate_body(body)
     assert is_valid is True
-    assert payload == [1, 2, 3]
+    assert payload.tolist() == [1, 2, 3]
 
 # Test case for a valid list
 def test_validate_body_list():
     body = [1, 2, 3]
     is_valid, payload = validate_body(body)
     assert is_valid is True
-    assert payload == [1, 2, 3]
+    assert payload.tolist() == [1, 2, 3]
 
 # Test case for a single valid type
 def test_validate_body_single_type():
@@ -234,3 +238,59 @@ def test_validate_event():
     event = {"body": "invalid_data"}
     response = validate_event(event, {})
     assert response["statusCode"] == CLIENT_ERROR_STATUS_CODE
+
+# Test case for validate_payload function
+def test_validate_payload():
+    # Valid body: typed payload, without a JSON round-trip
+    event = {"body": '{"data": [1, 2.5, 3]}'}
+    status_code, payload, error_msg = validate_payload(event, {})
+    assert (status_code, payload.tolist(), error_msg) == (SUCCESS_STATUS_CODE, [1, 2.5, 3], "")
+
+    # Invalid body
+    event = {"body": "invalid_data"}
+    assert validate_payload(event, {}) == (CLIENT_ERROR_STATUS_CODE, [], DEFAULT_TYPE_ERROR_MESSAGE)
+
+    # Invalid entry in a nested list of data
+    event = {"body": '{"data": [1, 2, "three", 4, null]}'}
+    status_code, payload, error_msg = validate_payload(event, {})
+    assert status_code == CLIENT_ERROR_STATUS_CODE
+    assert error_msg == f"{DEFAULT_TYPE_ERROR_MESSAGE} Invalid entry at index 2."
+
+# Test case for lists which are valid without being numeric arrays
+def test_validate_body_non_numeric_array_list():
+    is_valid, payload = validate_body([True, False])
+    assert is_valid is True
+    assert payload.tolist() == [True, False]
+
+    is_valid, payload = validate_body([1, [2, 3]])
+    assert is_valid is False
+    assert payload == []
+
+# Test case for an empty list
+def test_validate_body_empty_list():
+    is_valid, payload = validate_body("[]")
+    assert is_valid is True
+    assert payload.tolist() == []
+
+# Test case for predict serializing only the final response
+@patch("lambda_api.predict_service.dumps", wraps=json_codec.dumps)
+def test_predict_serializes_once(mock_dumps):
+    response = predict({"body": '{"data": [1, 3, 4]}'}, {})
+
+    assert response["body"] == "[1, 9, 16]"
+    assert mock_dumps.call_count == 1
+
+
+def test_predict_large_integers():
+    # Squares beyond the int64 range are exact, not wrapped around
+    response = predict({"body": "[4294967296, 3037000500, -3037000500]"}, {})
+
+    assert response["statusCode"] == SUCCESS_STATUS_CODE
+    assert response["body"] == "[18446744073709551616, 9223372037000250000, 9223372037000250000]"
+
+
+def test_predict_integers_beyond_int64():
+    # Integers in [2**63, 2**64) are not rounded to float64
+    response = predict({"body": "[1, 9223372036854775809]"}, {})
+
+    assert response["body"] == "[1, 85070591730234615884290395931651604481]"
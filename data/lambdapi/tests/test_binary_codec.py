@@ -0,0 +1,118 @@
+import base64
+import json
+
+import numpy as np
+import pytest
+
+from lambda_api.binary_codec import decode_array, encode_array, is_binary_content_type
+from lambda_api.default_values import BINARY_CONTENT_TYPE, CLIENT_ERROR_STATUS_CODE, \
+    JSON_CONTENT_TYPE, SUCCESS_STATUS_CODE
+from lambda_api.local_server import make_event
+from lambda_api.predict_service import accepts_binary, predict, validate_body
+
+
+def binary_event(values, accept=None) -> dict:
+    headers = {"Content-Type": BINARY_CONTENT_TYPE}
+    if accept is not None:
+        headers["Accept"] = accept
+
+    return {"headers": headers, "body": encode_array(values), "isBase64Encoded": True}
+
+
+def test_is_binary_content_type():
+    assert is_binary_content_type("Application/Octet-Stream")
+    assert is_binary_content_type("application/octet-stream; charset=binary")
+    assert not is_binary_content_type("application/octet-stream-extension")
+    assert not is_binary_content_type(JSON_CONTENT_TYPE)
+    assert not is_binary_content_type(None)
+
+
+def test_encode_decode_array():
+    values = [1, -2.5, 1e300]
+    body = encode_array(values)
+
+    assert base64.b64decode(body) == np.array(values, dtype="<f8").tobytes()
+
+    array = decode_array(body, True)
+    assert array.dtype == np.dtype("<f8")
+    assert array.tolist() == [1.0, -2.5, 1e300]
+
+    # Raw bytes are viewed, not copied
+    raw = np.array(values).tobytes()
+    assert np.shares_memory(decode_array(raw, False), np.frombuffer(raw))
+
+
+def test_decode_array_invalid():
+    with pytest.raises(ValueError):
+        decode_array(base64.b64encode(b"1234567").decode(), True)
+
+    with pytest.raises(ValueError):
+        decode_array("not base64!", True)
+
+
+def test_validate_body_bytes():
+    is_valid, payload = validate_body(np.array([1.0, 2.0]).tobytes())
+    assert is_valid and payload.tolist() == [1.0, 2.0]
+
+    is_valid, _ = validate_body(b"123")
+    assert not is_valid
+
+
+def test_accepts_binary():
+    assert accepts_binary(binary_event([1.0]))
+    assert accepts_binary(binary_event([1.0], accept="*/*"))
+    assert not accepts_binary(binary_event([1.0], accept=JSON_CONTENT_TYPE))
+    assert accepts_binary({"headers": {"accept": BINARY_CONTENT_TYPE}, "body": "[1]"})
+    assert not accepts_binary({"body": "[1]"})
+
+    # Qualities, then specificity and order of the media ranges
+    def accepts(accept: str) -> bool:
+        return accepts_binary({"headers": {"Accept": accept}, "body": "[1]"})
+
+    assert not accepts("application/json, application/octet-stream;q=0")
+    assert not accepts("application/octet-stream;q=0.5, application/json")
+    assert accepts("application/json;q=0.5, application/octet-stream")
+    assert not accepts("application/json, application/octet-stream")
+    assert accepts("application/octet-stream, application/json")
+    assert accepts("application/octet-stream, */*")
+    assert not accepts("text/html")
+    assert not accepts_binary(binary_event([1.0], accept="*/*;q=0"))
+
+
+def test_predict_binary():
+    response = predict(binary_event([1.0, 2.0, 3.0]), {})
+
+    assert response["statusCode"] == SUCCESS_STATUS_CODE
+    assert response["headers"]["Content-Type"] == BINARY_CONTENT_TYPE
+    assert response["isBase64Encoded"] is True
+    assert decode_array(response["body"], True).tolist() == [1.0, 4.0, 9.0]
+
+    # JSON predictions of a binary payload
+    response = predict(binary_event([1.0, 2.0], accept=JSON_CONTENT_TYPE), {})
+    assert json.loads(response["body"]) == [1.0, 4.0]
+    assert response["isBase64Encoded"] is False
+
+    # Binary predictions of a JSON payload
+    response = predict({"headers": {"Accept": BINARY_CONTENT_TYPE}, "body": "[1, 2]"}, {})
+    assert decode_array(response["body"], True).tolist() == [1.0, 4.0]
+
+
+def test_predict_binary_invalid():
+    event = {"headers": {"Content-Type": BINARY_CONTENT_TYPE}, "body": "AAAA", "isBase64Encoded": True}
+    response = predict(event, {})
+
+    assert response["statusCode"] == CLIENT_ERROR_STATUS_CODE
+    assert response["headers"]["Content-Type"] == JSON_CONTENT_TYPE
+    assert response["isBase64Encoded"] is False
+
+
+def test_make_event_binary():
+    body = np.zeros(2).tobytes()
+
+    # Zeros are valid UTF-8, but binary media types are always base64-encoded
+    event = make_event("POST", "/", {"content-type": BINARY_CONTENT_TYPE}, body)
+    assert event["isBase64Encoded"] is True
+    assert decode_array(event["body"], True).tolist() == [0.0, 0.0]
+
+    event = make_event("POST", "/", {"content-type": JSON_CONTENT_TYPE}, b"[1]")
+    assert event["isBase64Encoded"] is False
@@ -0,0 +1,91 @@
+import json
+
+import numpy as np
+import pytest
+
+from lambda_api import json_codec
+from lambda_api.json_codec import load_codec, set_codec
+from lambda_api.predict_service import predict, predict_stream
+
+
+def available_backends():
+    backends = []
+    for backend in json_codec.BACKENDS:
+        try:
+            load_codec(backend)
+        except ImportError:
+            continue
+        backends.append(backend)
+
+    return backends
+
+
+@pytest.mark.parametrize("backend", available_backends())
+def test_round_trip(backend):
+    codec = load_codec(backend)
+    value = {"data": [1, 2.5, -3], "label": "a/b"}
+
+    assert codec.name == backend
+    assert codec.loads(codec.dumps(value)) == value
+
+
+@pytest.mark.parametrize("backend", available_backends())
+def test_numpy_serialization(backend):
+    codec = load_codec(backend)
+    predictions = np.array([1.5, 4.0, 9.25])
+
+    assert codec.loads(codec.dumps(predictions)) == [1.5, 4.0, 9.25]
+    assert codec.loads(codec.dumps(np.arange(3))) == [0, 1, 2]
+    assert codec.loads(codec.dumps(np.arange(6)[::2])) == [0, 2, 4]
+    assert codec.loads(codec.dumps({"value": np.int64(7)})) == {"value": 7}
+
+
+@pytest.mark.parametrize("backend", available_backends())
+def test_decode_error(backend):
+    with pytest.raises(ValueError):
+        load_codec(backend).loads("[1, 2")
+
+
+def test_auto_detection():
+    assert load_codec().name == available_backends()[0]
+
+
+def test_set_codec(standard_json_codec):
+    codec = set_codec("json")
+
+    assert json_codec.codec is codec
+    assert json_codec.dumps(np.array([4, 9, 16])) == "[4, 9, 16]"
+
+
+def test_unknown_backend():
+    with pytest.raises(ValueError):
+        load_codec("yaml")
+
+
+def test_integers_beyond_64_bits():
+    for backend in available_backends():
+        codec = load_codec(backend)
+        values = np.array([1, 2 ** 64], dtype=object)
+
+        assert json.loads(codec.dumps(values)) == [1, 2 ** 64]
+
+
+# Responses are decoded by the standard library, which keeps every integer exact
+def test_predict_end_to_end(json_backend):
+    response = predict({"body": '{"data": [1, 2.5, -3]}'}, {})
+    assert json.loads(response["body"]) == [1.0, 6.25, 9.0]
+
+    response = predict({"body": "[3, 4294967296]"}, {})
+    assert json.loads(response["body"]) == [9, 2 ** 64]
+
+    response = predict({"body": '["x"]'}, {})
+    assert response["error_message"].endswith("Invalid entry at index 0.")
+
+
+def test_predict_stream_end_to_end(json_backend):
+    response = predict_stream({"body": "[1, 2, 3, 4294967296]"}, {}, chunk_size=2)
+    assert json.loads("".join(response["body"])) == [1, 4, 9, 2 ** 64]
+
+    event = {"body": "[1.5, 2]", "headers": {"Accept": "application/x-ndjson"}}
+    lines = "".join(predict_stream(event, {}, chunk_size=1)["body"]).splitlines()
+    assert [json.loads(line) for line in lines] == [2.25, 4.0]
@@ -0,0 +1,151 @@
+import asyncio
+import base64
+import functools
+from concurrent.futures import ThreadPoolExecutor
+
+import pytest
+
+from lambda_api.local_server import HttpProtocol, make_event, make_response, serve
+from lambda_api.micro_batcher import MicroBatcher
+from lambda_api.predict_service import make_prediction, predict
+
+
+def exchange(request: bytes, executor=None, handler=predict) -> bytes:
+    # Send raw bytes to a server on an ephemeral port and read until it closes
+    async def run():
+        loop = asyncio.get_running_loop()
+        server = await loop.create_server(lambda: HttpProtocol(handler, executor), "127.0.0.1", 0)
+        port = server.sockets[0].getsockname()[1]
+
+        async with server:
+            reader, writer = await asyncio.open_connection("127.0.0.1", port)
+            writer.write(request)
+            response = await asyncio.wait_for(reader.read(), timeout=5)
+            writer.close()
+
+        return response
+
+    return asyncio.run(run())
+
+
+def post(body: str, headers: str = "") -> bytes:
+    return (f"POST /predict HTTP/1.1\r\nContent-Length: {len(body)}\r\n{headers}\r\n{body}").encode()
+
+
+def test_make_event():
+    event = make_event("POST", "/predict?model=square", {"content-type": "application/json"}, b"[1]")
+
+    assert event == {
+        "httpMethod": "POST",
+        "path": "/predict",
+        "headers": {"content-type": "application/json"},
+        "queryStringParameters": {"model": "square"},
+        "body": "[1]",
+        "isBase64Encoded": False,
+    }
+
+    event = make_event("POST", "/predict", {}, b"\xff\x00")
+    assert event["isBase64Encoded"] is True
+    assert base64.b64decode(event["body"]) == b"\xff\x00"
+    assert event["queryStringParameters"] is None
+
+
+def test_make_response():
+    response = make_response({
+        "statusCode": 200,
+        "headers": {"Content-Type": "application/json"},
+        "body": "[4]",
+        "isBase64Encoded": False,
+    }, keep_alive=True)
+
+    assert response == (
+        b"HTTP/1.1 200 OK\r\nContent-Type: application/json\r\n"
+        b"Content-Length: 3\r\nConnection: keep-alive\r\n\r\n[4]"
+    )
+
+    response = make_response({"statusCode": 200, "body": "AAE=", "isBase64Encoded": True}, keep_alive=False)
+    assert response.endswith(b"Connection: close\r\n\r\n\x00\x01")
+
+
+@pytest.mark.usefixtures("standard_json_codec")
+def test_pipelined_requests_in_order():
+    request = post('{"data": [2]}') + post("[3, 4]") + post('["x"]') + post("[5]", "Connection: close\r\n")
+
+    response = exchange(request)
+
+    bodies = [part.split(b"\r\n\r\n")[1] for part in response.split(b"HTTP/1.1 ")[1:]]
+    assert bodies == [b"[4]", b"[9, 16]", b"[]", b"[25]"]
+    assert response.count(b"Connection: keep-alive") == 3
+    assert b"HTTP/1.1 400 Bad Request" in response
+
+
+def test_pipelined_requests_with_workers():
+    request = b"".join(post(f"[{value}]") for value in range(20)) + post("[20]", "Connection: close\r\n")
+
+    with ThreadPoolExecutor(4) as executor:
+        response = exchange(request, executor)
+
+    bodies = [part.split(b"\r\n\r\n")[1] for part in response.split(b"HTTP/1.1 ")[1:]]
+    assert bodies == [f"[{value ** 2}]".encode() for value in range(21)]
+
+
+def test_pipelined_requests_with_batcher():
+    request = b"".join(post(f"[{value}]") for value in range(20)) + post("[20]", "Connection: close\r\n")
+
+    with ThreadPoolExecutor(4) as executor, MicroBatcher(make_prediction) as batcher:
+        response = exchange(request, executor, functools.partial(predict, batcher=batcher))
+
+    bodies = [part.split(b"\r\n\r\n")[1] for part in response.split(b"HTTP/1.1 ")[1:]]
+    assert bodies == [f"[{value ** 2}]".encode() for value in range(21)]
+    assert batcher.requests == 21
+
+
+def test_batch_requires_workers():
+    with pytest.raises(ValueError):
+        serve(batch=True)
+
+
+def test_http_1_0_closes_by_default():
+    response = exchange(b"POST / HTTP/1.0\r\nContent-Length: 3\r\n\r\n[6]")
+
+    assert response.startswith(b"HTTP/1.1 200 OK")
+    assert response.endswith(b"Connection: close\r\n\r\n[36]")
+
+
+def test_malformed_request():
+    response = exchange(b"GARBAGE\r\n\r\n")
+
+    assert response.startswith(b"HTTP/1.1 400 Bad Request")
+    assert b"Connection: close" in response
+
+
+@pytest.mark.parametrize("length", ["-5", "+3", "three"])
+def test_invalid_content_length(length):
+    request = f"POST /predict HTTP/1.1\r\nContent-Length: {length}\r\n\r\n[1]".encode() + post("[2]")
+
+    response = exchange(request)
+
+    # The rest of the stream is not parsed, and the connection is closed
+    assert response.startswith(b"HTTP/1.1 400 Bad Request")
+    assert response.count(b"HTTP/1.1 ") == 1
+    assert b"Connection: close" in response
+
+
+def test_handler_error():
+    def failing_handler(event, context):
+        raise RuntimeError("boom")
+
+    async def run():
+        loop = asyncio.get_running_loop()
+        server = await loop.create_server(lambda: HttpProtocol(failing_handler), "127.0.0.1", 0)
+        port = server.sockets[0].getsockname()[1]
+
+        async with server:
+            reader, writer = await asyncio.open_connection("127.0.0.1", port)
+            writer.write(post("[1]", "Connection: close\r\n"))
+            response = await asyncio.wait_for(reader.read(), timeout=5)
+            writer.close()
+
+        return response
+
+    assert asyncio.run(run()).startswith(b"HTTP/1.1 500 Internal Server Error")
@@ -0,0 +1,82 @@
+import numpy as np
+import pytest
+
+from lambda_api.micro_batcher import MicroBatcher
+from lambda_api.predict_service import make_prediction, predict
+
+
+class RecordingPrediction:
+    def __init__(self):
+        self.batches = []
+
+    def __call__(self, payload):
+        self.batches.append(payload.tolist())
+        return np.square(payload)
+
+
+def test_coalesce_and_scatter():
+    prediction = RecordingPrediction()
+
+    # The batch is dispatched as soon as it holds 6 entries
+    with MicroBatcher(prediction, max_batch_size=6, max_wait=5) as batcher:
+        futures = [batcher.submit(payload) for payload in ([1, 2], [3], [4, 5, 6])]
+        results = [future.result().tolist() for future in futures]
+
+    assert results == [[1, 4], [9], [16, 25, 36]]
+    assert prediction.batches == [[1, 2, 3, 4, 5, 6]]
+    assert batcher.batches == 1
+    assert batcher.requests == 3
+
+
+def test_group_by_dtype():
+    prediction = RecordingPrediction()
+
+    with MicroBatcher(prediction, max_batch_size=4, max_wait=5) as batcher:
+        futures = [batcher.submit(payload) for payload in ([1, 2], [0.5, 1.5])]
+        results = [future.result().tolist() for future in futures]
+
+    # Integer requests keep integer predictions
+    assert results == [[1, 4], [0.25, 2.25]]
+    assert sorted(prediction.batches) == [[0.5, 1.5], [1, 2]]
+
+
+def test_close_dispatches_queued_requests():
+    prediction = RecordingPrediction()
+    batcher = MicroBatcher(prediction, max_wait=5)
+
+    future = batcher.submit([3])
+    batcher.close()
+
+    assert future.result().tolist() == [9]
+
+    with pytest.raises(RuntimeError):
+        batcher.submit([4])
+
+
+def test_prediction_error():
+    def failing_prediction(payload):
+        raise ValueError("Prediction failed")
+
+    with MicroBatcher(failing_prediction, max_batch_size=2, max_wait=5) as batcher:
+        futures = [batcher.submit([1]), batcher.submit([2])]
+
+        for future in futures:
+            with pytest.raises(ValueError):
+                future.result()
+
+
+def test_invalid_parameters():
+    with pytest.raises(ValueError):
+        MicroBatcher(make_prediction, max_batch_size=0)
+
+    with pytest.raises(ValueError):
+        MicroBatcher(make_prediction, max_wait=-1)
+
+
+@pytest.mark.usefixtures("standard_json_codec")
+def test_predict_with_batcher():
+    with MicroBatcher(make_prediction, max_wait=0) as batcher:
+        response = predict({"body": '{"data": [1, 3, 4]}'}, {}, batcher)
+
+    assert response["statusCode"] == 200
+    assert response["body"] == "[1, 9, 16]"
@@ -0,0 +1,57 @@
+import numpy as np
+import pytest
+
+from lambda_api.model_adapter import ModelAdapter
+from lambda_api.model_resolver import model_prediction_map
+
+
+class RecordingModel:
+    def __init__(self):
+        self.batch_shapes = []
+
+    def predict(self, inputs):
+        self.batch_shapes.append(inputs.shape)
+        return inputs.sum(axis=-1) if inputs.ndim == 2 else inputs * 2
+
+
+def test_predict_in_a_single_batch():
+    model = RecordingModel()
+    adapter = ModelAdapter(model)
+
+    assert adapter.predict_list([1, 2, 3]) == [2, 4, 6]
+    assert model.batch_shapes == [(3,)]
+
+
+def test_predict_in_chunks():
+    model = RecordingModel()
+    adapter = ModelAdapter(model, max_batch_size=4)
+
+    result = adapter.predict(np.arange(10.0))
+
+    assert result.tolist() == [2.0 * value for value in range(10)]
+    assert model.batch_shapes == [(4,), (4,), (2,)]
+
+
+def test_predict_with_features():
+    model = RecordingModel()
+    adapter = ModelAdapter(model, features=2, dtype=np.float64)
+
+    assert adapter.predict_list([1, 2, 3, 4]) == [3.0, 7.0]
+    assert model.batch_shapes == [(2, 2)]
+
+
+def test_predict_empty_payload():
+    model = RecordingModel()
+
+    assert ModelAdapter(model).predict_list([]) == []
+    assert model.batch_shapes == []
+
+
+def test_invalid_max_batch_size():
+    with pytest.raises(ValueError):
+        ModelAdapter(RecordingModel(), max_batch_size=0)
+
+
+def test_model_prediction_map():
+    assert model_prediction_map([1, 3, 4]).tolist() == [1, 9, 16]
+    assert model_prediction_map([0.5]).tolist() == [0.25]
@@ -0,0 +1,109 @@
+import cloudpickle
+import pytest
+
+from lambda_api.model_registry import ModelRegistry
+from lambda_api.model_resolver import SquareModel
+
+
+class CountingLoader:
+    def __init__(self, model):
+        self.model = model
+        self.calls = 0
+
+    def __call__(self):
+        self.calls += 1
+        return self.model
+
+
+def test_lazy_load_and_warm_hits():
+    registry = ModelRegistry()
+    loader = CountingLoader("model")
+    registry.register("square", loader)
+
+    assert loader.calls == 0
+    assert not registry.is_loaded("square")
+
+    assert registry.get("square") == "model"
+    assert registry.get("square") == "model"
+
+    assert loader.calls == 1
+    assert registry.loads == 1
+    assert registry.hits == 1
+    assert ("square", "latest") in registry.load_times
+
+
+def test_versions():
+    registry = ModelRegistry()
+    registry.register("square", CountingLoader("v1"), version="1")
+    registry.register("square", CountingLoader("v2"), version="2")
+
+    assert registry.get("square") == "v2"
+    assert registry.get("square", "1") == "v1"
+
+    with pytest.raises(KeyError):
+        registry.get("square", "3")
+
+    with pytest.raises(KeyError):
+        registry.get("cube")
+
+
+def test_lru_eviction_under_memory_budget():
+    registry = ModelRegistry(memory_budget=250)
+    loaders = {name: CountingLoader(name) for name in "abc"}
+    for name, loader in loaders.items():
+        registry.register(name, loader, size=100)
+
+    registry.get("a")
+    registry.get("b")
+    registry.get("a")
+    registry.get("c")
+
+    # "b" is the least recently used model when "c" is loaded
+    assert registry.is_loaded("a")
+    assert not registry.is_loaded("b")
+    assert registry.is_loaded("c")
+    assert registry.loaded_size() == 200
+    assert registry.evictions == 1
+
+    registry.get("b")
+    assert loaders["b"].calls == 2
+
+
+def test_oversized_model_stays_loaded():
+    registry = ModelRegistry(memory_budget=10)
+    registry.register("large", CountingLoader("large"), size=100)
+
+    registry.get("large")
+
+    assert registry.is_loaded("large")
+
+
+def test_register_pickle(tmp_path):
+    path = tmp_path / "model.pickle"
+    with open(path, "wb") as file:
+        cloudpickle.dump(SquareModel(), file)
+
+    registry = ModelRegistry()
+    registry.register_pickle("square", str(path))
+
+    model = registry.get("square")
+
+    assert model.predict(3) == 9
+    assert registry.loaded_size() == path.stat().st_size
+
+
+def test_invalid_memory_budget():
+    with pytest.raises(ValueError):
+        ModelRegistry(memory_budget=-1)
+
+
+def test_revision():
+    registry = ModelRegistry()
+    registry.register("square", CountingLoader("v1"), version="1")
+    first = registry.revision("square")
+
+    assert first[:2] == ("square", "1")
+
+    # A new registration of the same version is a new revision
+    registry.register("square", CountingLoader("v1"), version="1")
+    assert registry.revision("square") != first
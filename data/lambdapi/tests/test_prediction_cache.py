@@ -0,0 +1,139 @@
+from unittest.mock import patch
+
+import numpy as np
+import pytest
+
+from lambda_api.prediction_cache import PredictionCache
+from lambda_api.predict_service import predict
+
+
+class RecordingPrediction:
+    def __init__(self):
+        self.calls = []
+
+    def __call__(self, payload):
+        self.calls.append(np.asarray(payload).tolist())
+        return np.square(payload)
+
+
+def test_payload_hits_and_misses():
+    cache = PredictionCache()
+    prediction = RecordingPrediction()
+
+    first = cache.predict(np.array([1, 2, 3]), prediction, "v1")
+    second = cache.predict([1, 2, 3], prediction, "v1")
+
+    assert first.tolist() == second.tolist() == [1, 4, 9]
+    assert prediction.calls == [[1, 2, 3]]
+    assert cache.stats()["hits"] == 1
+    assert cache.stats()["misses"] == 1
+    assert cache.stats()["hit_ratio"] == 0.5
+
+    # Cached predictions are shared, hence read-only
+    with pytest.raises(ValueError):
+        second[0] = 0
+
+
+def test_model_arrays_stay_writable():
+    cache = PredictionCache()
+    buffer = np.zeros(2)
+
+    def prediction(payload):
+        # Model writing its predictions into an output buffer it keeps
+        np.square(payload, out=buffer)
+        return buffer
+
+    cached = cache.predict(np.array([1.0, 2.0]), prediction, "v1")
+    cache.predict(np.array([3.0, 4.0]), prediction, "v1")
+
+    assert buffer.flags.writeable
+    assert cached.tolist() == [1.0, 4.0]
+
+
+def test_key_includes_dtype_and_model_revision():
+    cache = PredictionCache()
+    prediction = RecordingPrediction()
+
+    cache.predict([1, 2], prediction, "v1")
+    cache.predict([1.0, 2.0], prediction, "v1")
+    cache.predict([1, 2], prediction, "v2")
+
+    assert len(prediction.calls) == 3
+    assert cache.stats()["hits"] == 0
+
+
+def test_lru_eviction():
+    cache = PredictionCache(max_entries=2)
+    prediction = RecordingPrediction()
+
+    for payload in ([1], [2], [1], [3], [2]):
+        cache.predict(payload, prediction, "v1")
+
+    # [2] is the least recently used payload when [3] is cached
+    assert prediction.calls == [[1], [2], [3], [2]]
+    assert cache.stats()["evictions"] == 2
+
+
+def test_ttl_expiration():
+    cache = PredictionCache(ttl=10)
+    prediction = RecordingPrediction()
+
+    with patch("lambda_api.prediction_cache.time.monotonic", return_value=100.0):
+        cache.predict([1], prediction, "v1")
+        cache.predict([1], prediction, "v1")
+
+    with patch("lambda_api.prediction_cache.time.monotonic", return_value=111.0):
+        cache.predict([1], prediction, "v1")
+
+    assert prediction.calls == [[1], [1]]
+
+
+def test_per_element_memoization():
+    cache = PredictionCache(per_element=True)
+    prediction = RecordingPrediction()
+
+    cache.predict([1, 2, 3], prediction, "v1")
+    result = cache.predict([3, 4, 1, 5], prediction, "v1")
+
+    # Only the new entries are scored
+    assert result.tolist() == [9, 16, 1, 25]
+    assert prediction.calls == [[1, 2, 3], [4, 5]]
+
+    result = cache.predict([2, 5], prediction, "v1")
+    assert result.tolist() == [4, 25]
+    assert len(prediction.calls) == 2
+
+    stats = cache.stats()
+    assert (stats["element_hits"], stats["element_misses"]) == (4, 5)
+
+
+def test_object_payloads_are_not_cached():
+    cache = PredictionCache()
+    prediction = RecordingPrediction()
+
+    cache.predict([2 ** 70], prediction, "v1")
+    cache.predict([2 ** 70], prediction, "v1")
+
+    assert len(prediction.calls) == 2
+    assert cache.stats()["entries"] == 0
+
+
+def test_invalid_parameters():
+    with pytest.raises(ValueError):
+        PredictionCache(max_entries=0)
+
+    with pytest.raises(ValueError):
+        PredictionCache(ttl=0)
+
+
+@pytest.mark.usefixtures("standard_json_codec")
+@patch("lambda_api.predict_service.make_prediction", side_effect=lambda payload: np.square(payload))
+def test_predict_with_cache(mock_make_prediction):
+    cache = PredictionCache()
+    event = {"body": '{"data": [1, 3, 4]}'}
+
+    responses = [predict(event, {}, cache=cache) for _ in range(3)]
+
+    assert [response["body"] for response in responses] == ["[1, 9, 16]"] * 3
+    assert mock_make_prediction.call_count == 1
+    assert cache.stats()["hits"] == 2
@@ -0,0 +1,187 @@
+import asyncio
+import json
+import threading
+from concurrent.futures import ThreadPoolExecutor
+
+import numpy as np
+import pytest
+
+from lambda_api import json_codec
+from lambda_api.binary_codec import decode_array, encode_array
+from lambda_api.default_values import CLIENT_ERROR_STATUS_CODE, SUCCESS_STATUS_CODE
+from lambda_api.local_server import HttpProtocol
+from lambda_api.predict_service import predict_stream
+from lambda_api.streaming import iter_json_array, iter_ndjson, iter_predictions, validate_chunks
+
+
+def test_validate_chunks():
+    assert validate_chunks([1, 2, 3, 4, 5], (int, float), 2) == (True, np.dtype(np.int64), -1)
+    assert validate_chunks([1, 2, 3.5], (int, float), 2) == (True, np.dtype(np.float64), -1)
+    assert validate_chunks([], (int, float), 2) == (True, np.dtype(np.int64), -1)
+    assert validate_chunks([1, 2 ** 63], (int, float), 2) == (True, np.dtype(object), -1)
+
+    # The index of the invalid entry counts the previous chunks
+    assert validate_chunks([1, 2, 3, "four", 5], (int, float), 2) == (False, None, 3)
+
+
+def test_iter_predictions():
+    chunks = iter_predictions([1, 2, 3, 4, 5], np.square, np.dtype(np.float64), 2)
+
+    assert [chunk.tolist() for chunk in chunks] == [[1.0, 4.0], [9.0, 16.0], [25.0]]
+
+
+def test_iter_json_array_matches_codec(json_backend):
+    chunks = [np.array([1, 4]), np.array([9, 16])]
+
+    assert "".join(iter_json_array(chunks)) == json_codec.dumps(np.concatenate(chunks))
+
+
+def test_iter_json_array():
+    chunks = [np.array([1, 4]), np.array([], dtype=int), np.array([9])]
+
+    assert json.loads("".join(iter_json_array(chunks))) == [1, 4, 9]
+    assert "".join(iter_json_array([])) == "[]"
+
+
+@pytest.mark.usefixtures("standard_json_codec")
+def test_iter_ndjson():
+    chunks = [np.array([1.5, 4.0]), np.array([9.25])]
+    assert "".join(iter_ndjson(chunks)) == "1.5\n4.0\n9.25\n"
+
+    rows = [np.array([[1, 2], [3, 4]])]
+    assert "".join(iter_ndjson(rows)) == "[1, 2]\n[3, 4]\n"
+
+
+def test_iter_ndjson_non_numeric(json_backend):
+    labels = [np.array(["cat, dog", "bird"]), np.array([{"label": "a,b", "score": 0.5}, 2 ** 64], dtype=object)]
+
+    lines = "".join(iter_ndjson(labels)).splitlines()
+    assert [json.loads(line) for line in lines] == ["cat, dog", "bird", {"label": "a,b", "score": 0.5}, 2 ** 64]
+
+
+def test_predict_stream():
+    response = predict_stream({"body": '{"data": [1, 2, 3, 4, 5]}'}, {}, chunk_size=2)
+
+    assert response["statusCode"] == SUCCESS_STATUS_CODE
+    assert response["headers"] == {"Content-Type": "application/json"}
+    assert json.loads("".join(response["body"])) == [1, 4, 9, 16, 25]
+
+
+def test_predict_stream_ndjson():
+    event = {
+        "body": "[1, 2, 3]",
+        "headers": {"Accept": "application/x-ndjson"},
+    }
+    response = predict_stream(event, {}, chunk_size=2)
+
+    assert response["headers"] == {"Content-Type": "application/x-ndjson"}
+    assert "".join(response["body"]) == "1\n4\n9\n"
+
+    event = {"body": "[2]", "queryStringParameters": {"format": "ndjson"}}
+    assert "".join(predict_stream(event, {})["body"]) == "4\n"
+
+
+def test_predict_stream_invalid_body():
+    response = predict_stream({"body": '{"data": [1, 2, null]}'}, {}, chunk_size=2)
+
+    assert response["statusCode"] == CLIENT_ERROR_STATUS_CODE
+    assert response["error_message"].endswith("Invalid entry at index 2.")
+
+    response = predict_stream({"body": "invalid_data"}, {})
+    assert response["statusCode"] == CLIENT_ERROR_STATUS_CODE
+
+
+def test_predict_stream_binary_body():
+    event = {
+        "headers": {"Content-Type": "application/octet-stream"},
+        "body": encode_array([1.0, 2.0]),
+        "isBase64Encoded": True,
+    }
+    response = predict_stream(event, {})
+
+    assert response["statusCode"] == SUCCESS_STATUS_CODE
+    assert decode_array(response["body"], True).tolist() == [1.0, 4.0]
+
+    # Binary entries streamed as JSON predictions
+    event["headers"]["Accept"] = "application/x-ndjson"
+    response = predict_stream(event, {}, chunk_size=1)
+
+    assert response["headers"] == {"Content-Type": "application/x-ndjson"}
+    assert "".join(response["body"]) == "1.0\n4.0\n"
+
+    event["body"] = "AAAA"
+    assert predict_stream(event, {})["statusCode"] == CLIENT_ERROR_STATUS_CODE
+
+    # JSON entries accepting binary predictions
+    event = {"headers": {"Accept": "application/octet-stream"}, "body": "[3]"}
+    assert decode_array(predict_stream(event, {})["body"], True).tolist() == [9.0]
+
+
+def exchange_stream(handler, request: bytes, executor=None) -> bytes:
+    async def run():
+        loop = asyncio.get_running_loop()
+        server = await loop.create_server(lambda: HttpProtocol(handler, executor), "127.0.0.1", 0)
+        port = server.sockets[0].getsockname()[1]
+
+        async with server:
+            reader, writer = await asyncio.open_connection("127.0.0.1", port)
+            writer.write(request)
+            response = await asyncio.wait_for(reader.read(), timeout=5)
+            writer.close()
+
+        return response
+
+    return asyncio.run(run())
+
+
+def test_stream_advances_in_executor():
+    threads = []
+
+    def pieces():
+        for piece in ("[1", ", 2]"):
+            threads.append(threading.current_thread())
+            yield piece
+
+    def handler(event, context):
+        return {"statusCode": 200, "headers": {}, "body": pieces(), "isBase64Encoded": False}
+
+    request = b"POST / HTTP/1.1\r\nConnection: close\r\nContent-Length: 0\r\n\r\n"
+    with ThreadPoolExecutor(2) as executor:
+        response = exchange_stream(handler, request, executor)
+
+    # Producing the pieces never blocks the event loop of the main thread
+    assert response.endswith(b"\r\n\r\n2\r\n[1\r\n4\r\n, 2]\r\n0\r\n\r\n")
+    assert threads and threading.main_thread() not in threads
+
+
+@pytest.mark.parametrize("workers", [0, 2])
+def test_chunked_response(workers):
+    def handler(event, context):
+        return predict_stream(event, context, chunk_size=2)
+
+    body = b"[1, 2, 3, 4, 5]"
+    request = b"POST / HTTP/1.1\r\nContent-Length: %d\r\n\r\n%b" % (len(body), body)
+    request += b"POST / HTTP/1.1\r\nConnection: close\r\nContent-Length: 3\r\n\r\n[6]"
+
+    with ThreadPoolExecutor(workers or 1) as executor:
+        response = exchange_stream(handler, request, executor if workers else None)
+
+    first, second = response.split(b"HTTP/1.1 ")[1:]
+
+    head, chunked_body = first.split(b"\r\n\r\n", 1)
+    assert b"Transfer-Encoding: chunked" in head
+    assert b"Content-Length" not in head
+
+    pieces = []
+    while True:
+        size, chunked_body = chunked_body.split(b"\r\n", 1)
+        if int(size, 16) == 0:
+            break
+        pieces.append(chunked_body[:int(size, 16)])
+        chunked_body = chunked_body[int(size, 16) + 2:]
+
+    assert json.loads(b"".join(pieces)) == [1, 4, 9, 16, 25]
+
+    # The pipelined request is answered once the stream is over
+    assert b"Connection: close" in second
+    assert second.endswith(b"\r\n\r\n1\r\n[\r\n2\r\n36\r\n1\r\n]\r\n0\r\n\r\n")
@@ -1,4 +1,5 @@
-from lambda_api.utils import is_fail_status_code, is_success_status_code
+from lambda_api.utils import are_types, find_invalid_index, is_fail_status_code, \
+    is_success_status_code, to_numeric_array, media_preference, parse_media_ranges
 
 
 def test_is_fail_status_code():
@@ -43,3 +44,59 @@ def test_is_success_status_code():
 
     # Test edge case: upper bound of the range (299)
     assert is_success_status_code(299) is True
+
+
+def test_are_types():
+    """
+    Test cases for the are_types function.
+    """
+    assert are_types([1, 2.5, 3], (int, float)) is True
+
+    # The first element is checked as well
+    assert are_types(["one", 2, 3], (int, float)) is False
+
+    # An empty list holds no invalid element
+    assert are_types([], (int, float)) is True
+
+
+def test_find_invalid_index():
+    """
+    Test cases for the find_invalid_index function.
+    """
+    assert find_invalid_index([1, 2, 3], (int, float)) == -1
+    assert find_invalid_index(["one", 2, 3], (int, float)) == 0
+    assert find_invalid_index([1, 2, None, "four"], (int, float)) == 2
+    assert find_invalid_index([], (int, float)) == -1
+
+
+def test_to_numeric_array():
+    """
+    Test cases for the to_numeric_array function.
+    """
+    assert to_numeric_array([1, 2, 3]).dtype == "int64"
+    assert to_numeric_array([1, 2.5]).tolist() == [1.0, 2.5]
+    assert to_numeric_array([]).tolist() == []
+
+    # Anything else than numbers is left to the per-element check
+    assert to_numeric_array([1, "two"]) is None
+    assert to_numeric_array([[1, 2], [3, 4]]) is None
+    assert to_numeric_array([[1], [2, 3]]) is None
+    assert to_numeric_array([1, None]) is None
+    assert to_numeric_array([2 ** 70]) is None
+    assert to_numeric_array([2 ** 63]) is None
+    assert to_numeric_array([1, 2 ** 63]) is None
+
+
+def test_parse_media_ranges():
+    """
+    Test cases for the parse_media_ranges and media_preference functions.
+    """
+    ranges = parse_media_ranges("Application/JSON;q=0.5, text/*; level=1, */*;q=oops,")
+    assert ranges == [("application/json", 0.5), ("text/*", 1.0), ("*/*", 0.0)]
+    assert parse_media_ranges("") == []
+
+    # The most specific matching range wins
+    assert media_preference(ranges, "application/json") == (0.5, 2, 0)
+    assert media_preference(ranges, "text/plain") == (1.0, 1, -1)
+    assert media_preference(ranges, "image/png") == (0.0, 0, -2)
+    assert media_preference([], "image/png") == (0.0, -1, 0)